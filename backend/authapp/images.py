@@ -0,0 +1,129 @@
+"""
+Upload-time image processing: EXIF stripping and fixed-size WebP thumbnails.
+
+Thumbnails are stored next to the original under a ``thumbs/`` directory,
+e.g. ``profile_images/me.jpg`` -> ``profile_images/thumbs/me_128.webp``.
+"""
+import io
+import logging
+import os
+import posixpath
+
+from django.core.files.base import ContentFile, File
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+logger = logging.getLogger(__name__)
+
+THUMBNAIL_SIZES = (64, 128, 256)
+DEFAULT_THUMBNAIL_SIZE = 128
+THUMBNAIL_QUALITY = 80
+ORIGINAL_JPEG_QUALITY = 85
+ORIGINAL_WEBP_QUALITY = 85
+REENCODE_FORMATS = {'JPEG': 'JPEG', 'MPO': 'JPEG', 'PNG': 'PNG', 'WEBP': 'WEBP'}
+
+
+def thumbnail_name(name, size):
+    head, tail = posixpath.split(name)
+    stem = posixpath.splitext(tail)[0]
+    return posixpath.join(head, 'thumbs', f'{stem}_{size}.webp')
+
+
+def _normalize_mode(image):
+    if image.mode in ('RGB', 'RGBA'):
+        return image
+    has_alpha = image.mode in ('LA', 'PA') or (image.mode == 'P' and 'transparency' in image.info)
+    return image.convert('RGBA' if has_alpha else 'RGB')
+
+
+def _encode(image, fmt, **params):
+    buffer = io.BytesIO()
+    image.save(buffer, format=fmt, **params)
+    return ContentFile(buffer.getvalue())
+
+
+def _replace(storage, name, content):
+    """
+    Overwrite ``name`` with ``content``. The new file is written under a
+    temporary name first, so a failed write leaves the original in place.
+    """
+    head, tail = posixpath.split(name)
+    stem, extension = posixpath.splitext(tail)
+    temp_name = storage.save(posixpath.join(head, f'{stem}.reencoded{extension}'), content)
+    try:
+        os.replace(storage.path(temp_name), storage.path(name))
+        return
+    except NotImplementedError:
+        pass
+    # Storages without local paths can't rename: copy the new file over the original
+    storage.delete(name)
+    with storage.open(temp_name, 'rb') as fh:
+        saved = storage.save(name, File(fh))
+    if saved != name:
+        storage.delete(saved)
+        raise OSError(f"Storage saved {name} as {saved}; the re-encoded file is kept as {temp_name}")
+    storage.delete(temp_name)
+
+
+def process_image(field_file, force=False):
+    """
+    Strip EXIF from the stored original (applying its orientation first) and
+    write one WebP thumbnail per size in THUMBNAIL_SIZES.
+    Returns True when the file was processed, False when it was skipped.
+    """
+    if not field_file or not field_file.name:
+        return False
+    storage = field_file.storage
+    name = field_file.name
+    if not force and storage.exists(thumbnail_name(name, THUMBNAIL_SIZES[-1])):
+        return False
+
+    try:
+        with storage.open(name, 'rb') as fh:
+            image = Image.open(fh)
+            source_format = image.format
+            image.load()
+    except (FileNotFoundError, UnidentifiedImageError, OSError) as e:
+        logger.warning(f"Skipping thumbnail generation for {name}: {e}")
+        return False
+
+    image = ImageOps.exif_transpose(image)
+
+    # Re-encode the original without EXIF (GPS, device info) and with sane compression
+    target_format = REENCODE_FORMATS.get(source_format)
+    if target_format:
+        if target_format == 'JPEG':
+            content = _encode(image.convert('RGB'), 'JPEG', quality=ORIGINAL_JPEG_QUALITY, optimize=True, progressive=True)
+        elif target_format == 'PNG':
+            content = _encode(image, 'PNG', optimize=True)
+        else:
+            content = _encode(image, 'WEBP', quality=ORIGINAL_WEBP_QUALITY)
+        _replace(storage, name, content)
+
+    image = _normalize_mode(image)
+    for size in THUMBNAIL_SIZES:
+        thumb = image.copy()
+        thumb.thumbnail((size, size), Image.LANCZOS)
+        thumb_name = thumbnail_name(name, size)
+        if storage.exists(thumb_name):
+            storage.delete(thumb_name)
+        storage.save(thumb_name, _encode(thumb, 'WEBP', quality=THUMBNAIL_QUALITY, method=6))
+    return True
+
+
+def process_image_safely(field_file):
+    """Signal-friendly wrapper: image problems must never break the model save."""
+    try:
+        return process_image(field_file)
+    except Exception as e:
+        logger.error(f"Image processing failed for {getattr(field_file, 'name', None)}: {e}")
+        return False
+
+
+def thumbnail_url(field_file, size=DEFAULT_THUMBNAIL_SIZE, request=None):
+    """URL of the thumbnail for ``field_file``, falling back to the original."""
+    if not field_file or not field_file.name:
+        return None
+    from .media import media_url
+
+    thumb_name = thumbnail_name(field_file.name, size)
+    return media_url(thumb_name if field_file.storage.exists(thumb_name) else field_file.name, request)
@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+
+from authapp.images import process_image
+from authapp.models import CustomUser
+from hr.models import Candidate
+from operation.models import Contract
+
+
+class Command(BaseCommand):
+    help = "Strip EXIF and generate thumbnails for existing profile images, candidate photos and contract logos"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--force', action='store_true', help="Reprocess images that already have thumbnails")
+
+    def handle(self, *args, **options):
+        sources = [
+            (CustomUser, 'image'),
+            (Candidate, 'image'),
+            (Contract, 'company_logo'),
+        ]
+        for model, field in sources:
+            processed = skipped = 0
+            queryset = model.objects.exclude(**{f'{field}__isnull': True}).exclude(**{field: ''}).only('pk', field)
+            for obj in queryset.iterator():
+                if process_image(getattr(obj, field), force=options['force']):
+                    processed += 1
+                else:
+                    skipped += 1
+            self.stdout.write(f"{model.__name__}.{field}: processed {processed}, skipped {skipped}")
+        self.stdout.write(self.style.SUCCESS("Thumbnail backfill complete."))
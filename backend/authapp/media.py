@@ -0,0 +1,304 @@
+"""
+Media delivery.
+
+``/media/`` is served by MediaView instead of django.views.static.serve:
+
+- Protected prefixes (project files, contract logos, candidate photos,
+  export files) need either a signed URL, as produced by ``media_url`` for
+  API responses, or a JWT whose user passes the prefix's access check.
+- When a proxy is configured (MEDIA_ACCEL_REDIRECT_PREFIX for nginx,
+  MEDIA_X_SENDFILE for Apache/lighttpd) the worker only checks access and
+  hands the transfer to the proxy.
+- Otherwise the file is streamed with Range, ETag and Last-Modified support,
+  so resumed downloads and revalidations don't resend the whole file.
+
+Thumbnails and content-addressed files never change under the same name and
+get long-lived cache headers.
+"""
+import mimetypes
+import os
+import posixpath
+import re
+import time
+from urllib.parse import quote
+
+from django.conf import settings
+from django.core import signing
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import FileResponse, Http404, HttpResponse, HttpResponseNotModified
+from django.utils._os import safe_join
+from django.utils.http import http_date, parse_http_date_safe
+from rest_framework import serializers
+from rest_framework.exceptions import NotAuthenticated, PermissionDenied
+from rest_framework.permissions import AllowAny
+from rest_framework.views import APIView
+
+from .permissions import has_permission
+
+SIGNATURE_SALT = 'authapp.media'
+# Signatures are issued per window so URLs in cached API responses stay stable
+SIGNATURE_WINDOW = 3600
+
+IMMUTABLE = 31536000
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+def _is_admin(user):
+    return user.is_superuser or user.is_staff or (user.role and user.role.name in ('Superadmin', 'HR'))
+
+
+def _project_file_access(user, name):
+    from operation.access import accessible_project_ids
+    from operation.models import ProjectFile
+
+    if _is_admin(user):
+        return True
+    return ProjectFile.objects.filter(file=name, project_id__in=accessible_project_ids(user)).exists()
+
+
+def _export_access(user, name):
+    from reports.models import ExportJob
+
+    return ExportJob.objects.filter(file=name, created_by=user).exists()
+
+
+def _page_access(page):
+    return lambda user, name: has_permission(user, page, 'view')
+
+
+# prefix -> access check; names under no listed prefix are public
+PROTECTED_PREFIXES = {
+    'project_files/': _project_file_access,
+    'contract_logos/': _page_access('contracts'),
+    'candidates/': _page_access('recruitment'),
+    'exports/': _export_access,
+    # In-progress upload chunks are never served
+    'uploads/': lambda user, name: False,
+}
+
+
+def _access_check(name):
+    for prefix, check in PROTECTED_PREFIXES.items():
+        if name.startswith(prefix):
+            return check
+    return None
+
+
+def _signature(name, issued):
+    return signing.Signer(salt=SIGNATURE_SALT).signature(f'{name}:{issued}')
+
+
+def media_url(name, request=None):
+    """URL for a media file name; protected names get a signed, expiring URL."""
+    if not name:
+        return None
+    url = settings.MEDIA_URL + quote(name)
+    if _access_check(name) is not None:
+        issued = int(time.time()) // SIGNATURE_WINDOW * SIGNATURE_WINDOW
+        url += f'?issued={issued}&sig={_signature(name, issued)}'
+    if request:
+        return request.build_absolute_uri(url)
+    return url
+
+
+def _valid_signature(name, params):
+    try:
+        issued = int(params.get('issued', ''))
+    except ValueError:
+        return False
+    if time.time() - issued > settings.MEDIA_URL_MAX_AGE:
+        return False
+    return signing.constant_time_compare(params.get('sig', ''), _signature(name, issued))
+
+
+class MediaURLMixin:
+    """Serializer file field rendering ``media_url`` instead of the storage URL."""
+
+    def to_representation(self, value):
+        if not value:
+            return None
+        return media_url(value.name, self.context.get('request'))
+
+
+class MediaFileField(MediaURLMixin, serializers.FileField):
+    pass
+
+
+class MediaImageField(MediaURLMixin, serializers.ImageField):
+    pass
+
+
+def cache_control(name, protected):
+    immutable = '/thumbs/' in name or name.startswith('project_files/sha256/')
+    scope = 'private' if protected else 'public'
+    if immutable:
+        return f'{scope}, max-age={IMMUTABLE}, immutable'
+    return f'{scope}, max-age={3600 if protected else 86400}'
+
+
+def _download_name(name):
+    if name.startswith('project_files/'):
+        from operation.models import ProjectFile
+
+        original = ProjectFile.objects.filter(file=name).values_list('original_name', flat=True).first()
+        if original:
+            return original
+    return os.path.basename(name)
+
+
+class _RangeFile:
+    """Read-only view of ``length`` bytes of an open file from its current offset."""
+
+    def __init__(self, file, length):
+        self.file = file
+        self.remaining = length
+
+    def read(self, size=-1):
+        if self.remaining <= 0:
+            return b''
+        if size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.file.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def close(self):
+        self.file.close()
+
+
+def _parse_range(header, size):
+    """(start, end) inclusive for a single satisfiable range, None to ignore, False if unsatisfiable."""
+    match = RANGE_RE.match(header.strip())
+    if not match:
+        return None
+    first, last = match.groups()
+    if first:
+        start = int(first)
+        end = min(int(last), size - 1) if last else size - 1
+    elif last:
+        start = max(size - int(last), 0)
+        end = size - 1
+    else:
+        return None
+    if start >= size or start > end:
+        return False
+    return start, end
+
+
+def send_file(request, path, name, cache, download_name=None, as_attachment=False, use_proxy=True):
+    """Serve ``path`` via the configured proxy or a range-aware FileResponse."""
+    try:
+        stat = os.stat(path)
+    except (FileNotFoundError, NotADirectoryError):
+        raise Http404
+    if not os.path.isfile(path):
+        raise Http404
+
+    content_type, encoding = mimetypes.guess_type(download_name or name)
+    content_type = content_type or 'application/octet-stream'
+    etag = f'"{int(stat.st_mtime):x}-{stat.st_size:x}"'
+    last_modified = http_date(stat.st_mtime)
+    disposition = 'attachment' if as_attachment else 'inline'
+    headers = {
+        'Cache-Control': cache,
+        'ETag': etag,
+        'Last-Modified': last_modified,
+        'Accept-Ranges': 'bytes',
+    }
+    if download_name:
+        headers['Content-Disposition'] = f"{disposition}; filename*=UTF-8''{quote(download_name)}"
+
+    accel_prefix = settings.MEDIA_ACCEL_REDIRECT_PREFIX
+    if use_proxy and (accel_prefix or settings.MEDIA_X_SENDFILE):
+        response = HttpResponse(content_type=content_type)
+        if accel_prefix:
+            response['X-Accel-Redirect'] = accel_prefix.rstrip('/') + '/' + quote(name)
+        else:
+            response['X-Sendfile'] = path
+        for header, value in headers.items():
+            response[header] = value
+        return response
+
+    if_none_match = request.headers.get('If-None-Match')
+    if if_none_match:
+        not_modified = if_none_match.strip() == '*' or etag in [tag.strip() for tag in if_none_match.split(',')]
+    else:
+        since = parse_http_date_safe(request.headers.get('If-Modified-Since', ''))
+        not_modified = since is not None and int(stat.st_mtime) <= since
+    if not_modified:
+        response = HttpResponseNotModified()
+        for header in ('Cache-Control', 'ETag', 'Last-Modified'):
+            response[header] = headers[header]
+        return response
+
+    byte_range = None
+    range_header = request.headers.get('Range')
+    if_range = request.headers.get('If-Range')
+    if range_header and (not if_range or if_range.strip() in (etag, last_modified)):
+        byte_range = _parse_range(range_header, stat.st_size)
+        if byte_range is False:
+            response = HttpResponse(status=416)
+            response['Content-Range'] = f'bytes */{stat.st_size}'
+            return response
+
+    file = open(path, 'rb')
+    if byte_range:
+        start, end = byte_range
+        file.seek(start)
+        length = end - start + 1
+        response = FileResponse(_RangeFile(file, length), status=206, content_type=content_type)
+        response['Content-Range'] = f'bytes {start}-{end}/{stat.st_size}'
+    else:
+        length = stat.st_size
+        response = FileResponse(file, content_type=content_type)
+    response['Content-Length'] = str(length)
+    if encoding:
+        response['Content-Encoding'] = encoding
+    for header, value in headers.items():
+        response[header] = value
+    return response
+
+
+def _media_name(path):
+    """
+    Normalized media name for a URL path. Absolute paths and ``.``/``..``
+    segments raise Http404, so a name can't dodge its prefix's access check.
+    """
+    if not path or path.startswith('/') or any(part in ('.', '..') for part in path.split('/')):
+        raise Http404
+    return posixpath.normpath(path)
+
+
+class MediaView(APIView):
+    """Serves MEDIA_ROOT with per-prefix access checks."""
+    permission_classes = [AllowAny]
+
+    def get(self, request, path):
+        name = _media_name(path)
+        try:
+            full_path = safe_join(settings.MEDIA_ROOT, name)
+        except SuspiciousFileOperation:
+            raise Http404
+
+        check = _access_check(name)
+        if check is not None and not _valid_signature(name, request.query_params):
+            if not request.user.is_authenticated:
+                raise NotAuthenticated()
+            if not check(request.user, name):
+                raise PermissionDenied()
+
+        return send_file(
+            request, full_path, name,
+            cache=cache_control(name, protected=check is not None),
+            download_name=_download_name(name) if check is not None or request.query_params.get('download') else None,
+            as_attachment=bool(request.query_params.get('download')),
+        )
+
+
+def serve_static(request, path):
+    """Fallback for the legacy /staticfiles/ prefix; WhiteNoise serves STATIC_URL."""
+    try:
+        full_path = safe_join(settings.STATIC_ROOT, path)
+    except SuspiciousFileOperation:
+        raise Http404
+    return send_file(request, full_path, path, cache='public, max-age=86400', use_proxy=False)
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.8 on 2026-10-19 18:36
+
+from django.db import migrations, models
+
+
+def backfill_has_reports(apps, schema_editor):
+    CustomUser = apps.get_model('authapp', 'CustomUser')
+    lead_ids = set(
+        CustomUser.objects.filter(reports_to__isnull=False)
+        .values_list('reports_to_id', flat=True)
+        .distinct()
+    )
+    if lead_ids:
+        CustomUser.objects.filter(id__in=lead_ids).update(has_reports=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authapp', '0010_customuser_is_residential_same_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='customuser',
+            name='has_reports',
+            field=models.BooleanField(db_index=True, default=False, editable=False, help_text='Denormalized: at least one user reports to this user'),
+        ),
+        migrations.RunPython(backfill_has_reports, migrations.RunPython.noop),
+    ]
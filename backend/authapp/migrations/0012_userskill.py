@@ -0,0 +1,45 @@
+# Generated by Django 5.2.8 on 2026-10-19 19:29
+
+import re
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+SKILL_SEPARATORS = re.compile(r'[,;|\n]+')
+
+
+def backfill_user_skills(apps, schema_editor):
+    CustomUser = apps.get_model('authapp', 'CustomUser')
+    UserSkill = apps.get_model('authapp', 'UserSkill')
+    rows = []
+    for user_id, skills in CustomUser.objects.exclude(skills__isnull=True).exclude(skills='').values_list('id', 'skills'):
+        tokens = set()
+        for entry in SKILL_SEPARATORS.split(skills):
+            token = ' '.join(entry.split()).lstrip('-*\u2022 ').lower()[:100].strip()
+            if token:
+                tokens.add(token)
+        rows.extend(UserSkill(user_id=user_id, skill=token) for token in tokens)
+    UserSkill.objects.bulk_create(rows, batch_size=1000, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authapp', '0011_customuser_has_reports'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserSkill',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('skill', models.CharField(max_length=100)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='skill_tokens', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'unique_together': {('skill', 'user')},
+            },
+        ),
+        migrations.RunPython(backfill_user_skills, migrations.RunPython.noop),
+    ]
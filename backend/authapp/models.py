@@ -1,9 +1,13 @@
+import re
+
 from django.contrib.auth.models import AbstractUser
 from django.db import models
-from django.db.models.signals import post_save
+from django.db.models import Q
+from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
 from django.contrib.auth.base_user import BaseUserManager
 from django.utils.translation import gettext_lazy as _
+from authapp.images import process_image_safely
 
 class CustomUserManager(BaseUserManager):
     def create_user(self, email, password=None, **extra_fields):
@@ -30,6 +34,10 @@ class Department(models.Model):
     worksheet_url = models.URLField(max_length=500, blank=True, null=True)
     services = models.TextField(blank=True, null=True)
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.__original_name = self.__dict__.get('name')
+
     def __str__(self):
         return self.name or "No Name"
 
@@ -94,6 +102,7 @@ class CustomUser(AbstractUser):
     designation = models.ForeignKey(Designation, on_delete=models.SET_NULL, null=True, blank=True, related_name="users")
     department = models.ForeignKey(Department, on_delete=models.SET_NULL, null=True, blank=True)
     reports_to = models.ForeignKey('self', on_delete=models.SET_NULL, null=True, blank=True, related_name='subordinates')
+    has_reports = models.BooleanField(default=False, db_index=True, editable=False, help_text="Denormalized: at least one user reports to this user")
     employee_id = models.CharField(max_length=20, unique=True, blank=True, null=True)
     joining_date = models.DateField(blank=True, null=True)
     dob = models.DateField(null=True, blank=True)
@@ -119,6 +128,16 @@ class CustomUser(AbstractUser):
 
     objects = CustomUserManager()
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Read from __dict__ so deferred loads (.only()/.defer()) don't trigger a query
+        self.__original_reports_to_id = self.__dict__.get('reports_to_id')
+        self.__original_department_id = self.__dict__.get('department_id')
+        self.__original_names = tuple(
+            self.__dict__.get(field) for field in ('name', 'first_name', 'last_name', 'username')
+        )
+        self.__original_skills = self.__dict__.get('skills')
+
     def __str__(self):
         return self.email or "No Email"
 
@@ -172,6 +191,73 @@ class PermissionOverride(models.Model):
         return f"{self.user.email} - {self.page}.{self.action} - {status}"
 
 
+class UserSkill(models.Model):
+    """
+    One normalized entry of CustomUser.skills, kept in step with the text by
+    sync_user_skills so staffing searches filter on an indexed column.
+    """
+    user = models.ForeignKey(CustomUser, on_delete=models.CASCADE, related_name="skill_tokens")
+    skill = models.CharField(max_length=100)
+
+    class Meta:
+        # Leading with skill: lookups go skill -> users
+        unique_together = ("skill", "user")
+
+    def __str__(self):
+        return f"{self.user_id} - {self.skill}"
+
+
+SKILL_SEPARATORS = re.compile(r'[,;|\n]+')
+MAX_SKILL_LENGTH = 100
+
+
+def skill_tokens(text):
+    """
+    Normalized skills in a free-text list: entries are separated by commas,
+    semicolons, pipes or new lines, lower-cased, with runs of whitespace
+    and leading bullets collapsed.
+    """
+    tokens = set()
+    for entry in SKILL_SEPARATORS.split(text or ''):
+        token = ' '.join(entry.split()).lstrip('-*\u2022 ').lower()[:MAX_SKILL_LENGTH].strip()
+        if token:
+            tokens.add(token)
+    return tokens
+
+
+def sync_user_skills(user):
+    """Replace the user's UserSkill rows with the tokens of ``user.skills``."""
+    tokens = skill_tokens(user.skills)
+    existing = set(UserSkill.objects.filter(user=user).values_list('skill', flat=True))
+    if existing - tokens:
+        UserSkill.objects.filter(user=user, skill__in=existing - tokens).delete()
+    if tokens - existing:
+        UserSkill.objects.bulk_create(
+            [UserSkill(user=user, skill=token) for token in tokens - existing],
+            ignore_conflicts=True,
+        )
+
+
+def refresh_has_reports(user_ids):
+    """
+    Recompute the denormalized has_reports flag for the given users.
+    Lead ids are resolved in Python first because MySQL cannot update a
+    table from a subquery on the same table.
+    """
+    user_ids = {uid for uid in user_ids if uid}
+    if not user_ids:
+        return
+    lead_ids = set(
+        CustomUser.objects.filter(reports_to_id__in=user_ids)
+        .values_list('reports_to_id', flat=True)
+        .distinct()
+    )
+    if lead_ids:
+        CustomUser.objects.filter(id__in=lead_ids, has_reports=False).update(has_reports=True)
+    if user_ids - lead_ids:
+        CustomUser.objects.filter(id__in=user_ids - lead_ids, has_reports=True).update(has_reports=False)
+
+
 def get_user_effective_permissions(user):
     """
     Calculate effective permissions for a user:
@@ -265,6 +351,22 @@ def has_user_permission(user, page, action):
     return effective.get(page, {}).get(f'can_{action}', False)
 
 
+def users_with_permission(page, action):
+    """
+    Set-based counterpart of has_user_permission: active users holding
+    ``action`` on ``page`` through their role or a direct permission and
+    not blocked by an override, plus superadmins. Proxy-inferred access is
+    not included.
+    """
+    flag = f'can_{action}'
+    superadmin = Q(is_superuser=True) | Q(role__name="Superadmin")
+    granted = (
+        Q(role__in=Permission.objects.filter(page=page, **{flag: True}).values('role'))
+        | Q(pk__in=UserPermission.objects.filter(page=page, **{flag: True}).values('user'))
+    ) & ~Q(pk__in=PermissionOverride.objects.filter(page=page, action=flag, is_blocked=True).values('user'))
+    return CustomUser.objects.filter(superadmin | granted, is_active=True, status='active')
+
+
 @receiver(post_save, sender=Role)
 def set_default_permissions(sender, instance, created, **kwargs):
     if created:
@@ -332,4 +434,35 @@ def set_default_user_permissions(sender, instance, created, **kwargs):
                         "can_edit": p["can_edit"],
                         "can_delete": p["can_delete"]
                     }
-                )
\ No newline at end of file
+                )
+
+
+@receiver(post_save, sender=CustomUser)
+def sync_lead_has_reports(sender, instance, created, **kwargs):
+    original = instance._CustomUser__original_reports_to_id
+    if created or instance.reports_to_id != original:
+        refresh_has_reports([original, instance.reports_to_id])
+    instance._CustomUser__original_reports_to_id = instance.reports_to_id
+
+
+@receiver(post_save, sender=CustomUser)
+def sync_skill_tokens(sender, instance, created, **kwargs):
+    original = instance._CustomUser__original_skills
+    skills = instance.__dict__.get('skills', original)
+    if skills != original or (created and skills):
+        sync_user_skills(instance)
+    instance._CustomUser__original_skills = skills
+
+
+@receiver(post_delete, sender=CustomUser)
+def clear_lead_has_reports(sender, instance, **kwargs):
+    if instance.reports_to_id:
+        refresh_has_reports([instance.reports_to_id])
+
+
+@receiver(post_save, sender=CustomUser)
+def process_profile_image(sender, instance, update_fields=None, **kwargs):
+    if update_fields is not None and 'image' not in update_fields:
+        return
+    if instance.image:
+        process_image_safely(instance.image)
@@ -1,5 +1,6 @@
 from rest_framework import serializers
 from .models import CustomUser, Role, Permission, Department, UserPermission, PermissionOverride, get_user_effective_permissions, Designation
+from .images import thumbnail_url
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
 from django.conf import settings
 from django.core.mail import send_mail
@@ -106,10 +107,11 @@ class UserSerializer(serializers.ModelSerializer):
     effective_permissions = serializers.SerializerMethodField()
     image = serializers.ImageField(required=False)
     image_url = serializers.SerializerMethodField()
+    image_thumb_url = serializers.SerializerMethodField()
 
     class Meta:
         model = CustomUser
-        fields = ['id', 'first_name','last_name', 'email', 'name', 'employee_id', 'status', 'role', 'role_id', 'department', 'department_id', 'designation', 'designation_id', 'exit_date', 'direct_permissions', 'effective_permissions', 'image', 'image_url']
+        fields = ['id', 'first_name','last_name', 'email', 'name', 'employee_id', 'status', 'role', 'role_id', 'department', 'department_id', 'designation', 'designation_id', 'exit_date', 'direct_permissions', 'effective_permissions', 'image', 'image_url', 'image_thumb_url']
 
     def get_effective_permissions(self, obj):
         """Returns computed effective permissions for the user"""
@@ -124,6 +126,30 @@ class UserSerializer(serializers.ModelSerializer):
             return obj.image.url
         return None
 
+    def get_image_thumb_url(self, obj):
+        return thumbnail_url(obj.image, request=self.context.get('request'))
+
+class UserMiniSerializer(serializers.ModelSerializer):
+    """Compact user shape for nested lists (members, assignees, authors)."""
+    image_url = serializers.SerializerMethodField()
+    image_thumb_url = serializers.SerializerMethodField()
+
+    class Meta:
+        model = CustomUser
+        fields = ['id', 'name', 'username', 'email', 'image_url', 'image_thumb_url']
+        read_only_fields = fields
+
+    def get_image_url(self, obj):
+        if obj.image:
+            request = self.context.get('request')
+            if request:
+                return request.build_absolute_uri(obj.image.url)
+            return obj.image.url
+        return None
+
+    def get_image_thumb_url(self, obj):
+        return thumbnail_url(obj.image, request=self.context.get('request'))
+
 class ProfileSerializer(serializers.ModelSerializer):
     role = RoleSerializer(read_only=True)
     department = DepartmentSerializer(read_only=True)
@@ -132,6 +158,7 @@ class ProfileSerializer(serializers.ModelSerializer):
     
     image = serializers.ImageField(required=False)
     image_url = serializers.SerializerMethodField()
+    image_thumb_url = serializers.SerializerMethodField()
     
     role_id = serializers.PrimaryKeyRelatedField(
         queryset=Role.objects.all(), 
@@ -173,19 +200,22 @@ class ProfileSerializer(serializers.ModelSerializer):
                 return request.build_absolute_uri(obj.image.url)
             return obj.image.url
         return None
+
+    def get_image_thumb_url(self, obj):
+        return thumbnail_url(obj.image, request=self.context.get('request'))
     
     class Meta:
         model = CustomUser
         fields = [
             'id', 'email', 'name', 'employee_id', 'address', 'residential_address', 'is_residential_same',
-            'phone_number', 'mobile', 'country_code', 'image', 'image_url',
+            'phone_number', 'mobile', 'country_code', 'image', 'image_url', 'image_thumb_url',
             'role', 'role_id', 'department', 'department_id', 'designation', 'designation_id', 'reports_to',
             'reports_to_id', 'joining_date', 'dob', 'probation_period',
             'exit_date', 'gender', 'skills', 'hourly_rate', 'status',
             'login_enabled', 'email_notifications', 'created_at',
             'updated_at', 'direct_permissions', 'effective_permissions'
         ]
-        read_only_fields = ['id', 'employee_id', 'created_at', 'updated_at', 'image_url']
+        read_only_fields = ['id', 'employee_id', 'created_at', 'updated_at', 'image_url', 'image_thumb_url']
 
 class UserCreateSerializer(serializers.ModelSerializer):
     role_id = serializers.PrimaryKeyRelatedField(
@@ -45,6 +45,8 @@ INSTALLED_APPS = [
     'gmail',
     'notifications.apps.NotificationsConfig',
     'events',
+    'reports',
+    'portal',
 ]
 
 MIDDLEWARE = [
@@ -116,6 +118,15 @@ STATIC_ROOT = BASE_DIR / 'staticfiles'  # For collectstatic in production
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Media delivery (authapp/media.py). Behind nginx, set MEDIA_ACCEL_REDIRECT_PREFIX
+# to an internal location aliasing MEDIA_ROOT, e.g.
+#   location /protected-media/ { internal; alias /app/media/; }
+# With Apache/lighttpd mod_xsendfile set MEDIA_X_SENDFILE=True instead.
+MEDIA_ACCEL_REDIRECT_PREFIX = os.getenv('MEDIA_ACCEL_REDIRECT_PREFIX', '')
+MEDIA_X_SENDFILE = os.getenv('MEDIA_X_SENDFILE', 'False').lower() == 'true'
+# Lifetime of signed URLs for protected media, in seconds
+MEDIA_URL_MAX_AGE = int(os.getenv('MEDIA_URL_MAX_AGE', 6 * 3600))
+
 # Default primary key field type
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
@@ -131,6 +142,16 @@ STORAGES = {
 
 AUTH_USER_MODEL = 'authapp.CustomUser'
 
+# Cache: database-backed by default so all gunicorn workers share it
+# (run `manage.py createcachetable`); point CACHE_BACKEND/CACHE_LOCATION at
+# Redis or Memcached when available.
+CACHES = {
+    'default': {
+        'BACKEND': os.getenv('CACHE_BACKEND', 'django.core.cache.backends.db.DatabaseCache'),
+        'LOCATION': os.getenv('CACHE_LOCATION', 'django_cache'),
+    }
+}
+
 # DRF Configuration
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
@@ -141,6 +162,11 @@ REST_FRAMEWORK = {
     ],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 20,
+    'DEFAULT_THROTTLE_RATES': {
+        # Client portal (portal/throttling.py): per client, and per IP for login
+        'client_portal': os.getenv('CLIENT_PORTAL_RATE', '120/min'),
+        'client_portal_login': os.getenv('CLIENT_PORTAL_LOGIN_RATE', '10/min'),
+    },
 }
 
 # Simple JWT
@@ -177,6 +203,7 @@ CORS_ALLOW_HEADERS = [
     "user-agent",
     "x-csrftoken",
     "x-requested-with",
+    "x-chunk-sha256",
 ]
 
 # Allow credentials if needed (for cookies, auth)
@@ -189,6 +216,26 @@ CSRF_TRUSTED_ORIGINS = [o.strip() for o in os.getenv('CSRF_TRUSTED_ORIGINS', 'ht
 DATA_UPLOAD_MAX_MEMORY_SIZE = int(os.getenv('DATA_UPLOAD_MAX_MEMORY_SIZE', 20971520))
 FILE_UPLOAD_MAX_MEMORY_SIZE = int(os.getenv('FILE_UPLOAD_MAX_MEMORY_SIZE', 20971520))
 
+# Chunked project file uploads (operation/uploads.py)
+PROJECT_UPLOAD_MAX_SIZE = int(os.getenv('PROJECT_UPLOAD_MAX_SIZE', 5 * 1024 ** 3))
+PROJECT_UPLOAD_CHUNK_SIZE = int(os.getenv('PROJECT_UPLOAD_CHUNK_SIZE', 8 * 1024 ** 2))
+
+# Background export jobs (reports/jobs.py), run by `manage.py run_export_jobs`
+EXPORT_JOB_TTL = int(os.getenv('EXPORT_JOB_TTL', 24 * 3600))
+# Running jobs whose progress hasn't moved for this long are marked failed
+EXPORT_JOB_TIMEOUT = int(os.getenv('EXPORT_JOB_TIMEOUT', 30 * 60))
+
+# PDF report branding (reports/pdf.py)
+REPORT_COMPANY_NAME = os.getenv('REPORT_COMPANY_NAME', 'MarketBytes')
+REPORT_LOGO_PATH = os.getenv('REPORT_LOGO_PATH', '')
+REPORT_BRAND_COLOR = os.getenv('REPORT_BRAND_COLOR', '#616161')
+
+# Client portal (portal/): signed client token lifetime and snapshot cache
+CLIENT_PORTAL_TOKEN_TTL = int(os.getenv('CLIENT_PORTAL_TOKEN_TTL', 12 * 3600))
+# Snapshots are invalidated on project, task and contract writes; the TTL
+# bounds how stale logged hours can get
+CLIENT_PORTAL_SNAPSHOT_TTL = int(os.getenv('CLIENT_PORTAL_SNAPSHOT_TTL', 5 * 60))
+
 # Email Configuration
 EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
 EMAIL_HOST = os.getenv('EMAIL_HOST')
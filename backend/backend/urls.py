@@ -16,8 +16,7 @@ Including another URLconf
 """
 from django.contrib import admin
 from django.urls import path, include, re_path
-from django.conf import settings
-from django.views.static import serve
+from authapp.media import MediaView, serve_static
 
 urlpatterns = [
     path('admin/', admin.site.urls),
@@ -29,9 +28,11 @@ urlpatterns = [
     path('api/gmail/', include('gmail.urls')),
     path('api/notifications/', include('notifications.urls')),
     path('api/events/', include('events.urls')),
+    path('api/reports/', include('reports.urls')),
+    path('api/portal/', include('portal.urls')),
 ]
 
 urlpatterns += [
-    re_path(r'^media/(?P<path>.*)$', serve, {'document_root': settings.MEDIA_ROOT}),
-    re_path(r'^staticfiles/(?P<path>.*)$', serve, {'document_root': settings.STATIC_ROOT}),
+    re_path(r'^media/(?P<path>.*)$', MediaView.as_view(), name='media'),
+    re_path(r'^staticfiles/(?P<path>.*)$', serve_static),
 ]
\ No newline at end of file
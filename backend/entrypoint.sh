@@ -6,6 +6,12 @@
 echo "Running migrations..."
 python manage.py migrate --noinput
 
+echo "Creating cache table..."
+python manage.py createcachetable
+
+echo "Building search index (first start only)..."
+python manage.py rebuild_search_index --if-empty
+
 echo "Collecting static files..."
 python manage.py collectstatic --noinput
 
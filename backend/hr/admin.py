@@ -4,7 +4,8 @@ from django.urls import reverse
 from django.utils import timezone
 from .models import (
     Attendance, Holiday, LeaveType, Leave, Overtime,
-    Candidate, Performance, Project, Task, WorkSession, BreakSession
+    Candidate, Performance, Project, Task, WorkSession, BreakSession,
+    ProjectCostEntry, ProjectMonthlyCost,
 )
 
 class YearFilter(admin.SimpleListFilter):
@@ -169,4 +170,22 @@ class PerformanceAdmin(admin.ModelAdmin):
     list_display = ('employee', 'department', 'review_period', 'rating', 'reviewed_by')
     list_filter = ('department', 'review_period')
     search_fields = ('employee__name', 'review_period')
-    list_select_related = ('employee', 'department', 'reviewed_by')
\ No newline at end of file
+    list_select_related = ('employee', 'department', 'reviewed_by')
+
+
+@admin.register(ProjectCostEntry)
+class ProjectCostEntryAdmin(admin.ModelAdmin):
+    list_display = ('project', 'employee', 'month', 'duration_seconds', 'hourly_rate', 'cost')
+    list_filter = ('month',)
+    search_fields = ('project__name', 'employee__name')
+    list_select_related = ('project', 'employee')
+    readonly_fields = ('work_session', 'project', 'employee', 'month', 'duration_seconds', 'hourly_rate', 'cost', 'recorded_at')
+
+
+@admin.register(ProjectMonthlyCost)
+class ProjectMonthlyCostAdmin(admin.ModelAdmin):
+    list_display = ('project', 'month', 'duration_seconds', 'cost')
+    list_filter = ('month',)
+    search_fields = ('project__name',)
+    list_select_related = ('project',)
+    readonly_fields = ('project', 'month', 'duration_seconds', 'cost')
@@ -0,0 +1,132 @@
+"""
+Materialization of leave and holiday days into Attendance rows.
+
+Approved leaves and holidays are written as Attendance rows with status
+'leave'/'holiday' so summaries can be computed as plain aggregations instead
+of re-deriving absences from Leave ranges and Holiday dates on every read.
+Rows that already carry a clock-in are never touched.
+"""
+from datetime import timedelta
+
+from django.db.models import Q
+
+from authapp.models import CustomUser
+from hr.models import Attendance, Holiday, Leave
+
+
+def _date_range(start, end):
+    day = start
+    while day <= end:
+        yield day
+        day += timedelta(days=1)
+
+
+def _insert_missing(rows, existing):
+    """
+    bulk_create ``rows`` skipping conflicts and return how many were inserted.
+    bulk_create hands back every object it was given when ignoring
+    conflicts, so the count comes from ``existing`` before and after.
+    """
+    if not rows:
+        return 0
+    before = existing.count()
+    Attendance.objects.bulk_create(rows, ignore_conflicts=True)
+    return existing.count() - before
+
+
+def clear_leave_days(employee_id, start_date, end_date):
+    """Remove materialized leave rows (without clock-in) for a date range."""
+    if not employee_id or not start_date:
+        return 0
+    deleted, _ = Attendance.objects.filter(
+        employee_id=employee_id,
+        date__range=(start_date, end_date or start_date),
+        status='leave',
+        clock_in__isnull=True,
+    ).delete()
+    return deleted
+
+
+def materialize_leave(leave):
+    """Create 'leave' Attendance rows for every day of an approved leave."""
+    if leave.status != 'approved' or not leave.employee_id or not leave.start_date:
+        return 0
+    end_date = leave.end_date or leave.start_date
+    is_half_day = leave.duration == 'half_day'
+    notes = f"Leave: {leave.leave_type.name}" if leave.leave_type_id else "Leave"
+    rows = [
+        Attendance(
+            employee_id=leave.employee_id,
+            date=day,
+            status='leave',
+            is_half_day=is_half_day,
+            working_from=None,
+            notes=notes,
+        )
+        for day in _date_range(leave.start_date, end_date)
+    ]
+    existing = Attendance.objects.filter(employee_id=leave.employee_id, date__range=(leave.start_date, end_date))
+    return _insert_missing(rows, existing)
+
+
+def sync_leave(leave, original_employee_id, original_start, original_end, original_status):
+    """
+    Bring materialized rows in line with a leave after create/edit.
+    Previously approved ranges are cleared before the current range is
+    written, which covers date edits, rejections and cancellations.
+    """
+    was_approved = original_status == 'approved'
+    changed = (
+        leave.status != original_status
+        or leave.employee_id != original_employee_id
+        or leave.start_date != original_start
+        or leave.end_date != original_end
+    )
+    if not changed:
+        return
+    if was_approved:
+        clear_leave_days(original_employee_id, original_start, original_end)
+    materialize_leave(leave)
+
+
+def materialize_holiday(holiday, employee_ids=None):
+    """Create 'holiday' Attendance rows for all active employees on a holiday."""
+    if not holiday.date:
+        return 0
+    employees = CustomUser.objects.filter(status='active').filter(
+        Q(joining_date__isnull=True) | Q(joining_date__lte=holiday.date)
+    )
+    if employee_ids is not None:
+        employees = employees.filter(id__in=employee_ids)
+    notes = f"Holiday: {holiday.occasion}" if holiday.occasion else "Holiday"
+    rows = [
+        Attendance(employee_id=emp_id, date=holiday.date, status='holiday', working_from=None, notes=notes)
+        for emp_id in employees.values_list('id', flat=True)
+    ]
+    existing = Attendance.objects.filter(date=holiday.date, employee_id__in=[row.employee_id for row in rows])
+    return _insert_missing(rows, existing)
+
+
+def clear_holiday_days(date):
+    """Remove materialized holiday rows (without clock-in) for a date."""
+    if not date:
+        return 0
+    deleted, _ = Attendance.objects.filter(date=date, status='holiday', clock_in__isnull=True).delete()
+    return deleted
+
+
+def materialize_range(start_date, end_date):
+    """Backfill leave and holiday rows for every approved leave/holiday overlapping a range."""
+    leave_rows = 0
+    leaves = Leave.objects.filter(
+        status='approved', start_date__lte=end_date
+    ).filter(
+        Q(end_date__gte=start_date) | Q(end_date__isnull=True, start_date__gte=start_date)
+    ).select_related('leave_type')
+    for leave in leaves.iterator():
+        leave_rows += materialize_leave(leave)
+
+    holiday_rows = 0
+    for holiday in Holiday.objects.filter(date__range=(start_date, end_date)):
+        holiday_rows += materialize_holiday(holiday)
+    return leave_rows, holiday_rows
@@ -0,0 +1,207 @@
+"""
+Incremental project cost ledger.
+
+Every closed WorkSession that has a project and an employee owns one
+ProjectCostEntry priced at the employee's hourly rate when the session was
+first recorded; later edits to the session keep that rate, so changing a
+user's hourly_rate does not rewrite past months. ProjectCostTotal and
+ProjectMonthlyCost are running sums of the entries, adjusted by deltas in
+the same transaction as the entry change.
+"""
+from decimal import Decimal, ROUND_HALF_UP
+
+from django.db import IntegrityError, transaction
+from django.db.models import F, Sum
+from django.utils import timezone
+
+from hr.models import ProjectCostEntry, ProjectCostTotal, ProjectMonthlyCost, WorkSession
+from operation.caching import CLOSED_MONTHS_NAMESPACE, bump_version
+from operation.financials import current_month
+
+COST_QUANTUM = Decimal('0.0001')
+
+
+def month_of(dt):
+    return timezone.localtime(dt).date().replace(day=1)
+
+
+def price(duration_seconds, hourly_rate):
+    cost = Decimal(duration_seconds) * Decimal(hourly_rate or 0) / 3600
+    return cost.quantize(COST_QUANTUM, rounding=ROUND_HALF_UP)
+
+
+def _apply_delta(project_id, month, seconds, cost, create=True):
+    """
+    Add (seconds, cost) to the project's total and monthly rows. Reversals
+    pass create=False so a cascading project delete never re-creates rows.
+    """
+    if not seconds and not cost:
+        return
+    if month < current_month():
+        bump_version(CLOSED_MONTHS_NAMESPACE)
+    targets = (
+        (ProjectCostTotal, {'project_id': project_id}),
+        (ProjectMonthlyCost, {'project_id': project_id, 'month': month}),
+    )
+    for model, lookup in targets:
+        updated = model.objects.filter(**lookup).update(
+            duration_seconds=F('duration_seconds') + seconds,
+            cost=F('cost') + cost,
+        )
+        if updated or not create:
+            continue
+        try:
+            with transaction.atomic():
+                model.objects.create(duration_seconds=seconds, cost=cost, **lookup)
+        except IntegrityError:
+            # Another session created the row first
+            model.objects.filter(**lookup).update(
+                duration_seconds=F('duration_seconds') + seconds,
+                cost=F('cost') + cost,
+            )
+
+
+def _is_billable(session):
+    return bool(
+        session.end_time
+        and session.project_id
+        and session.employee_id
+        and session.duration_seconds is not None
+    )
+
+
+def record_session(session):
+    """Create, update or drop the ledger entry for a saved WorkSession."""
+    with transaction.atomic():
+        entry = ProjectCostEntry.objects.select_for_update().filter(work_session_id=session.pk).first()
+        if not _is_billable(session):
+            if entry:
+                entry.delete()
+            return
+
+        if entry and entry.employee_id == session.employee_id:
+            rate = entry.hourly_rate
+        else:
+            rate = session.employee.hourly_rate or 0
+        month = month_of(session.start_time or session.end_time)
+        seconds = session.duration_seconds
+        cost = price(seconds, rate)
+
+        if entry is None:
+            ProjectCostEntry.objects.create(
+                work_session=session,
+                project_id=session.project_id,
+                employee_id=session.employee_id,
+                month=month,
+                duration_seconds=seconds,
+                hourly_rate=rate,
+                cost=cost,
+            )
+            _apply_delta(session.project_id, month, seconds, cost)
+            return
+
+        unchanged = (
+            entry.project_id == session.project_id
+            and entry.employee_id == session.employee_id
+            and entry.month == month
+            and entry.duration_seconds == seconds
+            and entry.cost == cost
+        )
+        if unchanged:
+            return
+
+        _apply_delta(entry.project_id, entry.month, -entry.duration_seconds, -entry.cost, create=False)
+        entry.project_id = session.project_id
+        entry.employee_id = session.employee_id
+        entry.month = month
+        entry.duration_seconds = seconds
+        entry.hourly_rate = rate
+        entry.cost = cost
+        entry.save()
+        _apply_delta(entry.project_id, month, seconds, cost)
+
+
+def reverse_entry(entry):
+    """Remove a deleted entry's contribution from the running totals."""
+    _apply_delta(entry.project_id, entry.month, -entry.duration_seconds, -entry.cost, create=False)
+
+
+def rebuild_ledger(project_ids=None, reprice=False, batch_size=1000):
+    """
+    Rebuild entries and totals from WorkSession rows. Historical rates are
+    kept for sessions that already have an entry unless ``reprice`` is set.
+    Returns the number of entries written.
+    """
+    sessions = WorkSession.objects.filter(
+        end_time__isnull=False,
+        project__isnull=False,
+        employee__isnull=False,
+        duration_seconds__isnull=False,
+    ).select_related('employee')
+    entries = ProjectCostEntry.objects.all()
+    totals = ProjectCostTotal.objects.all()
+    monthly = ProjectMonthlyCost.objects.all()
+    if project_ids:
+        sessions = sessions.filter(project_id__in=project_ids)
+        entries = entries.filter(project_id__in=project_ids)
+        totals = totals.filter(project_id__in=project_ids)
+        monthly = monthly.filter(project_id__in=project_ids)
+
+    with transaction.atomic():
+        # Sessions closed through queryset.update() never had a duration computed
+        unpriced = WorkSession.objects.filter(
+            end_time__isnull=False, start_time__isnull=False, duration_seconds__isnull=True,
+        )
+        if project_ids:
+            unpriced = unpriced.filter(project_id__in=project_ids)
+        for pk, start_time, end_time in unpriced.values_list('pk', 'start_time', 'end_time'):
+            WorkSession.objects.filter(pk=pk).update(
+                duration_seconds=int((end_time - start_time).total_seconds())
+            )
+
+        kept_rates = {} if reprice else {
+            (session_id, employee_id): rate
+            for session_id, employee_id, rate in entries.values_list('work_session_id', 'employee_id', 'hourly_rate')
+        }
+        # Totals go first so the per-entry reversal signals have nothing to adjust
+        totals.delete()
+        monthly.delete()
+        entries.delete()
+
+        batch, written = [], 0
+        for session in sessions.iterator(chunk_size=batch_size):
+            rate = kept_rates.get((session.pk, session.employee_id), session.employee.hourly_rate or 0)
+            batch.append(ProjectCostEntry(
+                work_session_id=session.pk,
+                project_id=session.project_id,
+                employee_id=session.employee_id,
+                month=month_of(session.start_time or session.end_time),
+                duration_seconds=session.duration_seconds,
+                hourly_rate=rate,
+                cost=price(session.duration_seconds, rate),
+            ))
+            if len(batch) >= batch_size:
+                ProjectCostEntry.objects.bulk_create(batch)
+                written += len(batch)
+                batch = []
+        if batch:
+            ProjectCostEntry.objects.bulk_create(batch)
+            written += len(batch)
+        bump_version(CLOSED_MONTHS_NAMESPACE)
+
+        rebuilt = ProjectCostEntry.objects.all()
+        if project_ids:
+            rebuilt = rebuilt.filter(project_id__in=project_ids)
+        rebuilt = rebuilt.order_by()
+        ProjectCostTotal.objects.bulk_create([
+            ProjectCostTotal(project_id=row['project_id'], duration_seconds=row['seconds'], cost=row['cost'])
+            for row in rebuilt.values('project_id').annotate(seconds=Sum('duration_seconds'), cost=Sum('cost'))
+        ], batch_size=batch_size)
+        ProjectMonthlyCost.objects.bulk_create([
+            ProjectMonthlyCost(
+                project_id=row['project_id'], month=row['month'],
+                duration_seconds=row['seconds'], cost=row['cost'],
+            )
+            for row in rebuilt.values('project_id', 'month').annotate(seconds=Sum('duration_seconds'), cost=Sum('cost'))
+        ], batch_size=batch_size)
+    return written
@@ -0,0 +1,36 @@
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from hr.attendance import materialize_range
+
+
+class Command(BaseCommand):
+    help = "Materialize Attendance rows for approved leaves and holidays in a date range"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--from', dest='start_date', help="Start date (YYYY-MM-DD), defaults to 1 Jan of this year")
+        parser.add_argument('--to', dest='end_date', help="End date (YYYY-MM-DD), defaults to 31 Dec of this year")
+
+    def handle(self, *args, **options):
+        today = timezone.localdate()
+        try:
+            start_date = (
+                datetime.strptime(options['start_date'], '%Y-%m-%d').date()
+                if options['start_date'] else today.replace(month=1, day=1)
+            )
+            end_date = (
+                datetime.strptime(options['end_date'], '%Y-%m-%d').date()
+                if options['end_date'] else today.replace(month=12, day=31)
+            )
+        except ValueError:
+            raise CommandError("Dates must be in YYYY-MM-DD format")
+        if end_date < start_date:
+            raise CommandError("--to must not be before --from")
+
+        leave_rows, holiday_rows = materialize_range(start_date, end_date)
+        self.stdout.write(self.style.SUCCESS(
+            f"Created {leave_rows} leave and {holiday_rows} holiday attendance row(s) "
+            f"between {start_date} and {end_date}."
+        ))
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from hr.ledger import rebuild_ledger
+
+
+class Command(BaseCommand):
+    help = "Rebuild project cost ledger entries and running totals from closed work sessions"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--project', dest='projects', type=int, action='append',
+                            help="Only rebuild this project id (repeatable)")
+        parser.add_argument('--reprice', action='store_true',
+                            help="Price every session at the employee's current hourly rate")
+
+    def handle(self, *args, **options):
+        written = rebuild_ledger(project_ids=options['projects'], reprice=options['reprice'])
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {written} ledger entr{'y' if written == 1 else 'ies'}."))
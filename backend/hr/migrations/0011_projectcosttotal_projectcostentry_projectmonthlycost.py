@@ -0,0 +1,110 @@
+# Generated by Django 5.2.8 on 2026-10-19 18:41
+
+import django.db.models.deletion
+from decimal import Decimal, ROUND_HALF_UP
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Sum
+from django.utils import timezone
+
+
+def backfill_ledger(apps, schema_editor):
+    WorkSession = apps.get_model('hr', 'WorkSession')
+    ProjectCostEntry = apps.get_model('hr', 'ProjectCostEntry')
+    ProjectCostTotal = apps.get_model('hr', 'ProjectCostTotal')
+    ProjectMonthlyCost = apps.get_model('hr', 'ProjectMonthlyCost')
+
+    for pk, start_time, end_time in WorkSession.objects.filter(
+        end_time__isnull=False, start_time__isnull=False, duration_seconds__isnull=True,
+    ).values_list('pk', 'start_time', 'end_time'):
+        WorkSession.objects.filter(pk=pk).update(duration_seconds=int((end_time - start_time).total_seconds()))
+
+    sessions = WorkSession.objects.filter(
+        end_time__isnull=False, project__isnull=False, employee__isnull=False, duration_seconds__isnull=False,
+    ).select_related('employee')
+    batch = []
+    for session in sessions.iterator(chunk_size=1000):
+        rate = session.employee.hourly_rate or 0
+        batch.append(ProjectCostEntry(
+            work_session_id=session.pk,
+            project_id=session.project_id,
+            employee_id=session.employee_id,
+            month=timezone.localtime(session.start_time or session.end_time).date().replace(day=1),
+            duration_seconds=session.duration_seconds,
+            hourly_rate=rate,
+            cost=(Decimal(session.duration_seconds) * Decimal(rate) / 3600).quantize(
+                Decimal('0.0001'), rounding=ROUND_HALF_UP
+            ),
+        ))
+        if len(batch) >= 1000:
+            ProjectCostEntry.objects.bulk_create(batch)
+            batch = []
+    ProjectCostEntry.objects.bulk_create(batch)
+
+    entries = ProjectCostEntry.objects.order_by()
+    ProjectCostTotal.objects.bulk_create([
+        ProjectCostTotal(project_id=row['project_id'], duration_seconds=row['seconds'], cost=row['cost'])
+        for row in entries.values('project_id').annotate(seconds=Sum('duration_seconds'), cost=Sum('cost'))
+    ])
+    ProjectMonthlyCost.objects.bulk_create([
+        ProjectMonthlyCost(project_id=row['project_id'], month=row['month'], duration_seconds=row['seconds'], cost=row['cost'])
+        for row in entries.values('project_id', 'month').annotate(seconds=Sum('duration_seconds'), cost=Sum('cost'))
+    ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hr', '0010_merge_20260309_1744'),
+        ('operation', '0017_remove_project_amc_remove_project_amc_date_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProjectCostTotal',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('duration_seconds', models.BigIntegerField(default=0)),
+                ('cost', models.DecimalField(decimal_places=4, default=0, max_digits=18)),
+                ('project', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='cost_total', to='operation.project')),
+            ],
+            options={
+                'verbose_name_plural': 'Project Cost Totals',
+            },
+        ),
+        migrations.CreateModel(
+            name='ProjectCostEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('month', models.DateField(help_text='First day of the (local) month the session started in')),
+                ('duration_seconds', models.IntegerField(default=0)),
+                ('hourly_rate', models.DecimalField(decimal_places=2, default=0, max_digits=10)),
+                ('cost', models.DecimalField(decimal_places=4, default=0, max_digits=14)),
+                ('recorded_at', models.DateTimeField(auto_now=True)),
+                ('employee', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='cost_entries', to=settings.AUTH_USER_MODEL)),
+                ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='cost_entries', to='operation.project')),
+                ('work_session', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='cost_entry', to='hr.worksession')),
+            ],
+            options={
+                'verbose_name_plural': 'Project Cost Entries',
+                'indexes': [models.Index(fields=['project', 'employee'], name='hr_projectc_project_9b5719_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='ProjectMonthlyCost',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('month', models.DateField()),
+                ('duration_seconds', models.BigIntegerField(default=0)),
+                ('cost', models.DecimalField(decimal_places=4, default=0, max_digits=18)),
+                ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='monthly_costs', to='operation.project')),
+            ],
+            options={
+                'verbose_name_plural': 'Project Monthly Costs',
+                'ordering': ['-month'],
+                'unique_together': {('project', 'month')},
+            },
+        ),
+        migrations.RunPython(backfill_ledger, migrations.RunPython.noop),
+    ]
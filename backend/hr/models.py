@@ -1,8 +1,9 @@
 from django.db import models
-from django.db.models.signals import post_save
+from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
 from django.utils import timezone
 from authapp.models import CustomUser, Department
+from authapp.images import process_image_safely
 from operation.models import Project
 from operation.models import Task
 
@@ -49,6 +50,10 @@ class Holiday(models.Model):
     created_at = models.DateTimeField(auto_now_add=True, null=True, blank=True)
     updated_at = models.DateTimeField(auto_now=True, null=True, blank=True)
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.__original_date = self.date
+
     class Meta:
         ordering = ['date']
         verbose_name_plural = "Holidays"
@@ -91,6 +96,9 @@ class Leave(models.Model):
         super().__init__(*args, **kwargs)
         self.__original_status = self.status
         self.__original_lead_status = self.lead_status
+        self.__original_employee_id = self.employee_id
+        self.__original_start_date = self.start_date
+        self.__original_end_date = self.end_date
 
     class Meta:
         ordering = ['-created_at']
@@ -204,6 +212,55 @@ class BreakSession(models.Model):
         return f"{self.employee.name} - {self.get_type_display()} ({self.duration_seconds or 0}s)"
 
 
+class ProjectCostEntry(models.Model):
+    """
+    Ledger line for a closed WorkSession, priced at the hourly rate in effect
+    when the session was first recorded. Maintained by hr.ledger.
+    """
+    work_session = models.OneToOneField(WorkSession, on_delete=models.CASCADE, related_name='cost_entry')
+    project = models.ForeignKey(Project, on_delete=models.CASCADE, related_name='cost_entries')
+    employee = models.ForeignKey(CustomUser, on_delete=models.CASCADE, related_name='cost_entries')
+    month = models.DateField(help_text="First day of the (local) month the session started in")
+    duration_seconds = models.IntegerField(default=0)
+    hourly_rate = models.DecimalField(max_digits=10, decimal_places=2, default=0)
+    cost = models.DecimalField(max_digits=14, decimal_places=4, default=0)
+    recorded_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [models.Index(fields=['project', 'employee'])]
+        verbose_name_plural = "Project Cost Entries"
+
+    def __str__(self):
+        return f"{self.project} - {self.employee} ({self.duration_seconds}s)"
+
+
+class ProjectCostTotal(models.Model):
+    project = models.OneToOneField(Project, on_delete=models.CASCADE, related_name='cost_total')
+    duration_seconds = models.BigIntegerField(default=0)
+    cost = models.DecimalField(max_digits=18, decimal_places=4, default=0)
+
+    class Meta:
+        verbose_name_plural = "Project Cost Totals"
+
+    def __str__(self):
+        return f"{self.project} total"
+
+
+class ProjectMonthlyCost(models.Model):
+    project = models.ForeignKey(Project, on_delete=models.CASCADE, related_name='monthly_costs')
+    month = models.DateField()
+    duration_seconds = models.BigIntegerField(default=0)
+    cost = models.DecimalField(max_digits=18, decimal_places=4, default=0)
+
+    class Meta:
+        unique_together = ('project', 'month')
+        ordering = ['-month']
+        verbose_name_plural = "Project Monthly Costs"
+
+    def __str__(self):
+        return f"{self.project} - {self.month:%Y-%m}"
+
+
 @receiver(post_save, sender=Leave)
 def notify_leave_status(sender, instance, created, **kwargs):
     from notifications.models import Notification
@@ -258,3 +315,73 @@ def notify_leave_status(sender, instance, created, **kwargs):
                     message=f'Your leave request has been declined by your lead.',
                     priority='medium'
                 )
+
+
+@receiver(post_save, sender=Leave)
+def sync_leave_attendance(sender, instance, created, **kwargs):
+    from hr.attendance import sync_leave
+
+    sync_leave(
+        instance,
+        instance._Leave__original_employee_id,
+        instance._Leave__original_start_date,
+        instance._Leave__original_end_date,
+        None if created else instance._Leave__original_status,
+    )
+    instance._Leave__original_status = instance.status
+    instance._Leave__original_lead_status = instance.lead_status
+    instance._Leave__original_employee_id = instance.employee_id
+    instance._Leave__original_start_date = instance.start_date
+    instance._Leave__original_end_date = instance.end_date
+
+
+@receiver(post_delete, sender=Leave)
+def clear_leave_attendance(sender, instance, **kwargs):
+    from hr.attendance import clear_leave_days
+
+    if instance._Leave__original_status == 'approved':
+        clear_leave_days(
+            instance._Leave__original_employee_id,
+            instance._Leave__original_start_date,
+            instance._Leave__original_end_date,
+        )
+
+
+@receiver(post_save, sender=Holiday)
+def sync_holiday_attendance(sender, instance, created, **kwargs):
+    from hr.attendance import clear_holiday_days, materialize_holiday
+
+    original_date = instance._Holiday__original_date
+    if original_date and original_date != instance.date:
+        clear_holiday_days(original_date)
+    materialize_holiday(instance)
+    instance._Holiday__original_date = instance.date
+
+
+@receiver(post_delete, sender=Holiday)
+def clear_holiday_attendance(sender, instance, **kwargs):
+    from hr.attendance import clear_holiday_days
+
+    clear_holiday_days(instance.date)
+
+
+@receiver(post_save, sender=Candidate)
+def process_candidate_image(sender, instance, update_fields=None, **kwargs):
+    if update_fields is not None and 'image' not in update_fields:
+        return
+    if instance.image:
+        process_image_safely(instance.image)
+
+
+@receiver(post_save, sender=WorkSession)
+def record_work_session_cost(sender, instance, **kwargs):
+    from hr.ledger import record_session
+
+    record_session(instance)
+
+
+@receiver(post_delete, sender=ProjectCostEntry)
+def reverse_project_cost_entry(sender, instance, **kwargs):
+    from hr.ledger import reverse_entry
+
+    reverse_entry(instance)
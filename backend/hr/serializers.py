@@ -2,6 +2,8 @@ from rest_framework import serializers
 from hr.models import Attendance, Holiday, LeaveType, Leave, Overtime, Candidate, Performance, Project, Task, WorkSession, BreakSession
 from authapp.serializers import UserSerializer, DepartmentSerializer
 from authapp.models import CustomUser
+from authapp.images import thumbnail_url
+from authapp.media import MediaImageField
 from django.utils import timezone
 from datetime import datetime, timezone as dt_timezone, time, timedelta
 
@@ -259,11 +261,16 @@ class OvertimeSerializer(serializers.ModelSerializer):
 
 class CandidateSerializer(serializers.ModelSerializer):
     department_name = serializers.CharField(source='department.name', read_only=True)
+    image = MediaImageField(required=False, allow_null=True)
+    image_thumb_url = serializers.SerializerMethodField()
     
     class Meta:
         model = Candidate
         fields = '__all__'
 
+    def get_image_thumb_url(self, obj):
+        return thumbnail_url(obj.image, request=self.context.get('request'))
+
 class PerformanceSerializer(serializers.ModelSerializer):
     employee = UserSerializer(read_only=True)
     department = DepartmentSerializer(read_only=True)
@@ -0,0 +1,83 @@
+"""
+Staffing search.
+
+Finds active employees by skill, department, availability and task load.
+Skills are matched on authapp.UserSkill tokens through its (skill, user)
+index: every ``all_skills`` token must be present (one grouped subquery),
+and at least one ``any_skills`` token (one EXISTS). A user is available when
+no approved leave overlaps the requested date range. Load is the number of
+open (not done, not archived) tasks assigned to the user, counted in a
+correlated subquery so no join multiplies the user rows.
+"""
+from django.db.models import Count, Exists, IntegerField, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce
+
+from authapp.models import CustomUser, UserSkill, skill_tokens
+from hr.models import Leave, Task
+
+
+def open_task_counts():
+    assignments = Task.assignees.through.objects.filter(customuser=OuterRef('pk'))
+    return Coalesce(
+        Subquery(
+            assignments.exclude(task__status='done').exclude(task__is_active=False)
+            .order_by()
+            .values('customuser')
+            .annotate(count=Count('pk'))
+            .values('count'),
+            output_field=IntegerField(),
+        ),
+        Value(0),
+    )
+
+
+def approved_leave_between(date_from, date_to):
+    """Approved leaves of OuterRef('pk') overlapping [date_from, date_to]."""
+    return Leave.objects.filter(
+        Q(end_date__gte=date_from) | Q(end_date__isnull=True, start_date__gte=date_from),
+        employee=OuterRef('pk'),
+        status='approved',
+        start_date__lte=date_to,
+    )
+
+
+def search_staff(all_skills=(), any_skills=(), department=None, date_from=None, date_to=None, max_open_tasks=None):
+    """
+    Active users matching the filters, annotated with ``open_tasks`` and
+    ordered least loaded first. Skills are free text, normalized like
+    CustomUser.skills.
+    """
+    queryset = CustomUser.objects.filter(is_active=True, status='active')
+
+    required = set().union(*[skill_tokens(skill) for skill in all_skills])
+    if required:
+        queryset = queryset.filter(pk__in=(
+            UserSkill.objects.filter(skill__in=required)
+            .order_by()
+            .values('user_id')
+            .annotate(matched=Count('skill'))
+            .filter(matched=len(required))
+            .values('user_id')
+        ))
+    alternatives = set().union(*[skill_tokens(skill) for skill in any_skills])
+    if alternatives:
+        queryset = queryset.filter(Exists(UserSkill.objects.filter(user=OuterRef('pk'), skill__in=alternatives)))
+
+    if department:
+        queryset = queryset.filter(department_id=department)
+    if date_from and date_to:
+        queryset = queryset.filter(~Exists(approved_leave_between(date_from, date_to)))
+
+    queryset = queryset.annotate(open_tasks=open_task_counts())
+    if max_open_tasks is not None:
+        queryset = queryset.filter(open_tasks__lte=max_open_tasks)
+    return queryset.order_by('open_tasks', 'name', 'pk')
+
+
+def user_skills(user_ids):
+    """{user_id: [skill, ...]} for a page of users, in one query."""
+    skills = {user_id: [] for user_id in user_ids}
+    rows = UserSkill.objects.filter(user_id__in=skills).order_by('user_id', 'skill').values_list('user_id', 'skill')
+    for user_id, skill in rows:
+        skills[user_id].append(skill)
+    return skills
@@ -12,6 +12,7 @@ router.register(r'candidates', views.CandidateViewSet)
 router.register(r'performance', views.PerformanceViewSet)
 router.register(r'timer', views.TimerViewSet, basename='timer')
 router.register(r'work-sessions', views.WorkSessionViewSet)
+router.register(r'staffing', views.StaffingViewSet, basename='staffing')
 
 
 urlpatterns = [
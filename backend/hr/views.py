@@ -5,30 +5,66 @@ from rest_framework.permissions import IsAuthenticated
 from authapp.permissions import HasPermission
 from django.utils import timezone
 from datetime import timedelta, datetime, time, timezone as dt_timezone
-from django.db.models import Q, Count, Exists, OuterRef
+from django.db.models import Q, F, Count, Exists, OuterRef, Prefetch
+from django.core.cache import cache
 from hr.models import Attendance, Holiday, LeaveType, Leave, Overtime, Candidate, Performance, Project, Task, WorkSession, BreakSession
 from operation.models import Scrum, ProjectStatus
+from operation.caching import ASSIGNMENTS_NAMESPACE, versioned_key
 from authapp.models import CustomUser, has_user_permission
+from authapp.images import thumbnail_url
 from notifications.models import Notification
+from reports.exports import ROW_NUMBER, Column, ExportMixin, label
+from hr.staffing import search_staff, user_skills
 from hr.serializers import (
     AttendanceSerializer, AttendanceCheckInOutSerializer, AttendanceStatusSerializer,
     HolidaySerializer, LeaveTypeSerializer, LeaveSerializer, OvertimeSerializer,
     CandidateSerializer, PerformanceSerializer, ProjectSerializer, TaskSerializer,
     WorkSessionSerializer, BreakSessionSerializer, ActiveWorkSessionSerializer
 )
-import csv
-from django.http import HttpResponse
-from openpyxl import Workbook
 from reportlab.lib.pagesizes import letter, landscape
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph
-from reportlab.lib.styles import getSampleStyleSheet
-from reportlab.lib import colors
 
-class AttendanceViewSet(viewsets.ModelViewSet):
+
+PROJECTS_TASKS_TTL = 5 * 60
+
+
+def close_open_sessions(model, employee, end_time):
+    """
+    Close an employee's running Work/Break sessions through save() so that
+    duration_seconds is computed and the project cost ledger is updated.
+    """
+    for session in model.objects.filter(employee=employee, end_time__isnull=True):
+        session.end_time = end_time
+        session.save()
+
+
+def attendance_hours(date, clock_in, clock_out):
+    return round(Attendance(date=date, clock_in=clock_in, clock_out=clock_out).calculate_hours(), 2)
+
+
+def yes_no(value):
+    return 'Yes' if value else 'No'
+
+
+class AttendanceViewSet(ExportMixin, viewsets.ModelViewSet):
     queryset = Attendance.objects.all().select_related('employee')
     serializer_class = AttendanceSerializer
     permission_classes = [HasPermission]
     page_names = ['attendance', 'employee_attendance', 'lead_attendance', 'employee_timelogs', 'lead_timelogs']
+    export_columns = [
+        Column('Date', 'date'),
+        Column('Employee', 'employee__name', width=2),
+        Column('Department', 'employee__department__name', width=2),
+        Column('Clock In', 'clock_in'),
+        Column('Clock Out', 'clock_out'),
+        Column('Hours', ('date', 'clock_in', 'clock_out'), render=attendance_hours),
+        Column('Status', 'status', render=label(Attendance._meta.get_field('status').choices)),
+        Column('Working From', 'working_from'),
+        Column('Late', 'is_late', render=yes_no),
+        Column('Half Day', 'is_half_day', render=yes_no),
+        Column('Notes', 'notes', width=3),
+    ]
+    export_filename = 'attendance'
+    export_pagesize = landscape(letter)
     
     def get_queryset(self):
         user = self.request.user
@@ -64,13 +100,8 @@ class AttendanceViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=['get'], permission_classes=[IsAuthenticated])
     def summary(self, request):
         """Get attendance summary for the current month"""
-        month = request.query_params.get('month', timezone.now().month)
-        year = request.query_params.get('year', timezone.now().year)
-        
-        attendances = Attendance.objects.filter(
-            date__month=month,
-            date__year=year
-        )
+        month = int(request.query_params.get('month', timezone.now().month))
+        year = int(request.query_params.get('year', timezone.now().year))
         
         summary = {
             'present': 0,
@@ -99,36 +130,36 @@ class AttendanceViewSet(viewsets.ModelViewSet):
             all_employees = CustomUser.objects.filter(id=request.user.id)
         
         from calendar import monthrange
-        days_in_month = monthrange(int(year), int(month))[1]
-        
-        for day in range(1, days_in_month + 1):
-            current_date = datetime(int(year), int(month), day).date()
-            
-            if current_date > timezone.now().date():
+        month_start = datetime(year, month, 1).date()
+        month_end = datetime(year, month, monthrange(year, month)[1]).date()
+        last_day = min(month_end, timezone.now().date())
+        if last_day < month_start:
+            return Response(summary)
+
+        # Expected employee-days, skipping days before each employee's joining date
+        expected_days = 0
+        for joining_date in all_employees.values_list('joining_date', flat=True):
+            first_day = max(month_start, joining_date) if joining_date else month_start
+            if first_day <= last_day:
+                expected_days += (last_day - first_day).days + 1
+
+        # Leave and holiday days are materialized as Attendance rows (see hr.attendance),
+        # so every non-absent day has a row and the rest are absences.
+        status_counts = (
+            Attendance.objects
+            .filter(employee__in=all_employees, date__range=(month_start, last_day))
+            .filter(Q(employee__joining_date__isnull=True) | Q(date__gte=F('employee__joining_date')))
+            .values('status')
+            .annotate(count=Count('id'))
+        )
+        recorded_days = 0
+        for row in status_counts:
+            if row['status'] == 'absent':
                 continue
-            
-            for employee in all_employees:
-                # Skip if date is before employee's joining date
-                if employee.joining_date and current_date < employee.joining_date:
-                    continue
-
-                attendance = attendances.filter(employee=employee, date=current_date).first()
-                
-                if attendance:
-                    if attendance.status == 'present':
-                        summary['present'] += 1
-                    elif attendance.status == 'late':
-                        summary['late'] += 1
-                    elif attendance.status == 'half_day':
-                        summary['half_day'] += 1
-                    elif attendance.status == 'leave':
-                        summary['leave'] += 1
-                    elif attendance.status == 'holiday':
-                        summary['holiday'] += 1
-                    elif attendance.status == 'absent':
-                        summary['absent'] += 1
-                else:
-                    summary['absent'] += 1
+            recorded_days += row['count']
+            if row['status'] in summary:
+                summary[row['status']] += row['count']
+        summary['absent'] = max(0, expected_days - recorded_days)
         
         return Response(summary)
     
@@ -253,8 +284,8 @@ class AttendanceViewSet(viewsets.ModelViewSet):
             attendance.save()
 
             now = timezone.now()
-            WorkSession.objects.filter(employee=request.user, end_time__isnull=True).update(end_time=now)
-            BreakSession.objects.filter(employee=request.user, end_time__isnull=True).update(end_time=now)
+            close_open_sessions(WorkSession, request.user, now)
+            close_open_sessions(BreakSession, request.user, now)
             
             return Response({
                 "message": "Checked out successfully",
@@ -295,8 +326,8 @@ class AttendanceViewSet(viewsets.ModelViewSet):
         attendance.save()
         
         # Close any active work and break sessions
-        WorkSession.objects.filter(employee=employee, end_time__isnull=True).update(end_time=now)
-        BreakSession.objects.filter(employee=employee, end_time__isnull=True).update(end_time=now)
+        close_open_sessions(WorkSession, employee, now)
+        close_open_sessions(BreakSession, employee, now)
         
         # Create a notification for the employee
         Notification.objects.create(
@@ -505,6 +536,7 @@ class AttendanceViewSet(viewsets.ModelViewSet):
                 'department': employee.department.name if employee.department else None,
                 'clockin_count': item['clockin_count'],
                 'profile_picture': employee.image.url if employee.image else None,
+                'profile_picture_thumb': thumbnail_url(employee.image),
               })
             except CustomUser.DoesNotExist:
                 continue
@@ -513,11 +545,22 @@ class AttendanceViewSet(viewsets.ModelViewSet):
             'total_records': len(final_data)
               })
 
-class HolidayViewSet(viewsets.ModelViewSet):
+class HolidayViewSet(ExportMixin, viewsets.ModelViewSet):
     queryset = Holiday.objects.all()
     serializer_class = HolidaySerializer
     permission_classes = [HasPermission]
     page_names = ['holidays', 'employee_holidays']
+    export_columns = [
+        Column('SL No', ROW_NUMBER),
+        Column('Date', 'date'),
+        Column('Day', 'day'),
+        Column('Occasion', 'occasion', width=3),
+        Column('Type', 'is_default', render=lambda is_default: 'Default' if is_default else 'Regular'),
+    ]
+    export_filename = 'holidays'
+    export_title = 'Holiday List'
+    export_ordering = ['date']
+    export_permission_classes = [IsAuthenticated]
 
     def perform_create(self, serializer):
         holiday = serializer.save()
@@ -536,87 +579,6 @@ class HolidayViewSet(viewsets.ModelViewSet):
         if notifications:
             Notification.objects.bulk_create(notifications)
 
-    @action(detail=False, methods=['get'], permission_classes=[IsAuthenticated])
-    def export_csv(self, request):
-        response = HttpResponse(content_type='text/csv')
-        response['Content-Disposition'] = 'attachment; filename="holidays.csv"'
-        
-        writer = csv.writer(response)
-        writer.writerow(['SL No', 'Date', 'Day', 'Occasion', 'Type'])
-        
-        holidays = self.queryset.order_by('date')
-        for idx, holiday in enumerate(holidays, 1):
-            writer.writerow([
-                idx,
-                holiday.date,
-                holiday.day,
-                holiday.occasion,
-                'Default' if holiday.is_default else 'Regular'
-            ])
-        return response
-
-    @action(detail=False, methods=['get'], permission_classes=[IsAuthenticated])
-    def export_excel(self, request):
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "Holidays"
-        
-        columns = ['SL No', 'Date', 'Day', 'Occasion', 'Type']
-        ws.append(columns)
-        
-        holidays = self.queryset.order_by('date')
-        for idx, holiday in enumerate(holidays, 1):
-            ws.append([
-                idx,
-                str(holiday.date),
-                holiday.day,
-                holiday.occasion,
-                'Default' if holiday.is_default else 'Regular'
-            ])
-            
-        response = HttpResponse(content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet')
-        response['Content-Disposition'] = 'attachment; filename="holidays.xlsx"'
-        wb.save(response)
-        return response
-
-    @action(detail=False, methods=['get'], permission_classes=[IsAuthenticated])
-    def export_pdf(self, request):
-        response = HttpResponse(content_type='application/pdf')
-        response['Content-Disposition'] = 'attachment; filename="holidays.pdf"'
-        
-        doc = SimpleDocTemplate(response, pagesize=letter)
-        elements = []
-        
-        styles = getSampleStyleSheet()
-        elements.append(Paragraph("Holiday List", styles['Title']))
-        
-        data = [['SL No', 'Date', 'Day', 'Occasion', 'Type']]
-        holidays = self.queryset.order_by('date')
-        
-        for idx, holiday in enumerate(holidays, 1):
-            data.append([
-                str(idx),
-                str(holiday.date),
-                holiday.day,
-                holiday.occasion,
-                'Default' if holiday.is_default else 'Regular'
-            ])
-            
-        table = Table(data)
-        table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black)
-        ]))
-        
-        elements.append(table)
-        doc.build(elements)
-        return response
-
 class LeaveTypeViewSet(viewsets.ModelViewSet):
     queryset = LeaveType.objects.all()
     serializer_class = LeaveTypeSerializer
@@ -643,11 +605,12 @@ class LeaveViewSet(viewsets.ModelViewSet):
         if is_privileged:
             # HR/Superadmin should only see leaves after Lead confirmation, 
             # OR if the employee doesn't report to anyone, OR is a team lead.
+            # has_reports is a denormalized flag, so no self-join/DISTINCT is needed.
             return queryset.filter(
                 Q(employee__reports_to__isnull=True) | 
                 Q(lead_status='confirmed') | 
-                Q(employee__subordinates__isnull=False)
-            ).distinct()
+                Q(employee__has_reports=True)
+            )
             
         if 'lead_scope' in self.request.query_params:
             # Lead sees ONLY direct reports (pending and processed)
@@ -682,6 +645,70 @@ class LeaveViewSet(viewsets.ModelViewSet):
         leave.save()
         return Response({'status': 'declined', 'message': 'Leave declined by lead.'})
 
+class StaffingViewSet(viewsets.GenericViewSet):
+    """
+    Staffing search over active employees.
+
+    ``skills`` (all required) and ``any_skills`` (at least one) take comma
+    separated skills; ``department`` a department id; ``available_from`` /
+    ``available_to`` (YYYY-MM-DD) drop users with approved leave in that
+    range; ``max_open_tasks`` caps the open task count. Least loaded first.
+    """
+    queryset = CustomUser.objects.none()
+    permission_classes = [HasPermission]
+    page_names = ['employees', 'projects', 'lead_projects']
+
+    def list(self, request):
+        params = request.query_params
+        try:
+            date_from = params.get('available_from')
+            date_from = datetime.strptime(date_from, '%Y-%m-%d').date() if date_from else None
+            date_to = params.get('available_to')
+            date_to = datetime.strptime(date_to, '%Y-%m-%d').date() if date_to else date_from
+        except ValueError:
+            return Response({'error': 'available_from and available_to must be YYYY-MM-DD'}, status=400)
+        if date_to and not date_from:
+            date_from = date_to
+        if date_from and date_to < date_from:
+            return Response({'error': 'available_to must not be before available_from'}, status=400)
+        try:
+            department = int(params['department']) if params.get('department') else None
+            max_open_tasks = int(params['max_open_tasks']) if params.get('max_open_tasks') else None
+        except ValueError:
+            return Response({'error': 'department and max_open_tasks must be integers'}, status=400)
+
+        queryset = search_staff(
+            all_skills=params.getlist('skills'),
+            any_skills=params.getlist('any_skills'),
+            department=department,
+            date_from=date_from,
+            date_to=date_to,
+            max_open_tasks=max_open_tasks,
+        ).values(
+            'id', 'name', 'email', 'employee_id', 'image',
+            'department_id', 'department__name', 'designation__name', 'open_tasks',
+        )
+        page = self.paginate_queryset(queryset)
+        skills = user_skills([row['id'] for row in page])
+        image_field = CustomUser._meta.get_field('image')
+        results = []
+        for row in page:
+            image = image_field.attr_class(None, image_field, row.pop('image') or None)
+            results.append({
+                'id': row['id'],
+                'name': row['name'] or row['email'].split('@')[0],
+                'email': row['email'],
+                'employee_id': row['employee_id'],
+                'profile_picture_thumb': thumbnail_url(image),
+                'department': row['department__name'],
+                'department_id': row['department_id'],
+                'designation': row['designation__name'],
+                'skills': skills[row['id']],
+                'open_tasks': row['open_tasks'],
+            })
+        return self.get_paginated_response(results)
+
+
 class OvertimeViewSet(viewsets.ModelViewSet):
     queryset = Overtime.objects.all().select_related('employee')
     serializer_class = OvertimeSerializer
@@ -993,9 +1020,9 @@ class TimerViewSet(viewsets.ViewSet):
             except Project.DoesNotExist:
                 pass
 
-        WorkSession.objects.filter(employee=request.user, end_time__isnull=True).update(end_time=timezone.now())
+        close_open_sessions(WorkSession, request.user, timezone.now())
         
-        BreakSession.objects.filter(employee=request.user, end_time__isnull=True).update(end_time=timezone.now())
+        close_open_sessions(BreakSession, request.user, timezone.now())
         
         session = WorkSession.objects.create(
             employee=request.user,
@@ -1026,9 +1053,9 @@ class TimerViewSet(viewsets.ViewSet):
         if break_type not in ['break', 'support']:
             return Response({"error": "Invalid break type"}, status=400)
         
-        BreakSession.objects.filter(employee=request.user, end_time__isnull=True).update(end_time=timezone.now())
+        close_open_sessions(BreakSession, request.user, timezone.now())
         
-        WorkSession.objects.filter(employee=request.user, end_time__isnull=True).update(end_time=timezone.now())
+        close_open_sessions(WorkSession, request.user, timezone.now())
         
         break_session = BreakSession.objects.create(employee=request.user, type=break_type)
         return Response(BreakSessionSerializer(break_session).data)
@@ -1047,45 +1074,61 @@ class TimerViewSet(viewsets.ViewSet):
     
     @action(detail=False, methods=['get'], permission_classes=[IsAuthenticated])
     def projects_tasks(self, request):
+        """
+        Open projects and tasks the user can log time against: one project
+        query and one prefetched task query, cached per user until a task or
+        project assignment changes.
+        """
         user = request.user
         role = getattr(user, 'role', None)
         is_admin = user.is_superuser or user.is_staff or (role and role.name == "Superadmin")
-        
-        if is_admin:
-            projects = Project.objects.all()
-        else:
-            query = Q(members=user) | Q(tasks__assignees=user)
+
+        key = versioned_key(
+            ASSIGNMENTS_NAMESPACE, 'projects_tasks',
+            'admin' if is_admin else f'{user.pk}:{user.department_id}',
+        )
+        data = cache.get(key)
+        if data is not None:
+            return Response(data)
+
+        tasks = Task.objects.exclude(status='done').only('id', 'name', 'due_date', 'project_id')
+        projects = Project.objects.exclude(status__name__in=["Completed", "Cancelled"])
+
+        if not is_admin:
+            tasks = tasks.filter(assignees=user)
+            visible = Q(is_member=True) | Q(has_assigned_tasks=True)
+            projects = projects.annotate(
+                is_member=Exists(Project.members.through.objects.filter(project=OuterRef('pk'), customuser=user)),
+                has_assigned_tasks=Exists(tasks.filter(project=OuterRef('pk'))),
+            )
             if user.department_id:
-                query |= Q(department_id=user.department_id)
-            projects = Project.objects.filter(query).distinct()
+                projects = projects.annotate(
+                    in_department=Exists(Project.involved_departments.through.objects.filter(
+                        project=OuterRef('pk'), department_id=user.department_id,
+                    )),
+                )
+                visible |= Q(in_department=True)
+            projects = projects.filter(visible)
 
-        # Filter out Completed and Cancelled projects
-        projects = projects.exclude(status__name__in=["Completed", "Cancelled"])
+        projects = projects.only('id', 'name').prefetch_related(
+            Prefetch('tasks', queryset=tasks, to_attr='open_tasks')
+        )
 
         data = []
         for p in projects:
-            tasks_qs = p.tasks.exclude(status='done')
-            
-            if not is_admin:
-                tasks_qs = tasks_qs.filter(assignees=user)
-
-            task_list = []
-            for t in tasks_qs.distinct():
-                due_info = f" (Due: {t.due_date.strftime('%d-%m-%Y')})" if t.due_date else ""
-                task_list.append({
-                    "id": t.id,
-                    "name": f"{t.name}{due_info}"
-                })
+            data.append({
+                "id": p.id,
+                "name": p.name,
+                "tasks": [
+                    {
+                        "id": t.id,
+                        "name": f"{t.name} (Due: {t.due_date.strftime('%d-%m-%Y')})" if t.due_date else f"{t.name}",
+                    }
+                    for t in p.open_tasks
+                ],
+            })
 
-            is_member = is_admin or p.members.filter(id=user.id).exists()
-            
-            if is_admin or is_member or len(task_list) > 0:
-                data.append({
-                    "id": p.id,
-                    "name": p.name,
-                    "tasks": task_list
-                })
-        
+        cache.set(key, data, timeout=PROJECTS_TASKS_TTL)
         return Response(data)
 
     @action(detail=False, methods=['get'], permission_classes=[IsAuthenticated])
@@ -1216,10 +1259,27 @@ class TimerViewSet(viewsets.ViewSet):
     
    
 
-class WorkSessionViewSet(viewsets.ModelViewSet):
+def session_hours(duration_seconds):
+    return round(duration_seconds / 3600, 2) if duration_seconds is not None else None
+
+
+class WorkSessionViewSet(ExportMixin, viewsets.ModelViewSet):
     queryset = WorkSession.objects.all().select_related('employee', 'project', 'task').order_by('-start_time')
     serializer_class = WorkSessionSerializer
     page_names = ['timelogs', 'employee_timelogs', 'lead_timelogs']
+    export_columns = [
+        Column('Employee', 'employee__name', width=2),
+        Column('Project', 'project__name', width=2),
+        Column('Task', 'task__name', width=2),
+        Column('Memo', 'memo', width=3),
+        Column('Start', 'start_time', width=1.5),
+        Column('End', 'end_time', width=1.5),
+        Column('Hours', 'duration_seconds', render=session_hours),
+        Column('Billable', 'is_billable', render=yes_no),
+        Column('Status', 'status', render=label(WorkSession._meta.get_field('status').choices)),
+    ]
+    export_filename = 'timesheet'
+    export_pagesize = landscape(letter)
 
     def get_queryset(self):
         user = self.request.user
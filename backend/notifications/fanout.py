@@ -0,0 +1,167 @@
+"""
+Batched task and contract notifications.
+
+The task signal handlers, the bulk task endpoint and the contract reminder
+job all go through here, so preferences, duplicate checks and inserts cost a
+fixed number of queries no matter how many tasks, contracts or recipients
+are involved.
+"""
+from django.utils import timezone
+
+from operation.models import Task
+from .models import Notification, NotificationPreference, Reminder
+
+
+def load_preferences(user_ids):
+    """
+    Returns {user_id: NotificationPreference}, creating default rows for users
+    that have none yet.
+    """
+    user_ids = set(user_ids)
+    preferences = {
+        pref.user_id: pref
+        for pref in NotificationPreference.objects.filter(user_id__in=user_ids)
+    }
+    missing = [NotificationPreference(user_id=user_id) for user_id in user_ids - set(preferences)]
+    if missing:
+        NotificationPreference.objects.bulk_create(missing, ignore_conflicts=True)
+        preferences.update({pref.user_id: pref for pref in missing})
+    return preferences
+
+
+def _task_links(task):
+    return {
+        'link_url': f'/operations/tasks/edit/{task.id}',
+        'link_text': 'View Task',
+        'related_task_id': task.id,
+        'related_project_id': task.project_id,
+    }
+
+
+def notify_task_assigned(assignments):
+    """
+    Notify users of new task assignments and schedule their due-date
+    reminders. ``assignments`` is an iterable of (task, user_id) pairs; tasks
+    should have ``project`` selected.
+    """
+    assignments = list(assignments)
+    if not assignments:
+        return
+    preferences = load_preferences(user_id for _, user_id in assignments)
+    now = timezone.now()
+    notifications, reminders = [], []
+
+    for task, user_id in assignments:
+        pref = preferences[user_id]
+        if pref.inapp_task_assigned:
+            notifications.append(Notification(
+                user_id=user_id,
+                notification_type='task_assigned',
+                priority='medium',
+                title=f'New Task Assigned: {task.name}',
+                message=f'You have been assigned to task "{task.name}" in project {task.project.name if task.project else "N/A"}',
+                **_task_links(task),
+            ))
+
+        if task.due_date and pref.task_reminder_before_hours > 0:
+            reminder_time = timezone.make_aware(
+                timezone.datetime.combine(task.due_date, timezone.datetime.min.time())
+            ) - timezone.timedelta(hours=pref.task_reminder_before_hours)
+            if reminder_time > now:
+                reminders.append(Reminder(
+                    user_id=user_id,
+                    reminder_type='task_due',
+                    frequency='once',
+                    title=f'Task Due: {task.name}',
+                    description=f'Task "{task.name}" is due on {task.due_date}',
+                    scheduled_time=reminder_time,
+                    related_task_id=task.id,
+                    related_project_id=task.project_id,
+                ))
+
+    Notification.objects.bulk_create(notifications)
+    Reminder.objects.bulk_create(reminders)
+
+
+def notify_overdue(tasks):
+    """
+    Send at most one overdue notification per assignee and task per day for
+    the overdue, unfinished tasks among ``tasks``.
+    """
+    today = timezone.now().date()
+    overdue = {
+        task.id: task for task in tasks
+        if task.due_date and task.due_date < today and task.status != 'done'
+    }
+    if not overdue:
+        return
+
+    pairs = list(
+        Task.assignees.through.objects
+        .filter(task_id__in=overdue)
+        .values_list('task_id', 'customuser_id')
+    )
+    if not pairs:
+        return
+
+    preferences = {
+        pref.user_id: pref
+        for pref in NotificationPreference.objects.filter(user_id__in={user_id for _, user_id in pairs})
+    }
+    today_start = timezone.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    already_sent = set(
+        Notification.objects.filter(
+            notification_type='task_overdue',
+            related_task_id__in=overdue,
+            created_at__gte=today_start,
+        ).values_list('related_task_id', 'user_id')
+    )
+
+    notifications = []
+    for task_id, user_id in pairs:
+        pref = preferences.get(user_id)
+        if pref is None or not pref.inapp_task_due or (task_id, user_id) in already_sent:
+            continue
+        task = overdue[task_id]
+        notifications.append(Notification(
+            user_id=user_id,
+            notification_type='task_overdue',
+            priority='urgent',
+            title=f'Task Overdue: {task.name}',
+            message=f'Task "{task.name}" was due on {task.due_date}',
+            **_task_links(task),
+        ))
+    Notification.objects.bulk_create(notifications)
+
+
+CONTRACT_WINDOW_PRIORITY = {7: 'urgent', 15: 'high', 30: 'medium'}
+
+
+def notify_contract_expiring(contracts, user_ids, today):
+    """
+    One notification per recipient for each contract nearing its end date.
+    ``contracts`` carry the ``window`` they were selected for and should
+    have ``client`` selected; users who turned in-app notifications off are
+    skipped.
+    """
+    muted = set(
+        NotificationPreference.objects.filter(user_id__in=user_ids, inapp_enabled=False)
+        .values_list('user_id', flat=True)
+    )
+    notifications = []
+    for contract in contracts:
+        days_left = (contract.end_date - today).days
+        when = 'today' if days_left == 0 else f'in {days_left} day{"s" if days_left != 1 else ""}'
+        for user_id in user_ids:
+            if user_id in muted:
+                continue
+            notifications.append(Notification(
+                user_id=user_id,
+                notification_type='contract_expiring',
+                priority=CONTRACT_WINDOW_PRIORITY.get(contract.window, 'medium'),
+                title=f'Contract Expiring: {contract.subject}',
+                message=f'Contract "{contract.subject}" with {contract.client.name} ends {when} ({contract.end_date}).',
+                link_url=f'/operations/contracts/edit/{contract.id}',
+                link_text='View Contract',
+            ))
+    Notification.objects.bulk_create(notifications, batch_size=500)
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.8 on 2026-10-19 19:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notifications', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='notification',
+            name='notification_type',
+            field=models.CharField(choices=[('task_assigned', 'Task Assigned'), ('task_due', 'Task Due Soon'), ('task_overdue', 'Task Overdue'), ('project_update', 'Project Update'), ('scrum_reminder', 'Scrum Reminder'), ('leave_approved', 'Leave Approved'), ('leave_rejected', 'Leave Rejected'), ('meeting_reminder', 'Meeting Reminder'), ('contract_expiring', 'Contract Expiring'), ('system', 'System Notification')], max_length=50),
+        ),
+    ]
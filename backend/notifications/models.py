@@ -57,6 +57,7 @@ class Notification(models.Model):
         ('leave_approved', 'Leave Approved'),
         ('leave_rejected', 'Leave Rejected'),
         ('meeting_reminder', 'Meeting Reminder'),
+        ('contract_expiring', 'Contract Expiring'),
         ('system', 'System Notification'),
     ]
     
@@ -0,0 +1,104 @@
+"""
+ProjectAccess maintenance and row-level visibility filters.
+
+A user sees a project when they are a member or one of its involved
+departments is theirs. Those pairs are kept in ProjectAccess so viewsets
+filter with one indexed ``project_id IN (...)`` subquery instead of OR-ing
+joins across the membership tables and de-duplicating with DISTINCT. Task
+assignment stays per task (it does not open the rest of the project) and is
+filtered through the assignees table the same way.
+"""
+from django.db import transaction
+
+from authapp.models import CustomUser
+from .models import Project, ProjectAccess, ProjectAccessReason, Task
+
+
+def expected_access(project_ids=None, user_ids=None):
+    """(user_id, project_id, reason) triples implied by the source tables."""
+    members = Project.members.through.objects.all()
+    departments = Project.involved_departments.through.objects.filter(
+        department__customuser__isnull=False
+    )
+    if project_ids is not None:
+        members = members.filter(project_id__in=project_ids)
+        departments = departments.filter(project_id__in=project_ids)
+    if user_ids is not None:
+        members = members.filter(customuser_id__in=user_ids)
+        departments = departments.filter(department__customuser__in=user_ids)
+
+    expected = {
+        (user_id, project_id, ProjectAccessReason.MEMBER)
+        for user_id, project_id in members.values_list('customuser_id', 'project_id')
+    }
+    expected.update(
+        (user_id, project_id, ProjectAccessReason.DEPARTMENT)
+        for user_id, project_id in departments.values_list('department__customuser', 'project_id')
+    )
+    return expected
+
+
+def diff_access(project_ids=None, user_ids=None):
+    """
+    Returns ``(missing, stale)``: triples that should exist but don't, and
+    {pk: triple} rows that exist but shouldn't, within the given scope.
+    """
+    if project_ids is not None:
+        project_ids = list(project_ids)
+    if user_ids is not None:
+        user_ids = list(user_ids)
+
+    stored = ProjectAccess.objects.all()
+    if project_ids is not None:
+        stored = stored.filter(project_id__in=project_ids)
+    if user_ids is not None:
+        stored = stored.filter(user_id__in=user_ids)
+    current = {
+        (user_id, project_id, reason): pk
+        for pk, user_id, project_id, reason in stored.values_list('pk', 'user_id', 'project_id', 'reason')
+    }
+    expected = expected_access(project_ids, user_ids)
+    missing = expected - set(current)
+    stale = {pk: triple for triple, pk in current.items() if triple not in expected}
+    return missing, stale
+
+
+def sync_project_access(project_ids=None, user_ids=None):
+    """Bring ProjectAccess in line with the source tables for the given scope."""
+    with transaction.atomic():
+        missing, stale = diff_access(project_ids, user_ids)
+        if stale:
+            ProjectAccess.objects.filter(pk__in=list(stale)).delete()
+        if missing:
+            ProjectAccess.objects.bulk_create(
+                [
+                    ProjectAccess(user_id=user_id, project_id=project_id, reason=reason)
+                    for user_id, project_id, reason in missing
+                ],
+                ignore_conflicts=True,
+            )
+    return missing, stale
+
+
+def accessible_project_ids(user, reasons=None):
+    queryset = ProjectAccess.objects.filter(user=user)
+    if reasons is not None:
+        queryset = queryset.filter(reason__in=reasons)
+    return queryset.values('project_id')
+
+
+def report_project_ids(lead):
+    """Projects a lead's direct reports are members of."""
+    return ProjectAccess.objects.filter(
+        user__reports_to=lead, reason=ProjectAccessReason.MEMBER
+    ).values('project_id')
+
+
+def assigned_task_ids(user=None, lead=None):
+    """Tasks assigned to ``user``, or to the direct reports of ``lead``."""
+    queryset = Task.assignees.through.objects.all()
+    if user is not None:
+        queryset = queryset.filter(customuser=user)
+    if lead is not None:
+        queryset = queryset.filter(customuser__in=CustomUser.objects.filter(reports_to=lead).values('pk'))
+    return queryset.values('task_id')
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Project, ProjectCategory, ProjectStatus, ProjectStage, Client, Currency, Task,Scrum
+from .models import Project, ProjectCategory, ProjectStatus, ProjectStage, Client, Currency, Task,Scrum, ProjectAccess
 
 admin.site.register(ProjectCategory)
 admin.site.register(Project)
@@ -9,3 +9,11 @@ admin.site.register(Client)
 admin.site.register(Currency)
 admin.site.register(Task)
 admin.site.register(Scrum)
+
+
+@admin.register(ProjectAccess)
+class ProjectAccessAdmin(admin.ModelAdmin):
+    list_display = ('user', 'project', 'reason')
+    list_filter = ('reason',)
+    search_fields = ('user__email', 'user__name', 'project__name')
+    list_select_related = ('user', 'project')
@@ -0,0 +1,119 @@
+"""
+Kanban board queries for tasks.
+
+Each status column is ordered by due date (undated last), priority (urgent
+first) and id. The first page of every column comes from one windowed query;
+later pages use a keyset cursor over the same three keys, so scrolling deep
+into a column never OFFSETs.
+"""
+import base64
+import datetime
+import json
+
+from django.db.models import Case, Count, F, IntegerField, Q, Value, When, Window
+from django.db.models.functions import Coalesce, RowNumber
+from rest_framework.exceptions import ValidationError
+
+from .models import TaskPriority, TaskStatus
+
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 100
+
+# Stands in for a missing due date so undated tasks sort after dated ones.
+NO_DUE_DATE = datetime.date.max
+
+PRIORITY_RANK = {
+    TaskPriority.URGENT: 0,
+    TaskPriority.HIGH: 1,
+    TaskPriority.MEDIUM: 2,
+    TaskPriority.LOW: 3,
+}
+NO_PRIORITY_RANK = len(PRIORITY_RANK)
+
+ORDERING = ('board_due', 'board_priority', 'id')
+
+
+def with_board_keys(queryset):
+    return queryset.annotate(
+        board_due=Coalesce('due_date', Value(NO_DUE_DATE)),
+        board_priority=Case(
+            *[When(priority=value, then=Value(rank)) for value, rank in PRIORITY_RANK.items()],
+            default=Value(NO_PRIORITY_RANK),
+            output_field=IntegerField(),
+        ),
+    )
+
+
+def encode_cursor(task):
+    payload = [task.board_due.isoformat(), task.board_priority, task.id]
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        due, priority, pk = json.loads(raw)
+        return datetime.date.fromisoformat(due), int(priority), int(pk)
+    except (ValueError, TypeError):
+        raise ValidationError({'cursor': 'Invalid cursor.'})
+
+
+def after_cursor(cursor):
+    due, priority, pk = decode_cursor(cursor)
+    return (
+        Q(board_due__gt=due)
+        | Q(board_due=due, board_priority__gt=priority)
+        | Q(board_due=due, board_priority=priority, id__gt=pk)
+    )
+
+
+def parse_limit(value):
+    try:
+        limit = int(value) if value else DEFAULT_LIMIT
+    except ValueError:
+        raise ValidationError({'limit': 'Must be an integer.'})
+    return max(1, min(limit, MAX_LIMIT))
+
+
+def status_counts(queryset):
+    return dict(
+        queryset.order_by().values_list('status').annotate(total=Count('id'))
+    )
+
+
+def first_pages(queryset, statuses, limit):
+    """
+    Returns {status: [task, ...]} holding up to ``limit + 1`` tasks per
+    column (the extra row tells whether a next page exists).
+    """
+    ranked = with_board_keys(queryset.filter(status__in=statuses)).annotate(
+        board_row=Window(
+            RowNumber(),
+            partition_by=[F('status')],
+            order_by=[F(name).asc() for name in ORDERING],
+        )
+    ).filter(board_row__lte=limit + 1).order_by('status', *ORDERING)
+
+    columns = {value: [] for value in statuses}
+    for task in ranked:
+        columns[task.status].append(task)
+    return columns
+
+
+def column_page(queryset, status, limit, cursor=None):
+    page = with_board_keys(queryset.filter(status=status))
+    if cursor:
+        page = page.filter(after_cursor(cursor))
+    return list(page.order_by(*ORDERING)[:limit + 1])
+
+
+def build_column(status, count, tasks, limit, serialize):
+    has_more = len(tasks) > limit
+    tasks = tasks[:limit]
+    return {
+        'status': status,
+        'label': TaskStatus(status).label,
+        'count': count,
+        'results': serialize(tasks),
+        'next_cursor': encode_cursor(tasks[-1]) if has_more else None,
+    }
@@ -0,0 +1,59 @@
+"""
+Versioned caching helpers.
+
+Cached payloads are stored under keys that embed a namespace version. Writes
+bump the version (after the surrounding transaction commits), which
+invalidates every cached payload in that namespace without having to know
+its keys. A missing version counter is re-seeded from the clock, so a key
+evicted from the cache can never bring back an older version number.
+"""
+import time
+
+from django.core.cache import cache
+from django.db import transaction
+
+# Bumped on any Project write or membership change
+PROJECTS_NAMESPACE = 'projects'
+# Bumped on any Project or Task write, membership or assignment change
+ASSIGNMENTS_NAMESPACE = 'assignments'
+# Bumped when cost ledger figures of a closed (past) month change
+CLOSED_MONTHS_NAMESPACE = 'closed-months'
+
+
+def client_namespace(client_id):
+    """Bumped on any write to the client's projects, their tasks or the client's contracts."""
+    return f'client:{client_id}'
+
+
+def bump_client_versions(client_ids):
+    for client_id in {client_id for client_id in client_ids if client_id}:
+        bump_version(client_namespace(client_id))
+
+
+def _version_key(namespace):
+    return f'version:{namespace}'
+
+
+def get_version(namespace):
+    key = _version_key(namespace)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, int(time.time() * 1000), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def bump_version(namespace):
+    """Invalidate ``namespace`` once the current transaction commits."""
+
+    def bump():
+        try:
+            cache.incr(_version_key(namespace))
+        except ValueError:
+            cache.set(_version_key(namespace), int(time.time() * 1000), timeout=None)
+
+    transaction.on_commit(bump)
+
+
+def versioned_key(namespace, *parts):
+    return ':'.join([namespace, str(get_version(namespace)), *[str(part) for part in parts]])
@@ -0,0 +1,125 @@
+"""
+Daily scrum compliance.
+
+For every working day in a range, finds the employees (and their open task
+assignments) with no morning or evening entry. Each day/half-day is one
+correlated NOT EXISTS against Scrum, answered from the (employee, date)
+index, so a whole range is a single query per report section. Days an
+employee is on approved leave (materialized as ``Attendance`` rows with
+status ``leave``) are not expected of them.
+"""
+import datetime
+
+from django.db.models import BooleanField, Exists, ExpressionWrapper, OuterRef, Q
+
+from .models import Scrum, Task, TaskStatus
+
+MAX_DAYS = 31
+
+SLOTS = {
+    'morning': Q(morning_submitted=True) | (Q(morning_memo__isnull=False) & ~Q(morning_memo='')),
+    'evening': Q(evening_submitted=True) | (Q(evening_memo__isnull=False) & ~Q(evening_memo='')),
+}
+
+
+def working_days(start, end):
+    """Dates from ``start`` to ``end`` inclusive, minus configured holidays."""
+    from hr.models import Holiday
+
+    holidays = set(
+        Holiday.objects.filter(date__range=(start, end)).values_list('date', flat=True)
+    )
+    days = []
+    day = start
+    while day <= end:
+        if day not in holidays:
+            days.append(day)
+        day += datetime.timedelta(days=1)
+    return days
+
+
+def _annotate_gaps(queryset, days, entries_for, employee):
+    """
+    Adds a ``<slot>_<n>`` flag per day and slot that is True when the entry
+    is missing and ``employee`` was not on leave, and keeps only rows
+    missing at least one.
+    """
+    from hr.models import Attendance
+
+    flags = {}
+    for index, day in enumerate(days):
+        on_leave = Exists(Attendance.objects.filter(employee=OuterRef(employee), date=day, status='leave'))
+        for slot, condition in SLOTS.items():
+            flags[f'{slot}_{index}'] = ExpressionWrapper(
+                ~Exists(entries_for(day).filter(condition)) & ~on_leave,
+                output_field=BooleanField(),
+            )
+    any_missing = Q()
+    for name in flags:
+        any_missing |= Q(**{name: True})
+    return queryset.annotate(**flags).filter(any_missing), list(flags)
+
+
+def _missing(row, days):
+    return {
+        slot: [day for index, day in enumerate(days) if row[f'{slot}_{index}']]
+        for slot in SLOTS
+    }
+
+
+def employee_gaps(employees, days):
+    """[{id, name, missing_morning, missing_evening}] for employees with gaps."""
+    if not days:
+        return []
+    queryset, flags = _annotate_gaps(
+        employees.order_by('name', 'id'),
+        days,
+        lambda day: Scrum.objects.filter(employee=OuterRef('pk'), date=day),
+        'pk',
+    )
+    rows = []
+    for row in queryset.values('id', 'name', *flags):
+        missing = _missing(row, days)
+        rows.append({
+            'id': row['id'],
+            'name': row['name'],
+            'missing_morning': missing['morning'],
+            'missing_evening': missing['evening'],
+        })
+    return rows
+
+
+def task_gaps(employees, days):
+    """
+    Open task assignments of ``employees`` with no scrum entry for that task
+    on a given day.
+    """
+    if not days:
+        return []
+    assignments = Task.assignees.through.objects.filter(
+        customuser__in=employees,
+        task__is_active=True,
+    ).exclude(task__status=TaskStatus.DONE)
+    queryset, flags = _annotate_gaps(
+        assignments.order_by('customuser__name', 'task__name', 'id'),
+        days,
+        lambda day: Scrum.objects.filter(
+            employee=OuterRef('customuser_id'), task=OuterRef('task_id'), date=day
+        ),
+        'customuser_id',
+    )
+    rows = []
+    for row in queryset.values(
+        'task_id', 'task__name', 'task__project__name', 'customuser_id', 'customuser__name', *flags
+    ):
+        missing = _missing(row, days)
+        rows.append({
+            'task': row['task_id'],
+            'task_name': row['task__name'],
+            'project_name': row['task__project__name'],
+            'employee': row['customuser_id'],
+            'employee_name': row['customuser__name'],
+            'missing_morning': missing['morning'],
+            'missing_evening': missing['evening'],
+        })
+    return rows
@@ -0,0 +1,71 @@
+"""
+Contract expiry reminders.
+
+A contract is due a reminder when its end date falls in one of the WINDOWS
+(days ahead) and no reminder for that window, or a tighter one, has been
+logged for the same end date. Due contracts come from a single query over
+the (no_end_date, end_date) index with a NOT EXISTS against the log, so a
+daily run only touches contracts that crossed into a new window since the
+previous run. A contract first seen inside several windows gets one reminder
+for the tightest.
+"""
+import datetime
+
+from django.db import transaction
+from django.db.models import Case, Exists, IntegerField, OuterRef, Value, When
+
+from .models import Contract, ContractReminderLog
+
+WINDOWS = (30, 15, 7)
+
+
+def due_reminders(today):
+    """Contracts needing a reminder on ``today``, annotated with their ``window``."""
+    windows = sorted(WINDOWS)
+    return (
+        Contract.objects.filter(
+            no_end_date=False,
+            end_date__range=(today, today + datetime.timedelta(days=windows[-1])),
+        )
+        .annotate(window=Case(
+            *[
+                When(end_date__lte=today + datetime.timedelta(days=days), then=Value(days))
+                for days in windows
+            ],
+            output_field=IntegerField(),
+        ))
+        .filter(~Exists(ContractReminderLog.objects.filter(
+            contract=OuterRef('pk'),
+            end_date=OuterRef('end_date'),
+            window__lte=OuterRef('window'),
+        )))
+        .select_related('client')
+        .order_by('end_date', 'pk')
+    )
+
+
+def send_reminders(today=None, dry_run=False):
+    """
+    Notify the users responsible for contracts (edit access to the
+    ``contracts`` page) about every due reminder and log them. Returns the
+    contracts that were due.
+    """
+    from authapp.models import users_with_permission
+    from notifications.fanout import notify_contract_expiring
+
+    today = today or datetime.date.today()
+    contracts = list(due_reminders(today))
+    if not contracts or dry_run:
+        return contracts
+
+    user_ids = list(users_with_permission('contracts', 'edit').values_list('pk', flat=True))
+    with transaction.atomic():
+        ContractReminderLog.objects.bulk_create(
+            [
+                ContractReminderLog(contract=contract, window=contract.window, end_date=contract.end_date)
+                for contract in contracts
+            ],
+            ignore_conflicts=True,
+        )
+        notify_contract_expiring(contracts, user_ids, today)
+    return contracts
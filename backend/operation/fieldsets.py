@@ -0,0 +1,100 @@
+"""
+Sparse fieldsets (``?fields=``) and opt-in expansion (``?expand=``).
+
+A serializer using SparseFieldsetMixin may declare in its Meta:
+
+- ``list_fields``: the default shape of list responses.
+- ``expandable_fields``: {name: factory} for fields that have a compact
+  default and a heavier expanded form (e.g. members as mini users vs. full
+  profiles).
+- ``detail_expand``: expandable fields rendered expanded on single objects
+  and write responses when ``?expand=`` is absent (default: all of them).
+
+List responses return ``list_fields`` plus anything named in ``?expand=``.
+Single objects keep every field, expanded per ``detail_expand`` unless
+``?expand=`` is given. ``?fields=`` narrows either shape; fields named in
+``?expand=`` are rendered even when ``?fields=`` leaves them out. Writes
+always respond with every field.
+"""
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.serializers import ListSerializer
+
+
+def _param_set(request, name):
+    raw = request.query_params.get(name)
+    if raw is None:
+        return None
+    return {part.strip() for part in raw.split(',') if part.strip()}
+
+
+def resolve_fieldset(serializer_class, request, many):
+    """
+    Returns ``(readable, expanded)``: the readable field names to render
+    (None means all of them) and the names to render in expanded form.
+    """
+    meta = serializer_class.Meta
+    expandable = set(getattr(meta, 'expandable_fields', {}))
+    detail_expand = set(getattr(meta, 'detail_expand', expandable))
+    if request is None or request.method not in SAFE_METHODS:
+        return None, detail_expand
+
+    explicit_expand = _param_set(request, 'expand')
+    requested_expand = explicit_expand
+    if requested_expand is None:
+        requested_expand = set() if many else detail_expand
+    expanded = expandable & requested_expand
+
+    requested_fields = _param_set(request, 'fields')
+    if requested_fields is not None:
+        readable = requested_fields | {'id'} | (explicit_expand or set())
+    elif many and hasattr(meta, 'list_fields'):
+        readable = set(meta.list_fields) | requested_expand
+    else:
+        readable = None
+    return readable, expanded
+
+
+class SparseFieldsetMixin:
+    """Serializer mixin; only the top-level (or list child) serializer is shaped."""
+
+    def get_fields(self):
+        fields = super().get_fields()
+        parent = self.parent
+        many = isinstance(parent, ListSerializer)
+        if many:
+            parent = parent.parent
+        request = self.context.get('request')
+        if parent is not None or request is None:
+            return fields
+
+        readable, expanded = resolve_fieldset(type(self), request, many)
+        factories = getattr(self.Meta, 'expandable_fields', {})
+        for name in expanded:
+            if name in fields:
+                fields[name] = factories[name]()
+        if readable is not None:
+            for name in [n for n, field in fields.items() if not field.write_only and n not in readable]:
+                del fields[name]
+        return fields
+
+
+class SparseFieldsetViewMixin:
+    """
+    ViewSet mixin exposing the resolved fieldset so get_queryset() only joins
+    and prefetches the relations that will actually be rendered.
+    """
+
+    def get_fieldset(self):
+        if not hasattr(self, '_fieldset'):
+            self._fieldset = resolve_fieldset(
+                self.get_serializer_class(), self.request, many=not getattr(self, 'detail', False)
+            )
+        return self._fieldset
+
+    def fieldset_includes(self, *names):
+        readable, _ = self.get_fieldset()
+        return readable is None or any(name in readable for name in names)
+
+    def fieldset_expands(self, name):
+        _, expanded = self.get_fieldset()
+        return name in expanded
@@ -0,0 +1,110 @@
+"""
+Project hours and cost read from the hr cost ledger.
+
+Monthly-tenor projects report the current (local) month's ProjectMonthlyCost
+row; all other projects report their ProjectCostTotal row, so a page of
+projects reads one ledger row per project instead of re-aggregating every
+work session. Figures as of an earlier month read that month's row for
+monthly-tenor projects and the sum of the monthly rows up to it for the
+rest. Costs are priced at the hourly rate in effect when each session was
+recorded (see hr.ledger).
+"""
+from decimal import Decimal
+
+from django.db.models import BigIntegerField, Case, DecimalField, OuterRef, Q, Subquery, Sum, Value, When
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from authapp.images import thumbnail_url
+from authapp.models import CustomUser
+
+COST_FIELD = DecimalField(max_digits=18, decimal_places=4)
+
+
+def current_month():
+    return timezone.localdate().replace(day=1)
+
+
+def _ledger_value(field, output_field, default, month=None):
+    from hr.models import ProjectCostTotal, ProjectMonthlyCost
+
+    if month is None or month >= current_month():
+        total = ProjectCostTotal.objects.filter(project=OuterRef('pk')).values(field)[:1]
+        month = current_month()
+    else:
+        total = (
+            ProjectMonthlyCost.objects.filter(project=OuterRef('pk'), month__lte=month)
+            .order_by()
+            .values('project')
+            .annotate(total=Sum(field))
+            .values('total')
+        )
+    monthly = ProjectMonthlyCost.objects.filter(project=OuterRef('pk'), month=month).values(field)[:1]
+    return Coalesce(
+        Case(
+            When(tenor='monthly', then=Subquery(monthly, output_field=output_field)),
+            default=Subquery(total, output_field=output_field),
+            output_field=output_field,
+        ),
+        Value(default),
+        output_field=output_field,
+    )
+
+
+def annotate_financials(queryset, month=None):
+    """
+    Annotate projects with ``total_seconds_spent`` and ``total_cost``, as of
+    the first-of-month date ``month`` (default: the current month).
+    """
+    return queryset.annotate(
+        total_seconds_spent=_ledger_value('duration_seconds', BigIntegerField(), 0, month),
+        total_cost=_ledger_value('cost', COST_FIELD, Decimal('0'), month),
+    )
+
+
+def project_financials(project):
+    """(seconds, cost) for a project, from annotations when present."""
+    if not hasattr(project, 'total_seconds_spent'):
+        row = (
+            annotate_financials(type(project).objects.filter(pk=project.pk))
+            .values('total_seconds_spent', 'total_cost')
+            .first()
+        ) or {'total_seconds_spent': 0, 'total_cost': Decimal('0')}
+        project.total_seconds_spent = row['total_seconds_spent']
+        project.total_cost = row['total_cost']
+    return project.total_seconds_spent or 0, project.total_cost or Decimal('0')
+
+
+def member_contributions(project_ids):
+    """
+    Per-member hours and cost for many projects in one grouped ledger query.
+    Returns {project_id: [contribution, ...]} ordered by hours, descending.
+    """
+    from hr.models import ProjectCostEntry
+
+    project_ids = list(project_ids)
+    if not project_ids:
+        return {}
+    rows = (
+        ProjectCostEntry.objects
+        .filter(project_id__in=project_ids)
+        .filter(~Q(project__tenor='monthly') | Q(month=current_month()))
+        .order_by()
+        .values('project_id', 'employee_id', 'employee__name', 'employee__email', 'employee__image')
+        .annotate(seconds=Sum('duration_seconds'), cost=Sum('cost'))
+    )
+    image_field = CustomUser._meta.get_field('image')
+    result = {pid: [] for pid in project_ids}
+    for row in rows:
+        image = image_field.attr_class(None, image_field, row['employee__image'] or None)
+        result[row['project_id']].append({
+            'id': row['employee_id'],
+            'name': row['employee__name'] or row['employee__email'].split('@')[0],
+            'profile_picture': image.url if image else None,
+            'profile_picture_thumb': thumbnail_url(image),
+            'hours': round((row['seconds'] or 0) / 3600, 2),
+            'cost': round(float(row['cost'] or 0), 2),
+        })
+    for contributions in result.values():
+        contributions.sort(key=lambda c: c['hours'], reverse=True)
+    return result
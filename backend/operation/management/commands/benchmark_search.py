@@ -0,0 +1,60 @@
+import statistics
+import time
+
+from django.db import connection, reset_queries
+from django.test import RequestFactory
+from django.core.management.base import BaseCommand
+from rest_framework import filters
+from rest_framework.request import Request
+
+from operation.models import Project, Scrum, Task
+from operation.search import FullTextSearchFilter, uses_fulltext
+from operation.views import ProjectViewSet, ScrumViewSet, TaskViewSet
+
+TARGETS = {
+    'project': (Project, ProjectViewSet),
+    'task': (Task, TaskViewSet),
+    'scrum': (Scrum, ScrumViewSet),
+}
+
+
+class Command(BaseCommand):
+    help = "Compare SearchFilter (icontains over search_fields) with the search index"
+
+    def add_arguments(self, parser):
+        parser.add_argument('terms', nargs='+', help="Search strings to time")
+        parser.add_argument('--model', choices=list(TARGETS), action='append', dest='models')
+        parser.add_argument('--repeat', type=int, default=5)
+        parser.add_argument('--page-size', type=int, default=20)
+
+    def _time(self, backend, model, view, term, repeat, page_size):
+        request = Request(RequestFactory().get('/', {'search': term}))
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            queryset = backend.filter_queryset(request, model.objects.all(), view)
+            total = queryset.count()
+            list(queryset[:page_size])
+            timings.append((time.perf_counter() - started) * 1000)
+        return statistics.median(timings), total
+
+    def handle(self, *args, **options):
+        engine = 'MySQL FULLTEXT' if uses_fulltext() else 'token table'
+        self.stdout.write(f"Index engine: {engine} ({connection.vendor})")
+        for name, (model, viewset) in TARGETS.items():
+            if options['models'] and name not in options['models']:
+                continue
+            view = viewset()
+            for term in options['terms']:
+                reset_queries()
+                baseline_ms, baseline_count = self._time(
+                    filters.SearchFilter(), model, view, term, options['repeat'], options['page_size']
+                )
+                indexed_ms, indexed_count = self._time(
+                    FullTextSearchFilter(), model, view, term, options['repeat'], options['page_size']
+                )
+                speedup = baseline_ms / indexed_ms if indexed_ms else float('inf')
+                self.stdout.write(
+                    f"{name:<8} {term!r:<20} SearchFilter {baseline_ms:8.1f} ms ({baseline_count} rows)   "
+                    f"index {indexed_ms:8.1f} ms ({indexed_count} rows)   x{speedup:.1f}"
+                )
@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand
+
+from operation.access import diff_access, sync_project_access
+
+
+class Command(BaseCommand):
+    help = "Compare the ProjectAccess table with project members/departments and optionally repair it"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--project', type=int, action='append', dest='projects',
+                            help="Only check this project id (repeatable)")
+        parser.add_argument('--user', type=int, action='append', dest='users',
+                            help="Only check this user id (repeatable)")
+        parser.add_argument('--fix', action='store_true', help="Insert missing rows and delete stale ones")
+
+    def handle(self, *args, **options):
+        project_ids, user_ids = options['projects'], options['users']
+        if options['fix']:
+            missing, stale = sync_project_access(project_ids, user_ids)
+        else:
+            missing, stale = diff_access(project_ids, user_ids)
+
+        for user_id, project_id, reason in sorted(missing):
+            self.stdout.write(f"missing: user={user_id} project={project_id} reason={reason}")
+        for user_id, project_id, reason in sorted(stale.values()):
+            self.stdout.write(f"stale:   user={user_id} project={project_id} reason={reason}")
+
+        if not missing and not stale:
+            self.stdout.write(self.style.SUCCESS("Project access is consistent."))
+        elif options['fix']:
+            self.stdout.write(self.style.SUCCESS(f"Fixed {len(missing)} missing and {len(stale)} stale rows."))
+        else:
+            self.stdout.write(self.style.WARNING(
+                f"{len(missing)} missing and {len(stale)} stale rows; run with --fix to repair."
+            ))
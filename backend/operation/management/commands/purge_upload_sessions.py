@@ -0,0 +1,18 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from operation.uploads import purge_sessions
+
+
+class Command(BaseCommand):
+    help = "Delete stale chunked upload sessions, their chunks and unattached content"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--hours', type=int, default=24,
+                            help="Purge sessions not touched for this many hours (default 24)")
+
+    def handle(self, *args, **options):
+        count = purge_sessions(timezone.now() - timedelta(hours=options['hours']))
+        self.stdout.write(self.style.SUCCESS(f"Purged {count} upload sessions."))
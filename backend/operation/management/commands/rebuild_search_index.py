@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+
+from operation.models import SearchEntry
+from operation.search import INDEXED_MODELS, reindex_queryset
+
+
+class Command(BaseCommand):
+    help = "Rebuild the project/task/scrum search index"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--model', choices=[m._meta.model_name for m in INDEXED_MODELS],
+                            action='append', dest='models', help="Only rebuild this model (repeatable)")
+        parser.add_argument('--if-empty', action='store_true',
+                            help="Do nothing when the index already has entries (used on container start)")
+
+    def handle(self, *args, **options):
+        if options['if_empty'] and SearchEntry.objects.exists():
+            self.stdout.write("Search index already populated; skipping.")
+            return
+        for model in INDEXED_MODELS:
+            if options['models'] and model._meta.model_name not in options['models']:
+                continue
+            count = reindex_queryset(model, model.objects.all())
+            self.stdout.write(f"Indexed {count} {model._meta.verbose_name_plural}.")
+        self.stdout.write(self.style.SUCCESS("Search index rebuilt."))
@@ -0,0 +1,28 @@
+import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+
+from operation.contract_reminders import send_reminders
+
+
+class Command(BaseCommand):
+    help = "Notify contract managers about contracts entering the 30/15/7-day expiry windows (run daily)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--date', help="Run as of this date (YYYY-MM-DD) instead of today")
+        parser.add_argument('--dry-run', action='store_true',
+                            help="List the due reminders without sending or logging them")
+
+    def handle(self, *args, **options):
+        today = None
+        if options['date']:
+            try:
+                today = datetime.date.fromisoformat(options['date'])
+            except ValueError:
+                raise CommandError("--date must be YYYY-MM-DD")
+
+        contracts = send_reminders(today, dry_run=options['dry_run'])
+        for contract in contracts:
+            self.stdout.write(f"{contract.end_date}  {contract.window:>2}d  #{contract.pk} {contract.subject}")
+        verb = "Due" if options['dry_run'] else "Sent"
+        self.stdout.write(self.style.SUCCESS(f"{verb} {len(contracts)} contract reminders."))
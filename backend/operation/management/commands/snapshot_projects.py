@@ -0,0 +1,23 @@
+import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+
+from operation.snapshots import take_snapshots
+
+
+class Command(BaseCommand):
+    help = "Record today's hours, cost and task counts for every active project (run nightly)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--date', help="File the snapshots under this date (YYYY-MM-DD) instead of today")
+
+    def handle(self, *args, **options):
+        date = None
+        if options['date']:
+            try:
+                date = datetime.date.fromisoformat(options['date'])
+            except ValueError:
+                raise CommandError("--date must be YYYY-MM-DD")
+
+        count = take_snapshots(date)
+        self.stdout.write(self.style.SUCCESS(f"Recorded {count} project snapshots."))
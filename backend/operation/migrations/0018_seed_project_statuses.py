@@ -0,0 +1,22 @@
+# Generated by Django 5.2.8 on 2026-10-19 18:46
+
+from django.db import migrations
+
+REQUIRED_PROJECT_STATUSES = ["To be Started", "In Progress", "On Hold", "Completed", "Cancelled"]
+
+
+def seed_project_statuses(apps, schema_editor):
+    ProjectStatus = apps.get_model('operation', 'ProjectStatus')
+    for name in REQUIRED_PROJECT_STATUSES:
+        ProjectStatus.objects.get_or_create(name=name)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('operation', '0017_remove_project_amc_remove_project_amc_date_and_more'),
+    ]
+
+    operations = [
+        migrations.RunPython(seed_project_statuses, migrations.RunPython.noop),
+    ]
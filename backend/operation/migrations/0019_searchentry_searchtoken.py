@@ -0,0 +1,54 @@
+# Generated by Django 5.2.8 on 2026-10-19 18:49
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def add_fulltext_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'mysql':
+        schema_editor.execute(
+            'ALTER TABLE operation_searchentry ADD FULLTEXT INDEX operation_searchentry_document_ft (document)'
+        )
+
+
+def drop_fulltext_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'mysql':
+        schema_editor.execute('ALTER TABLE operation_searchentry DROP INDEX operation_searchentry_document_ft')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('operation', '0018_seed_project_statuses'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('model', models.CharField(help_text='app_label.model of the indexed row', max_length=50)),
+                ('object_id', models.BigIntegerField()),
+                ('document', models.TextField(blank=True, default='')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name_plural': 'Search Entries',
+                'unique_together': {('model', 'object_id')},
+            },
+        ),
+        migrations.CreateModel(
+            name='SearchToken',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('token', models.CharField(max_length=64)),
+                ('weight', models.PositiveSmallIntegerField(default=1)),
+                ('entry', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='tokens', to='operation.searchentry')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['token', 'entry'], name='operation_s_token_a2a359_idx')],
+                'unique_together': {('entry', 'token')},
+            },
+        ),
+        migrations.RunPython(add_fulltext_index, drop_fulltext_index),
+    ]
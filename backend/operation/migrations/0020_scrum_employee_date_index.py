@@ -0,0 +1,19 @@
+# Generated by Django 5.2.8 on 2026-10-19 19:03
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('operation', '0019_searchentry_searchtoken'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='scrum',
+            index=models.Index(fields=['employee', 'date'], name='operation_s_employe_52edeb_idx'),
+        ),
+    ]
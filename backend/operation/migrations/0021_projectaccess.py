@@ -0,0 +1,50 @@
+# Generated by Django 5.2.8 on 2026-10-19 19:06
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill_project_access(apps, schema_editor):
+    Project = apps.get_model('operation', 'Project')
+    ProjectAccess = apps.get_model('operation', 'ProjectAccess')
+
+    rows = {
+        (user_id, project_id, 'member')
+        for user_id, project_id in Project.members.through.objects.values_list('customuser_id', 'project_id')
+    }
+    rows.update(
+        (user_id, project_id, 'department')
+        for user_id, project_id in Project.involved_departments.through.objects.filter(
+            department__customuser__isnull=False
+        ).values_list('department__customuser', 'project_id')
+    )
+    ProjectAccess.objects.bulk_create(
+        [ProjectAccess(user_id=user_id, project_id=project_id, reason=reason) for user_id, project_id, reason in rows],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('operation', '0020_scrum_employee_date_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProjectAccess',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('reason', models.CharField(choices=[('member', 'Member'), ('department', 'Involved department')], max_length=20)),
+                ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='access', to='operation.project')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='project_access', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name_plural': 'Project Access',
+                'unique_together': {('user', 'project', 'reason')},
+            },
+        ),
+        migrations.RunPython(backfill_project_access, migrations.RunPython.noop),
+    ]
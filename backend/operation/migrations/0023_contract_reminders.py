@@ -0,0 +1,36 @@
+# Generated by Django 5.2.8 on 2026-10-19 19:22
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('operation', '0022_upload_sessions'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ContractReminderLog',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('window', models.PositiveSmallIntegerField(help_text='Days before end date')),
+                ('end_date', models.DateField()),
+                ('sent_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='contract',
+            index=models.Index(fields=['no_end_date', 'end_date'], name='operation_c_no_end__3c023c_idx'),
+        ),
+        migrations.AddField(
+            model_name='contractreminderlog',
+            name='contract',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='reminder_logs', to='operation.contract'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='contractreminderlog',
+            unique_together={('contract', 'end_date', 'window')},
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.8 on 2026-10-19 19:27
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('operation', '0023_contract_reminders'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProjectSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('duration_seconds', models.BigIntegerField(default=0)),
+                ('cost', models.DecimalField(decimal_places=4, default=0, max_digits=18)),
+                ('hours_allocated', models.DecimalField(blank=True, decimal_places=2, max_digits=10, null=True)),
+                ('tasks_todo', models.PositiveIntegerField(default=0)),
+                ('tasks_in_progress', models.PositiveIntegerField(default=0)),
+                ('tasks_review', models.PositiveIntegerField(default=0)),
+                ('tasks_done', models.PositiveIntegerField(default=0)),
+                ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='snapshots', to='operation.project')),
+            ],
+            options={
+                'ordering': ['date'],
+                'unique_together': {('project', 'date')},
+            },
+        ),
+    ]
@@ -1,7 +1,24 @@
+import uuid
+
 from django.utils import timezone
 from django.db import models
 from django.contrib.auth.hashers import make_password
+from django.db.models.signals import post_save, post_delete, pre_delete, m2m_changed
+from django.dispatch import receiver
 from authapp.models import CustomUser, Department
+from authapp.images import process_image_safely
+from .caching import ASSIGNMENTS_NAMESPACE, PROJECTS_NAMESPACE, bump_client_versions, bump_version
+from .reference_data import NAMESPACE as REFERENCE_DATA_NAMESPACE, REFERENCE_MODELS
+
+
+# Statuses the project board and forms rely on; seeded by migration 0018
+REQUIRED_PROJECT_STATUSES = [
+    "To be Started",
+    "In Progress",
+    "On Hold",
+    "Completed",
+    "Cancelled",
+]
 
 
 class ProjectCategory(models.Model):
@@ -9,6 +26,10 @@ class ProjectCategory(models.Model):
     description = models.TextField(blank=True, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.__original_name = self.__dict__.get('name')
+
     def __str__(self):
         return self.name
 
@@ -21,6 +42,10 @@ class ProjectStatus(models.Model):
     name = models.CharField(max_length=50, unique=True)
     description = models.TextField(blank=True, null=True)
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.__original_name = self.__dict__.get('name')
+
     def __str__(self):
         return self.name
 
@@ -32,6 +57,10 @@ class ProjectStage(models.Model):
     name = models.CharField(max_length=50, unique=True)
     description = models.TextField(blank=True, null=True)
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.__original_name = self.__dict__.get('name')
+
     def __str__(self):
         return self.name
 
@@ -68,6 +97,10 @@ class Client(models.Model):
     def set_password(self, raw_password):
         self.password = make_password(raw_password)
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.__original_name = self.__dict__.get('name')
+
     def __str__(self):
         return self.name
 
@@ -122,6 +155,11 @@ class Project(models.Model):
     def __str__(self):
         return self.name
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.__original_name = self.__dict__.get('name')
+        self.__original_client_id = self.__dict__.get('client_id')
+
     class Meta:
         ordering = ['-created_at']
 
@@ -129,9 +167,10 @@ class Project(models.Model):
 class ProjectFile(models.Model):
     project = models.ForeignKey(
         Project, on_delete=models.CASCADE, related_name='project_files')
-    file = models.FileField(upload_to='project_files/%Y/%m/%d/')
+    file = models.FileField(upload_to='project_files/%Y/%m/%d/', max_length=255)
     original_name = models.CharField(max_length=255)
-    file_size = models.IntegerField()
+    file_size = models.BigIntegerField()
+    sha256 = models.CharField(max_length=64, blank=True, null=True, db_index=True)
     uploaded_at = models.DateTimeField(auto_now_add=True)
     uploaded_by = models.ForeignKey(
         CustomUser, on_delete=models.SET_NULL, null=True)
@@ -140,6 +179,57 @@ class ProjectFile(models.Model):
         return f"{self.original_name} - {self.project.name}"
 
 
+class UploadSession(models.Model):
+    """
+    A resumable chunked upload. Chunks land in UploadChunk rows; completing
+    the session assembles them into content-addressed storage, after which
+    the file can be attached to any number of projects.
+    """
+    STATUS_OPEN = 'open'
+    STATUS_COMPLETE = 'complete'
+    STATUS_CHOICES = [
+        (STATUS_OPEN, 'Open'),
+        (STATUS_COMPLETE, 'Complete'),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    created_by = models.ForeignKey(
+        CustomUser, on_delete=models.CASCADE, related_name='upload_sessions')
+    original_name = models.CharField(max_length=255)
+    total_size = models.BigIntegerField()
+    chunk_size = models.PositiveIntegerField()
+    sha256 = models.CharField(max_length=64, blank=True, default='',
+                              help_text="Expected hash if given by the client; actual hash once complete")
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_OPEN)
+    file = models.FileField(max_length=255, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    completed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f"{self.original_name} ({self.status})"
+
+    @property
+    def total_chunks(self):
+        return -(-self.total_size // self.chunk_size)
+
+
+class UploadChunk(models.Model):
+    session = models.ForeignKey(
+        UploadSession, on_delete=models.CASCADE, related_name='chunks')
+    index = models.PositiveIntegerField()
+    size = models.PositiveIntegerField()
+    sha256 = models.CharField(max_length=64)
+    file = models.FileField(max_length=255)
+
+    class Meta:
+        unique_together = ('session', 'index')
+        ordering = ['index']
+
+
 class TaskStatus(models.TextChoices):
     TODO = 'todo', 'To Do'
     IN_PROGRESS = 'in_progress', 'In Progress'
@@ -200,6 +290,10 @@ class Task(models.Model):
         ordering = ['-priority', 'due_date', 'name']
         verbose_name_plural = "Tasks"
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.__original_name = self.__dict__.get('name')
+
     def __str__(self):
      project_name = self.project.name if self.project else "No Project"
      task_name = self.name if self.name else f"Task #{self.pk}"
@@ -265,10 +359,11 @@ class Scrum(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
- 
-       
         verbose_name = "Scrum"
         verbose_name_plural = "Scrums"
+        indexes = [
+            models.Index(fields=['employee', 'date']),
+        ]
 
     def __str__(self):
         employee_str = self.employee.get_full_name() if self.employee else 'Unassigned'
@@ -335,4 +430,280 @@ class Contract(models.Model):
         return f"{self.subject} - {self.client.name}"
 
     class Meta:
-        ordering = ['-created_at']
\ No newline at end of file
+        ordering = ['-created_at']
+        indexes = [
+            # Expiry range scans (stats, renewal reminders) always exclude
+            # open-ended contracts, so no_end_date leads the index
+            models.Index(fields=['no_end_date', 'end_date']),
+        ]
+
+
+class ContractReminderLog(models.Model):
+    """
+    An expiry reminder already sent for a contract. Keyed by the end date it
+    was sent for, so extending a contract re-arms its reminders.
+    """
+    contract = models.ForeignKey(
+        Contract, on_delete=models.CASCADE, related_name='reminder_logs')
+    window = models.PositiveSmallIntegerField(help_text="Days before end date")
+    end_date = models.DateField()
+    sent_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        unique_together = ('contract', 'end_date', 'window')
+
+    def __str__(self):
+        return f"{self.contract_id} - {self.window} days before {self.end_date}"
+
+
+class ProjectSnapshot(models.Model):
+    """
+    A project's cumulative hours and cost, allocated hours and task counts
+    as of one day. Written nightly by the snapshot_projects command.
+    """
+    project = models.ForeignKey(
+        Project, on_delete=models.CASCADE, related_name='snapshots')
+    date = models.DateField()
+    duration_seconds = models.BigIntegerField(default=0)
+    cost = models.DecimalField(max_digits=18, decimal_places=4, default=0)
+    hours_allocated = models.DecimalField(
+        max_digits=10, decimal_places=2, null=True, blank=True)
+    tasks_todo = models.PositiveIntegerField(default=0)
+    tasks_in_progress = models.PositiveIntegerField(default=0)
+    tasks_review = models.PositiveIntegerField(default=0)
+    tasks_done = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        unique_together = ('project', 'date')
+        ordering = ['date']
+
+    def __str__(self):
+        return f"{self.project_id} - {self.date}"
+
+
+class ProjectAccessReason(models.TextChoices):
+    MEMBER = 'member', 'Member'
+    DEPARTMENT = 'department', 'Involved department'
+
+
+class ProjectAccess(models.Model):
+    """
+    Denormalized user -> project visibility, one row per reason. Maintained
+    by the signal handlers below; check_project_access rebuilds and diffs it.
+    """
+    user = models.ForeignKey(
+        CustomUser, on_delete=models.CASCADE, related_name='project_access')
+    project = models.ForeignKey(
+        Project, on_delete=models.CASCADE, related_name='access')
+    reason = models.CharField(max_length=20, choices=ProjectAccessReason.choices)
+
+    class Meta:
+        unique_together = ('user', 'project', 'reason')
+        verbose_name_plural = "Project Access"
+
+    def __str__(self):
+        return f"{self.user} -> {self.project} ({self.reason})"
+
+
+class SearchEntry(models.Model):
+    """
+    Denormalized search document for a Project, Task or Scrum row, maintained
+    by operation.search. On MySQL ``document`` carries a FULLTEXT index;
+    elsewhere SearchToken rows are kept instead.
+    """
+    model = models.CharField(max_length=50, help_text="app_label.model of the indexed row")
+    object_id = models.BigIntegerField()
+    document = models.TextField(blank=True, default='')
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ('model', 'object_id')
+        verbose_name_plural = "Search Entries"
+
+    def __str__(self):
+        return f"{self.model} #{self.object_id}"
+
+
+class SearchToken(models.Model):
+    entry = models.ForeignKey(SearchEntry, on_delete=models.CASCADE, related_name='tokens')
+    token = models.CharField(max_length=64)
+    weight = models.PositiveSmallIntegerField(default=1)
+
+    class Meta:
+        unique_together = ('entry', 'token')
+        indexes = [models.Index(fields=['token', 'entry'])]
+
+    def __str__(self):
+        return self.token
+
+
+@receiver(post_save, sender=Contract)
+def process_contract_logo(sender, instance, update_fields=None, **kwargs):
+    if update_fields is not None and 'company_logo' not in update_fields:
+        return
+    if instance.company_logo:
+        process_image_safely(instance.company_logo)
+
+
+def invalidate_reference_data(sender, **kwargs):
+    bump_version(REFERENCE_DATA_NAMESPACE)
+
+
+for _label in REFERENCE_MODELS:
+    post_save.connect(invalidate_reference_data, sender=_label, dispatch_uid=f'reference-data-save-{_label}')
+    post_delete.connect(invalidate_reference_data, sender=_label, dispatch_uid=f'reference-data-delete-{_label}')
+
+
+@receiver(post_save, sender=Project)
+@receiver(post_save, sender=Task)
+def index_for_search(sender, instance, **kwargs):
+    from operation.search import reindex_dependents, reindex_objects
+
+    reindex_objects(sender, [instance.pk])
+    original_name = getattr(instance, f'_{sender.__name__}__original_name')
+    if original_name != instance.name:
+        reindex_dependents(instance)
+    setattr(instance, f'_{sender.__name__}__original_name', instance.name)
+
+
+@receiver(post_save, sender=Scrum)
+def index_scrum_for_search(sender, instance, **kwargs):
+    from operation.search import reindex_objects
+
+    reindex_objects(Scrum, [instance.pk])
+
+
+@receiver(post_delete, sender=Project)
+@receiver(post_delete, sender=Task)
+@receiver(post_delete, sender=Scrum)
+def remove_from_search(sender, instance, **kwargs):
+    from operation.search import remove_objects
+
+    remove_objects(sender, [instance.pk])
+
+
+@receiver(post_save, sender=Project)
+@receiver(post_delete, sender=Project)
+@receiver(m2m_changed, sender=Project.members.through)
+@receiver(m2m_changed, sender=Project.involved_departments.through)
+def invalidate_project_caches(sender, **kwargs):
+    if kwargs.get('action', 'post_').startswith('post_'):
+        bump_version(PROJECTS_NAMESPACE)
+        bump_version(ASSIGNMENTS_NAMESPACE)
+
+
+@receiver(post_save, sender=Client)
+@receiver(post_delete, sender=Client)
+def invalidate_client_project_caches(sender, **kwargs):
+    # Client names are part of cached project reports
+    bump_version(PROJECTS_NAMESPACE)
+
+
+@receiver(post_save, sender=Task)
+@receiver(post_delete, sender=Task)
+@receiver(m2m_changed, sender=Task.assignees.through)
+def invalidate_assignment_caches(sender, **kwargs):
+    if kwargs.get('action', 'post_').startswith('post_'):
+        bump_version(ASSIGNMENTS_NAMESPACE)
+
+
+@receiver(post_save, sender=Project)
+@receiver(post_delete, sender=Project)
+def invalidate_project_client_snapshots(sender, instance, **kwargs):
+    bump_client_versions([instance._Project__original_client_id, instance.client_id])
+    instance._Project__original_client_id = instance.client_id
+
+
+@receiver(post_save, sender=Task)
+@receiver(post_delete, sender=Task)
+def invalidate_task_client_snapshots(sender, instance, **kwargs):
+    if instance.project_id:
+        bump_client_versions(Project.objects.filter(pk=instance.project_id).values_list('client_id', flat=True))
+
+
+@receiver(post_save, sender=Contract)
+@receiver(post_delete, sender=Contract)
+def invalidate_contract_client_snapshots(sender, instance, **kwargs):
+    bump_client_versions([instance.client_id])
+
+
+@receiver(m2m_changed, sender=Project.involved_departments.through)
+def index_project_departments(sender, instance, action, reverse, pk_set, **kwargs):
+    from operation.search import reindex_objects
+
+    if not reverse:
+        if action in ('post_add', 'post_remove', 'post_clear'):
+            reindex_objects(Project, [instance.pk])
+        return
+    # department.projects.<add/remove/clear>(): instance is the Department
+    if action == 'pre_clear':
+        instance._search_cleared_project_ids = list(instance.projects.values_list('pk', flat=True))
+    elif action == 'post_clear':
+        reindex_objects(Project, getattr(instance, '_search_cleared_project_ids', []))
+    elif action in ('post_add', 'post_remove'):
+        reindex_objects(Project, pk_set or [])
+
+
+@receiver(post_save, sender=ProjectCategory)
+@receiver(post_save, sender=ProjectStatus)
+@receiver(post_save, sender=ProjectStage)
+@receiver(post_save, sender=Client)
+@receiver(post_save, sender=Department)
+def reindex_renamed_lookup(sender, instance, created, **kwargs):
+    """Lookup names are part of project documents; reindex them on renames only."""
+    from operation.search import reindex_dependents
+
+    original = f'_{sender.__name__}__original_name'
+    if not created and instance.name != getattr(instance, original):
+        reindex_dependents(instance)
+    setattr(instance, original, instance.name)
+
+
+@receiver(post_save, sender=CustomUser)
+def reindex_renamed_employee(sender, instance, created, **kwargs):
+    from operation.search import reindex_dependents
+
+    names = (instance.name, instance.first_name, instance.last_name, instance.username)
+    if not created and names != instance._CustomUser__original_names:
+        reindex_dependents(instance)
+    instance._CustomUser__original_names = names
+
+
+@receiver(m2m_changed, sender=Project.members.through)
+@receiver(m2m_changed, sender=Project.involved_departments.through)
+def sync_project_access_on_m2m(sender, instance, action, reverse, **kwargs):
+    from operation.access import sync_project_access
+
+    if not action.startswith('post_'):
+        return
+    if not reverse:
+        sync_project_access(project_ids=[instance.pk])
+    elif isinstance(instance, Department):
+        sync_project_access(user_ids=CustomUser.objects.filter(department=instance).values_list('pk', flat=True))
+    else:
+        sync_project_access(user_ids=[instance.pk])
+
+
+@receiver(post_save, sender=CustomUser)
+def sync_project_access_on_department(sender, instance, created, **kwargs):
+    from operation.access import sync_project_access
+
+    original = instance._CustomUser__original_department_id
+    if (created and instance.department_id) or (not created and instance.department_id != original):
+        sync_project_access(user_ids=[instance.pk])
+    instance._CustomUser__original_department_id = instance.department_id
+
+
+@receiver(pre_delete, sender=Department)
+def remember_department_users(sender, instance, **kwargs):
+    # Users are detached with a bulk SET_NULL that sends no signals
+    instance._access_user_ids = list(CustomUser.objects.filter(department=instance).values_list('pk', flat=True))
+
+
+@receiver(post_delete, sender=Department)
+def sync_project_access_on_department_delete(sender, instance, **kwargs):
+    from operation.access import sync_project_access
+
+    user_ids = getattr(instance, '_access_user_ids', None)
+    if user_ids:
+        sync_project_access(user_ids=user_ids)
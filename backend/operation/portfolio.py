@@ -0,0 +1,193 @@
+"""
+Portfolio P&L report.
+
+Budget against hours and cost for every project in a queryset, read in one
+query from the hr cost ledger (see operation.financials). Margin is budget
+minus cost and burn is cost as a percentage of budget; both are empty for a
+project without a budget. Grouped reports total projects per (group, currency)
+so budgets in different currencies are never added together.
+
+A report for a closed (past) month can only change when a past month's
+ledger rows, a project or the reference data change, so it is cached under
+those version counters.
+"""
+import datetime
+
+from django.core.cache import cache
+
+from reports.exports import Column, label
+
+from .caching import CLOSED_MONTHS_NAMESPACE, PROJECTS_NAMESPACE, get_version, versioned_key
+from .financials import annotate_financials, current_month
+from .models import Project
+from .reference_data import NAMESPACE as REFERENCE_DATA_NAMESPACE
+
+CLOSED_MONTH_TTL = 24 * 60 * 60
+
+# Project row fields a report can be grouped by
+GROUPS = ('client', 'category', 'status', 'tenor')
+
+FIELDS = (
+    ('id', 'pk'),
+    ('name', 'name'),
+    ('client', 'client__name'),
+    ('category', 'category__name'),
+    ('status', 'status__name'),
+    ('tenor', 'tenor'),
+    ('currency', 'currency__code'),
+    ('budget', 'budget'),
+    ('hours_allocated', 'hours_allocated'),
+    ('seconds', 'total_seconds_spent'),
+    ('cost', 'total_cost'),
+)
+
+tenor_label = label(Project.TENOR_CHOICES)
+
+PROJECT_COLUMNS = [
+    Column('Project', 'name', key='name'),
+    Column('Client', 'client', key='client'),
+    Column('Category', 'category', key='category'),
+    Column('Status', 'status', key='status'),
+    Column('Tenor', 'tenor', render=tenor_label, key='tenor'),
+    Column('Currency', 'currency', key='currency'),
+    Column('Budget', 'budget', key='budget'),
+    Column('Hours Allocated', 'hours_allocated', key='hours_allocated'),
+    Column('Hours', 'hours', key='hours'),
+    Column('Cost', 'cost', key='cost'),
+    Column('Margin', 'margin', key='margin'),
+    Column('Burn %', 'burn_percentage', key='burn_percentage'),
+]
+
+TOTAL_COLUMNS = [
+    Column('Currency', 'currency', key='currency'),
+    Column('Projects', 'projects', key='projects'),
+    Column('Budget', 'budget', key='budget'),
+    Column('Hours Allocated', 'hours_allocated', key='hours_allocated'),
+    Column('Hours', 'hours', key='hours'),
+    Column('Cost', 'cost', key='cost'),
+    Column('Margin', 'margin', key='margin'),
+    Column('Burn %', 'burn_percentage', key='burn_percentage'),
+]
+
+
+def parse_month(value):
+    """First-of-month date for ``YYYY-MM``, or None when not given. Raises ValueError."""
+    if not value:
+        return None
+    return datetime.datetime.strptime(value, '%Y-%m').date()
+
+
+def _money(value):
+    return round(float(value), 2) if value is not None else None
+
+
+def _margins(row):
+    budget, cost = row['budget'], row['cost']
+    row['margin'] = _money(budget - cost) if budget is not None else None
+    row['burn_percentage'] = round(cost / budget * 100, 1) if budget else None
+    return row
+
+
+def project_rows(queryset, month=None):
+    """One dict per project, ordered by name."""
+    names = [name for name, _ in FIELDS]
+    values = (
+        annotate_financials(queryset.order_by(), month)
+        .order_by('name', 'pk')
+        .values_list(*[field for _, field in FIELDS])
+    )
+    rows = []
+    for value in values:
+        row = dict(zip(names, value))
+        seconds, cost = row.pop('seconds') or 0, row.pop('cost') or 0
+        row['budget'] = _money(row['budget'])
+        row['hours_allocated'] = _money(row['hours_allocated'])
+        row['hours'] = round(seconds / 3600, 2)
+        row['cost'] = _money(cost)
+        rows.append(_margins(row))
+    return rows
+
+
+def group_totals(rows, group_by=None):
+    """
+    Totals of ``rows`` per (group, currency), ordered by group then currency.
+    Budget, margin and burn only cover projects that have a budget.
+    """
+    totals = {}
+    for row in rows:
+        key = (row[group_by] if group_by else None, row['currency'])
+        total = totals.get(key)
+        if total is None:
+            total = totals[key] = {
+                'group': key[0], 'currency': key[1], 'projects': 0, 'budget': None,
+                'hours_allocated': 0.0, 'hours': 0.0, 'cost': 0.0, 'budgeted_cost': 0.0,
+            }
+        total['projects'] += 1
+        total['hours_allocated'] += row['hours_allocated'] or 0
+        total['hours'] += row['hours']
+        total['cost'] += row['cost']
+        if row['budget'] is not None:
+            total['budget'] = (total['budget'] or 0) + row['budget']
+            total['budgeted_cost'] += row['cost']
+
+    result = []
+    for key in sorted(totals, key=lambda key: tuple((value is None, value or '') for value in key)):
+        total = totals[key]
+        budgeted_cost = total.pop('budgeted_cost')
+        for name in ('budget', 'hours_allocated', 'hours', 'cost'):
+            total[name] = _money(total[name])
+        total['margin'] = _money(total['budget'] - budgeted_cost) if total['budget'] is not None else None
+        total['burn_percentage'] = round(budgeted_cost / total['budget'] * 100, 1) if total['budget'] else None
+        if not group_by:
+            del total['group']
+        result.append(total)
+    return result
+
+
+def build_report(queryset, month=None, group_by=None):
+    month = month or current_month()
+    projects = project_rows(queryset, month)
+    report = {
+        'month': month.strftime('%Y-%m'),
+        'closed': month < current_month(),
+        'group_by': group_by,
+        'totals': group_totals(projects),
+        'projects': projects,
+    }
+    if group_by:
+        report['groups'] = group_totals(projects, group_by)
+    return report
+
+
+def portfolio_report(queryset, cache_key_parts, month=None, group_by=None):
+    """
+    ``build_report`` for ``queryset``; reports for closed months are cached
+    under ``cache_key_parts``, which must identify the queryset.
+    """
+    if month is None or month >= current_month():
+        return build_report(queryset, month, group_by)
+
+    key = versioned_key(
+        CLOSED_MONTHS_NAMESPACE, 'portfolio', month.isoformat(), group_by or '',
+        get_version(PROJECTS_NAMESPACE), get_version(REFERENCE_DATA_NAMESPACE), *cache_key_parts,
+    )
+    report = cache.get(key)
+    if report is None:
+        report = build_report(queryset, month, group_by)
+        cache.set(key, report, timeout=CLOSED_MONTH_TTL)
+    return report
+
+
+def export_table(report):
+    """(columns, rows) of the report's most detailed grouped table, for CSV/XLSX."""
+    if report['group_by']:
+        header = report['group_by'].title()
+        columns = [Column(header, 'group', render=tenor_label if report['group_by'] == 'tenor' else None)]
+        columns += TOTAL_COLUMNS
+        rows = report['groups']
+    else:
+        columns, rows = PROJECT_COLUMNS, report['projects']
+    return columns, [
+        [column.render(row[column.source]) if column.render else row[column.source] for column in columns]
+        for row in rows
+    ]
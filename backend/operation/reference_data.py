@@ -0,0 +1,68 @@
+"""
+Bundled lookup tables for forms and filters, served from cache and
+invalidated through the ``reference-data`` version counter whenever one of
+REFERENCE_MODELS is written.
+"""
+from django.core.cache import cache
+
+from .caching import get_version
+
+NAMESPACE = 'reference-data'
+
+# app_label.ModelName of every table included in the bundle
+REFERENCE_MODELS = (
+    'operation.ProjectStatus',
+    'operation.ProjectStage',
+    'operation.ProjectCategory',
+    'operation.Currency',
+    'operation.ContractType',
+    'authapp.Department',
+    'authapp.Designation',
+    'hr.LeaveType',
+    'sales.LeadSource',
+    'sales.LeadCategory',
+    'sales.LeadTeam',
+)
+
+
+def build_reference_data():
+    from authapp.models import Department, Designation
+    from authapp.serializers import DepartmentSerializer, DesignationSerializer
+    from hr.models import LeaveType
+    from hr.serializers import LeaveTypeSerializer
+    from sales.models import LeadCategory, LeadSource, LeadTeam
+    from sales.serializers import LeadCategorySerializer, LeadSourceSerializer, LeadTeamSerializer
+
+    from .models import (
+        REQUIRED_PROJECT_STATUSES, ContractType, Currency, ProjectCategory, ProjectStage, ProjectStatus,
+    )
+    from .serializers import (
+        ContractTypeSerializer, CurrencySerializer, ProjectCategorySerializer, ProjectStageSerializer,
+        ProjectStatusSerializer,
+    )
+
+    tables = {
+        'statuses': (ProjectStatusSerializer, ProjectStatus.objects.filter(name__in=REQUIRED_PROJECT_STATUSES).order_by('id')),
+        'stages': (ProjectStageSerializer, ProjectStage.objects.order_by('name')),
+        'categories': (ProjectCategorySerializer, ProjectCategory.objects.order_by('name')),
+        'currencies': (CurrencySerializer, Currency.objects.order_by('code')),
+        'contract_types': (ContractTypeSerializer, ContractType.objects.order_by('name')),
+        'departments': (DepartmentSerializer, Department.objects.order_by('name')),
+        'designations': (DesignationSerializer, Designation.objects.order_by('name')),
+        'leave_types': (LeaveTypeSerializer, LeaveType.objects.order_by('name')),
+        'lead_sources': (LeadSourceSerializer, LeadSource.objects.order_by('name')),
+        'lead_categories': (LeadCategorySerializer, LeadCategory.objects.order_by('name')),
+        'lead_teams': (LeadTeamSerializer, LeadTeam.objects.order_by('name')),
+    }
+    return {name: serializer(queryset, many=True).data for name, (serializer, queryset) in tables.items()}
+
+
+def get_reference_data():
+    """Returns ``(version, payload)``, building and caching the payload on a miss."""
+    version = get_version(NAMESPACE)
+    key = f'{NAMESPACE}:{version}'
+    payload = cache.get(key)
+    if payload is None:
+        payload = build_reference_data()
+        cache.set(key, payload, timeout=60 * 60 * 24)
+    return version, payload
@@ -0,0 +1,249 @@
+"""
+Search index for projects, tasks and scrum entries.
+
+Each indexed row has one SearchEntry whose ``document`` concatenates its own
+text and the names of the rows it is displayed with (client, category,
+departments, task, project, employee). Signals in operation.models keep the
+entries current. On MySQL the document has a FULLTEXT index queried with
+MATCH ... AGAINST in boolean mode; on other databases weighted SearchToken
+rows are kept and matched by prefix.
+
+FullTextSearchFilter is a drop-in replacement for DRF's SearchFilter that
+uses the index and, unless ``?ordering=`` is given, sorts by relevance.
+"""
+import re
+from functools import reduce
+from operator import or_
+
+from django.db import connection, transaction
+from django.db.models import OuterRef, Q, Subquery, Sum, Value
+from django.db.models.expressions import RawSQL
+from rest_framework import filters
+
+from authapp.models import CustomUser, Department
+
+from .models import (
+    Client, Project, ProjectCategory, ProjectStage, ProjectStatus, Scrum, SearchEntry, SearchToken, Task,
+)
+
+TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+MAX_TOKEN_LENGTH = 64
+# InnoDB's default innodb_ft_min_token_size; shorter terms use LIKE instead
+FULLTEXT_MIN_TOKEN_LENGTH = 3
+BATCH_SIZE = 500
+
+
+def uses_fulltext():
+    return connection.vendor == 'mysql'
+
+
+def tokenize(text):
+    return [token[:MAX_TOKEN_LENGTH] for token in TOKEN_RE.findall((text or '').lower())]
+
+
+def _employee_names(user):
+    if user is None:
+        return ''
+    return ' '.join(filter(None, [user.name, user.first_name, user.last_name, user.username]))
+
+
+def _project_parts(project):
+    return [
+        (project.name, 3),
+        (project.summary, 1),
+        (project.notes, 1),
+        (project.category.name if project.category else '', 2),
+        (project.status.name if project.status else '', 1),
+        (project.stage.name if project.stage else '', 1),
+        (project.client.name if project.client else '', 2),
+        (' '.join(d.name or '' for d in project.involved_departments.all()), 1),
+    ]
+
+
+def _task_parts(task):
+    return [
+        (task.name, 3),
+        (task.description, 1),
+        (task.project.name if task.project else '', 2),
+    ]
+
+
+def _scrum_parts(scrum):
+    return [
+        (scrum.morning_memo, 1),
+        (scrum.evening_memo, 1),
+        (scrum.task.name if scrum.task else '', 2),
+        (scrum.task.project.name if scrum.task and scrum.task.project else '', 2),
+        (_employee_names(scrum.employee), 2),
+    ]
+
+
+# model -> (queryset loading everything a document needs, document parts)
+INDEXED_MODELS = {
+    Project: (
+        lambda: Project.objects.select_related('category', 'status', 'stage', 'client')
+        .prefetch_related('involved_departments'),
+        _project_parts,
+    ),
+    Task: (lambda: Task.objects.select_related('project'), _task_parts),
+    Scrum: (lambda: Scrum.objects.select_related('task__project', 'employee'), _scrum_parts),
+}
+
+
+def _label(model):
+    return model._meta.label_lower
+
+
+def _write_entries(model, objects):
+    _, parts_for = INDEXED_MODELS[model]
+    label = _label(model)
+    documents = {obj.pk: parts_for(obj) for obj in objects}
+    if not documents:
+        return
+    SearchEntry.objects.bulk_create(
+        [
+            SearchEntry(
+                model=label,
+                object_id=pk,
+                document=' '.join(text for text, _ in parts if text),
+            )
+            for pk, parts in documents.items()
+        ],
+        update_conflicts=True,
+        # MySQL upserts on any unique key and rejects an explicit target
+        unique_fields=(
+            ['model', 'object_id'] if connection.features.supports_update_conflicts_with_target else None
+        ),
+        update_fields=['document', 'updated_at'],
+    )
+    if uses_fulltext():
+        return
+
+    entry_ids = dict(
+        SearchEntry.objects.filter(model=label, object_id__in=documents).values_list('object_id', 'id')
+    )
+    SearchToken.objects.filter(entry_id__in=entry_ids.values()).delete()
+    tokens = []
+    for pk, parts in documents.items():
+        weights = {}
+        for text, weight in parts:
+            for token in tokenize(text):
+                weights[token] = max(weights.get(token, 0), weight)
+        tokens.extend(
+            SearchToken(entry_id=entry_ids[pk], token=token, weight=weight)
+            for token, weight in weights.items()
+        )
+    SearchToken.objects.bulk_create(tokens, batch_size=1000)
+
+
+def reindex_objects(model, pks):
+    """(Re)build the entries for ``pks``; entries of missing rows are removed."""
+    pks = list(pks)
+    queryset_for, _ = INDEXED_MODELS[model]
+    with transaction.atomic():
+        for start in range(0, len(pks), BATCH_SIZE):
+            batch = pks[start:start + BATCH_SIZE]
+            objects = list(queryset_for().filter(pk__in=batch))
+            _write_entries(model, objects)
+            missing = set(batch) - {obj.pk for obj in objects}
+            if missing:
+                remove_objects(model, missing)
+
+
+def reindex_queryset(model, queryset):
+    """Reindex every row of ``queryset``; returns the number of rows indexed."""
+    count = 0
+    ids = list(queryset.order_by('pk').values_list('pk', flat=True))
+    for start in range(0, len(ids), BATCH_SIZE):
+        batch = ids[start:start + BATCH_SIZE]
+        reindex_objects(model, batch)
+        count += len(batch)
+    return count
+
+
+def remove_objects(model, pks):
+    SearchEntry.objects.filter(model=_label(model), object_id__in=list(pks)).delete()
+
+
+def reindex_dependents(instance):
+    """Reindex documents that embed ``instance``'s name."""
+    if isinstance(instance, Project):
+        reindex_queryset(Task, Task.objects.filter(project=instance))
+        reindex_queryset(Scrum, Scrum.objects.filter(task__project=instance))
+    elif isinstance(instance, Task):
+        reindex_queryset(Scrum, Scrum.objects.filter(task=instance))
+    elif isinstance(instance, CustomUser):
+        reindex_queryset(Scrum, Scrum.objects.filter(employee=instance))
+    elif isinstance(instance, Department):
+        reindex_queryset(Project, Project.objects.filter(involved_departments=instance))
+    elif isinstance(instance, (ProjectCategory, ProjectStatus, ProjectStage, Client)):
+        field = {
+            ProjectCategory: 'category', ProjectStatus: 'status', ProjectStage: 'stage', Client: 'client',
+        }[type(instance)]
+        reindex_queryset(Project, Project.objects.filter(**{field: instance}))
+
+
+def _token_match(token):
+    # The range lets the (token, entry) index drive the lookup; startswith
+    # keeps it exact under any collation.
+    return Q(token__gte=token, token__lt=token + '\U0010ffff', token__startswith=token)
+
+
+def search(queryset, terms):
+    """
+    Restrict ``queryset`` to rows whose document matches every term and
+    annotate it with ``search_rank``.
+    """
+    label = _label(queryset.model)
+    tokens = [token for term in terms for token in tokenize(term)]
+    if not tokens:
+        return queryset.none()
+
+    if uses_fulltext():
+        entries = SearchEntry.objects.filter(model=label)
+        for token in tokens:
+            if len(token) < FULLTEXT_MIN_TOKEN_LENGTH:
+                entries = entries.filter(document__icontains=token)
+        long_tokens = [t for t in tokens if len(t) >= FULLTEXT_MIN_TOKEN_LENGTH]
+        if not long_tokens:
+            return queryset.filter(pk__in=entries.values('object_id')).annotate(search_rank=Value(1.0))
+        relevance = RawSQL('MATCH(document) AGAINST (%s IN BOOLEAN MODE)', (' '.join(f'+{t}*' for t in long_tokens),))
+        entries = entries.annotate(rank=relevance)
+        return queryset.filter(pk__in=entries.filter(rank__gt=0).values('object_id')).annotate(
+            search_rank=Subquery(entries.filter(object_id=OuterRef('pk')).values('rank')[:1])
+        )
+
+    for token in tokens:
+        entry_ids = SearchToken.objects.filter(_token_match(token)).values('entry_id')
+        queryset = queryset.filter(pk__in=SearchEntry.objects.filter(
+            model=label, pk__in=entry_ids,
+        ).values('object_id'))
+    rank = (
+        SearchToken.objects
+        .filter(reduce(or_, (_token_match(token) for token in tokens)),
+                entry__model=label, entry__object_id=OuterRef('pk'))
+        .order_by()
+        .values('entry')
+        .annotate(total=Sum('weight'))
+        .values('total')
+    )
+    return queryset.annotate(search_rank=Subquery(rank))
+
+
+class FullTextSearchFilter(filters.SearchFilter):
+    """
+    SearchFilter backed by the search index. List it after OrderingFilter so
+    relevance ordering is applied on top of (not replaced by) the default
+    ordering; an explicit ``?ordering=`` still wins.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        terms = self.get_search_terms(request)
+        if not terms or queryset.model not in INDEXED_MODELS:
+            return super().filter_queryset(request, queryset, view)
+
+        queryset = search(queryset, terms)
+        if not request.query_params.get(filters.OrderingFilter.ordering_param):
+            ordering = queryset.query.order_by or queryset.model._meta.ordering
+            queryset = queryset.order_by('-search_rank', *ordering)
+        return queryset
@@ -7,15 +7,22 @@ from .models import (
     ProjectStage,
     Client,
     ProjectFile,
+    UploadSession,
     Currency,
     Task,
+    TaskPriority,
+    TaskStatus,
     Scrum,
     ContractType,
     Contract,
 )
-from authapp.serializers import ProfileSerializer, DepartmentSerializer
+from authapp.serializers import ProfileSerializer, DepartmentSerializer, UserMiniSerializer
 from authapp.models import CustomUser, Department
-from django.db.models import Sum, F
+from authapp.images import thumbnail_url
+from authapp.media import MediaFileField, MediaImageField
+from django.db import models
+from .financials import member_contributions, project_financials
+from .fieldsets import SparseFieldsetMixin
 from .models import Scrum
 from django.utils import timezone
 class ProjectCategorySerializer(serializers.ModelSerializer):
@@ -63,6 +70,8 @@ class ClientSerializer(serializers.ModelSerializer):
 
 
 class ProjectFileSerializer(serializers.ModelSerializer):
+    file = MediaFileField()
+
     class Meta:
         model = ProjectFile
         fields = [
@@ -77,19 +86,54 @@ class ProjectFileSerializer(serializers.ModelSerializer):
                             "file_size", "uploaded_at", "uploaded_by"]
 
 
+class UploadSessionSerializer(serializers.ModelSerializer):
+    total_chunks = serializers.IntegerField(read_only=True)
+    received_chunks = serializers.SerializerMethodField()
+
+    class Meta:
+        model = UploadSession
+        fields = [
+            "id", "original_name", "total_size", "chunk_size", "total_chunks",
+            "received_chunks", "sha256", "status", "created_at", "completed_at",
+        ]
+        read_only_fields = fields
+
+    def get_received_chunks(self, obj):
+        if obj.status == UploadSession.STATUS_COMPLETE:
+            return obj.total_chunks
+        return obj.chunks.count()
+
+
+class UploadSessionCreateSerializer(serializers.Serializer):
+    filename = serializers.CharField(max_length=255)
+    size = serializers.IntegerField(min_value=1)
+    sha256 = serializers.RegexField(r'^[0-9a-fA-F]{64}$', required=False)
+    chunk_size = serializers.IntegerField(required=False, min_value=1)
+
+
 class CurrencySerializer(serializers.ModelSerializer):
     class Meta:
         model = Currency
         fields = ["id", "code", "name", "symbol"]
 
 
-class ProjectSerializer(serializers.ModelSerializer):
+class ProjectListSerializer(serializers.ListSerializer):
+    """Computes member contributions for every project on the page in one query."""
+
+    def to_representation(self, data):
+        projects = list(data.all() if isinstance(data, models.manager.BaseManager) else data)
+        if 'member_contributions' in self.child.fields:
+            self._context['member_contributions'] = member_contributions(p.pk for p in projects)
+        return super().to_representation(projects)
+
+
+class ProjectSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     category = ProjectCategorySerializer(read_only=True)
     involved_departments = DepartmentSerializer(many=True, read_only=True)
     status = ProjectStatusSerializer(read_only=True)
     stage = ProjectStageSerializer(read_only=True)
     client = ClientSerializer(read_only=True)
-    members = ProfileSerializer(many=True, read_only=True)
+    members = UserMiniSerializer(many=True, read_only=True)
     project_files = ProjectFileSerializer(many=True, read_only=True)
     currency = CurrencySerializer(read_only=True)
     total_hours_spent = serializers.SerializerMethodField()
@@ -214,35 +258,24 @@ class ProjectSerializer(serializers.ModelSerializer):
             "member_contributions",
         ]
         read_only_fields = ["id", "created_at", "updated_at", "project_files", "total_hours_spent", "total_actual_cost", "profit_loss", "progress_percentage", "member_contributions"]
-
-    def _get_relevant_work_sessions(self, obj):
-        from hr.models import WorkSession
-        from django.utils import timezone
-        
-        sessions = WorkSession.objects.filter(project=obj, end_time__isnull=False)
-        
-        if getattr(obj, 'tenor', None) == 'monthly':
-            now = timezone.now()
-            sessions = sessions.filter(start_time__year=now.year, start_time__month=now.month)
-            
-        return sessions
+        list_serializer_class = ProjectListSerializer
+        # Default shape of list responses; everything else is opt-in via ?expand=
+        list_fields = [
+            "id", "name", "category", "client", "status", "status_id", "stage", "start_date",
+            "deadline", "no_deadline", "tenor", "summary", "members", "budget", "currency",
+            "hours_allocated", "is_active", "total_hours_spent", "total_actual_cost", "profit_loss", "progress_percentage",
+        ]
+        expandable_fields = {
+            "members": lambda: ProfileSerializer(many=True, read_only=True),
+        }
 
     def get_total_hours_spent(self, obj):
-        sessions = self._get_relevant_work_sessions(obj)
-        total_seconds = sessions.aggregate(total=Sum('duration_seconds'))['total'] or 0
-        return round(total_seconds / 3600, 2)
+        seconds, _ = project_financials(obj)
+        return round(seconds / 3600, 2)
 
     def get_total_actual_cost(self, obj):
-        sessions = self._get_relevant_work_sessions(obj)
-        total_cost = 0
-        for session in sessions:
-            if not session.employee:
-                continue
-            rate = session.employee.hourly_rate or 0
-            duration = session.duration_seconds or 0
-            hours = duration / 3600
-            total_cost += float(rate) * hours
-        return round(total_cost, 2)
+        _, cost = project_financials(obj)
+        return round(float(cost), 2)
 
     def get_profit_loss(self, obj):
         budget = float(obj.budget or 0)
@@ -257,31 +290,11 @@ class ProjectSerializer(serializers.ModelSerializer):
         return round((spent / allocated) * 100, 2)
 
     def get_member_contributions(self, obj):
-        sessions = self._get_relevant_work_sessions(obj)
-        contributions = {}
-        for session in sessions:
-            emp = session.employee
-            if not emp: continue
-            emp_id = emp.id
-            if emp_id not in contributions:
-                contributions[emp_id] = {
-                    'id': emp_id,
-                    'name': emp.name or emp.email.split('@')[0],
-                    'profile_picture': emp.image.url if emp.image else None,
-                    'hours': 0,
-                    'cost': 0
-                }
-            duration = session.duration_seconds or 0
-            hours = duration / 3600
-            contributions[emp_id]['hours'] += round(hours, 2)
-            contributions[emp_id]['cost'] += round(hours * float(emp.hourly_rate or 0), 2)
-        
-        # Format hours and cost to 2 decimal places in the final list
-        result = list(contributions.values())
-        for r in result:
-            r['hours'] = round(r['hours'], 2)
-            r['cost'] = round(r['cost'], 2)
-        return result
+        # Filled for the whole page by ProjectListSerializer
+        prefetched = self.context.get('member_contributions')
+        if prefetched is not None and obj.pk in prefetched:
+            return prefetched[obj.pk]
+        return member_contributions([obj.pk]).get(obj.pk, [])
 
     def create(self, validated_data):
         files = validated_data.pop("files", [])
@@ -404,9 +417,9 @@ class ProjectSerializer(serializers.ModelSerializer):
         return project
 
 
-class TaskSerializer(serializers.ModelSerializer):
+class TaskSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     project_name = serializers.CharField(source='project.name', read_only=True)
-    assignees = ProfileSerializer(many=True, read_only=True)
+    assignees = UserMiniSerializer(many=True, read_only=True)
     assignee_ids = serializers.PrimaryKeyRelatedField(
         queryset=CustomUser.objects.all(),
         many=True,
@@ -428,6 +441,11 @@ class TaskSerializer(serializers.ModelSerializer):
             'created_at', 'updated_at'
         ]
         read_only_fields = ['created_at', 'updated_at']
+        # Full assignee profiles only with ?expand=assignees
+        expandable_fields = {
+            'assignees': lambda: ProfileSerializer(many=True, read_only=True),
+        }
+        detail_expand = []
 
     def create(self, validated_data):
         assignee_ids = validated_data.pop('assignee_ids', [])
@@ -447,12 +465,73 @@ class TaskSerializer(serializers.ModelSerializer):
             instance.assignees.set(assignee_ids)
 
         return instance
-class ScrumSerializer(serializers.ModelSerializer):
+
+
+class TaskCardSerializer(serializers.ModelSerializer):
+    """Compact task shape for board columns."""
+    project_name = serializers.CharField(source='project.name', read_only=True)
+    assignees = UserMiniSerializer(many=True, read_only=True)
+
+    class Meta:
+        model = Task
+        fields = [
+            'id', 'name', 'project', 'project_name', 'status', 'priority',
+            'label', 'due_date', 'assignees',
+        ]
+        read_only_fields = fields
+
+
+class TaskBulkUpdateSerializer(serializers.Serializer):
+    """
+    Input for TaskViewSet.bulk: field changes and assignee edits applied to
+    every task in ``ids``. ``assignee_ids`` replaces the assignees outright
+    and cannot be combined with ``add_assignee_ids``/``remove_assignee_ids``.
+    """
+    MAX_TASKS = 500
+    UPDATABLE_FIELDS = ('status', 'priority', 'due_date')
+
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1), allow_empty=False, max_length=MAX_TASKS
+    )
+    status = serializers.ChoiceField(choices=TaskStatus.choices, required=False)
+    priority = serializers.ChoiceField(choices=TaskPriority.choices, required=False)
+    due_date = serializers.DateField(required=False, allow_null=True)
+    assignee_ids = serializers.ListField(child=serializers.IntegerField(min_value=1), required=False)
+    add_assignee_ids = serializers.ListField(child=serializers.IntegerField(min_value=1), required=False)
+    remove_assignee_ids = serializers.ListField(child=serializers.IntegerField(min_value=1), required=False)
+
+    def validate(self, attrs):
+        replacing = 'assignee_ids' in attrs
+        if replacing and ('add_assignee_ids' in attrs or 'remove_assignee_ids' in attrs):
+            raise serializers.ValidationError(
+                "Use either assignee_ids or add_assignee_ids/remove_assignee_ids, not both."
+            )
+        changes = self.UPDATABLE_FIELDS + ('assignee_ids', 'add_assignee_ids', 'remove_assignee_ids')
+        if not any(name in attrs for name in changes):
+            raise serializers.ValidationError("Nothing to update.")
+
+        attrs['ids'] = sorted(set(attrs['ids']))
+        user_ids = set()
+        for name in ('assignee_ids', 'add_assignee_ids', 'remove_assignee_ids'):
+            if name in attrs:
+                attrs[name] = set(attrs[name])
+                user_ids |= attrs[name]
+        if user_ids:
+            known = set(CustomUser.objects.filter(id__in=user_ids).values_list('id', flat=True))
+            unknown = sorted(user_ids - known)
+            if unknown:
+                raise serializers.ValidationError(
+                    {'assignee_ids': f"Unknown users: {', '.join(map(str, unknown))}"}
+                )
+        return attrs
+
+
+class ScrumSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     task_name = serializers.CharField(source='task.name', read_only=True)
     project_name = serializers.CharField(source='task.project.name', read_only=True, allow_null=True)
     project = serializers.PrimaryKeyRelatedField(source='task.project', read_only=True)
     
-    employee = ProfileSerializer(read_only=True, allow_null=True)
+    employee = UserMiniSerializer(read_only=True, allow_null=True)
     employee_id = serializers.PrimaryKeyRelatedField(
         queryset=CustomUser.objects.all(),
         source='employee',
@@ -467,7 +546,7 @@ class ScrumSerializer(serializers.ModelSerializer):
         default="Unassigned"
     )
     
-    created_by = ProfileSerializer(read_only=True, allow_null=True)
+    created_by = UserMiniSerializer(read_only=True, allow_null=True)
     
     # Do NOT redefine morning_display / evening_display as fields
     # They are already @property in model → just list them in fields
@@ -515,6 +594,12 @@ class ScrumSerializer(serializers.ModelSerializer):
             'project_name',
             'employee_name',
         ]
+        # Full profiles only with ?expand=employee,created_by
+        expandable_fields = {
+            'employee': lambda: ProfileSerializer(read_only=True, allow_null=True),
+            'created_by': lambda: ProfileSerializer(read_only=True, allow_null=True),
+        }
+        detail_expand = []
 
     def create(self, validated_data):
         request = self.context.get('request')
@@ -542,6 +627,27 @@ class ScrumSerializer(serializers.ModelSerializer):
         return super().update(instance, validated_data)
 
 
+class ScrumBulkEntrySerializer(serializers.Serializer):
+    task = serializers.IntegerField(min_value=1)
+    morning_memo = serializers.CharField(required=False, allow_blank=True, allow_null=True)
+    evening_memo = serializers.CharField(required=False, allow_blank=True, allow_null=True)
+    reported_status = serializers.ChoiceField(choices=TaskStatus.choices, required=False)
+
+
+class ScrumBulkSubmitSerializer(serializers.Serializer):
+    """Input for ScrumViewSet.bulk_submit: one entry per task for a single day."""
+    MAX_ENTRIES = 200
+
+    date = serializers.DateField(required=False)
+    entries = ScrumBulkEntrySerializer(many=True, allow_empty=False, max_length=MAX_ENTRIES)
+
+    def validate_entries(self, entries):
+        tasks = [entry['task'] for entry in entries]
+        if len(tasks) != len(set(tasks)):
+            raise serializers.ValidationError("Each task may appear only once.")
+        return entries
+
+
 class ContractTypeSerializer(serializers.ModelSerializer):
     class Meta:
         model = ContractType
@@ -556,6 +662,8 @@ class ContractSerializer(serializers.ModelSerializer):
         queryset=Client.objects.all(), source='client')
     contract_type_id = serializers.PrimaryKeyRelatedField(
         queryset=ContractType.objects.all(), source='contract_type', required=False, allow_null=True)
+    company_logo = MediaImageField(required=False, allow_null=True)
+    company_logo_thumb_url = serializers.SerializerMethodField()
 
     class Meta:
         model = Contract
@@ -564,7 +672,10 @@ class ContractSerializer(serializers.ModelSerializer):
             'amount', 'no_value', 'contract_type_id', 'contract_type_name',
             'start_date', 'end_date', 'no_end_date', 'contract_name',
             'alternate_address', 'city', 'state', 'country', 'postal_code',
-            'cell', 'office_phone_number', 'notes', 'company_logo',
+            'cell', 'office_phone_number', 'notes', 'company_logo', 'company_logo_thumb_url',
             'created_at', 'updated_at'
         ]
-        read_only_fields = ['id', 'created_at', 'updated_at']
\ No newline at end of file
+        read_only_fields = ['id', 'created_at', 'updated_at']
+
+    def get_company_logo_thumb_url(self, obj):
+        return thumbnail_url(obj.company_logo, request=self.context.get('request'))
\ No newline at end of file
@@ -0,0 +1,93 @@
+"""
+Daily project snapshots for burn charts.
+
+``take_snapshots`` records one ProjectSnapshot per active project in three
+queries whatever the number of projects: cumulative hours and cost joined
+from the hr ProjectCostTotal ledger row, task counts per status from one
+grouped aggregate, and a single upsert. Running it again on the same day
+overwrites that day's rows.
+"""
+import datetime
+
+from django.db import connection
+from django.db.models import Count, Q
+
+from .models import Project, ProjectSnapshot, Task, TaskStatus
+
+TASK_COUNTS = {
+    'tasks_todo': TaskStatus.TODO,
+    'tasks_in_progress': TaskStatus.IN_PROGRESS,
+    'tasks_review': TaskStatus.REVIEW,
+    'tasks_done': TaskStatus.DONE,
+}
+SNAPSHOT_FIELDS = ['duration_seconds', 'cost', 'hours_allocated', *TASK_COUNTS]
+
+
+def take_snapshots(date=None, batch_size=1000):
+    """Snapshot every active project as of now under ``date`` (default today). Returns the count."""
+    date = date or datetime.date.today()
+    projects = (
+        Project.objects.filter(is_active=True)
+        .order_by('pk')
+        .values_list('pk', 'hours_allocated', 'cost_total__duration_seconds', 'cost_total__cost')
+    )
+    task_counts = {
+        row.pop('project_id'): row
+        for row in (
+            Task.objects.filter(project__is_active=True)
+            .exclude(is_active=False)
+            .order_by()
+            .values('project_id')
+            .annotate(**{
+                name: Count('pk', filter=Q(status=status))
+                for name, status in TASK_COUNTS.items()
+            })
+        )
+    }
+    snapshots = [
+        ProjectSnapshot(
+            project_id=pk,
+            date=date,
+            duration_seconds=seconds or 0,
+            cost=cost or 0,
+            hours_allocated=hours_allocated,
+            **task_counts.get(pk, {}),
+        )
+        for pk, hours_allocated, seconds, cost in projects
+    ]
+    ProjectSnapshot.objects.bulk_create(
+        snapshots,
+        batch_size=batch_size,
+        update_conflicts=True,
+        # MySQL upserts on any unique key and rejects an explicit target
+        unique_fields=(
+            ['project', 'date'] if connection.features.supports_update_conflicts_with_target else None
+        ),
+        update_fields=SNAPSHOT_FIELDS,
+    )
+    return len(snapshots)
+
+
+def snapshot_series(project, date_from, date_to):
+    """The project's snapshots between two dates (inclusive), oldest first."""
+    rows = (
+        ProjectSnapshot.objects
+        .filter(project=project, date__range=(date_from, date_to))
+        .order_by('date')
+        .values('date', *SNAPSHOT_FIELDS)
+    )
+    series = []
+    for row in rows:
+        hours = round(row.pop('duration_seconds') / 3600, 2)
+        allocated = float(row['hours_allocated'] or 0)
+        series.append({
+            'date': row['date'],
+            'hours': hours,
+            'cost': round(float(row['cost']), 2),
+            'hours_allocated': allocated,
+            'progress_percentage': round(hours / allocated * 100, 2) if allocated else 0,
+            'tasks': {
+                status.value: row[name] for name, status in TASK_COUNTS.items()
+            },
+        })
+    return series
@@ -0,0 +1,229 @@
+"""
+Chunked, resumable project file uploads.
+
+Chunks are streamed from the request straight to storage while being
+hashed, so neither a chunk nor the assembled file is ever held in memory.
+Completed files are stored under their SHA-256 (``project_files/sha256/``),
+and a file whose content is already stored reuses the existing object. The
+hash is only trusted once the server has received and hashed every byte, so
+a known hash alone never grants access to stored content.
+"""
+import hashlib
+import os
+import shutil
+import tempfile
+
+from django.conf import settings
+from django.core.files import File
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.utils import timezone
+
+from .models import ProjectFile, UploadChunk, UploadSession
+
+COPY_BUFFER = 1024 * 1024
+MIN_CHUNK_SIZE = 256 * 1024
+MAX_CHUNK_SIZE = 64 * 1024 * 1024
+
+
+class UploadError(Exception):
+    """Raised for client errors; the view turns it into a 400."""
+
+
+def content_name(sha256, original_name):
+    extension = os.path.splitext(original_name)[1].lower()[:16]
+    return f'project_files/sha256/{sha256[:2]}/{sha256[2:4]}/{sha256}{extension}'
+
+
+def find_stored_content(sha256):
+    """Storage name of already-stored content with this hash, if any."""
+    if not sha256:
+        return None
+    name = (
+        ProjectFile.objects.filter(sha256=sha256).values_list('file', flat=True).first()
+        or UploadSession.objects.filter(sha256=sha256, status=UploadSession.STATUS_COMPLETE)
+        .exclude(file='').values_list('file', flat=True).first()
+    )
+    return name if name and default_storage.exists(name) else None
+
+
+def start_session(user, original_name, total_size, sha256='', chunk_size=None):
+    if total_size < 1:
+        raise UploadError("size must be at least one byte.")
+    if total_size > settings.PROJECT_UPLOAD_MAX_SIZE:
+        raise UploadError(f"size exceeds the {settings.PROJECT_UPLOAD_MAX_SIZE} byte limit.")
+    chunk_size = chunk_size or settings.PROJECT_UPLOAD_CHUNK_SIZE
+    if not MIN_CHUNK_SIZE <= chunk_size <= MAX_CHUNK_SIZE:
+        raise UploadError(f"chunk_size must be between {MIN_CHUNK_SIZE} and {MAX_CHUNK_SIZE} bytes.")
+
+    session = UploadSession(
+        created_by=user,
+        original_name=os.path.basename(original_name)[:255],
+        total_size=total_size,
+        chunk_size=chunk_size,
+        sha256=(sha256 or '').lower(),
+    )
+    session.save()
+    return session
+
+
+def expected_chunk_size(session, index):
+    if index >= session.total_chunks:
+        raise UploadError(f"chunk index must be below {session.total_chunks}.")
+    if index == session.total_chunks - 1:
+        return session.total_size - session.chunk_size * index
+    return session.chunk_size
+
+
+def store_chunk(session, index, stream, sha256):
+    """
+    Stream one chunk from ``stream`` to storage, verifying its size and
+    SHA-256. Re-sending a chunk replaces it, which is what makes uploads
+    resumable.
+    """
+    if session.status != UploadSession.STATUS_OPEN:
+        raise UploadError("This upload is already complete.")
+    expected_size = expected_chunk_size(session, index)
+    digest = hashlib.sha256()
+    size = 0
+    with tempfile.TemporaryFile() as buffer:
+        while True:
+            block = stream.read(min(COPY_BUFFER, expected_size + 1 - size))
+            if not block:
+                break
+            size += len(block)
+            if size > expected_size:
+                raise UploadError(f"Chunk {index} must be {expected_size} bytes.")
+            digest.update(block)
+            buffer.write(block)
+        if size != expected_size:
+            raise UploadError(f"Chunk {index} must be {expected_size} bytes, got {size}.")
+        if digest.hexdigest() != (sha256 or '').lower():
+            raise UploadError(f"Checksum mismatch for chunk {index}.")
+
+        buffer.seek(0)
+        name = default_storage.save(f'uploads/{session.pk}/{index}', File(buffer))
+
+    with transaction.atomic():
+        # Serializes with complete_session, which may have finished meanwhile
+        locked = UploadSession.objects.select_for_update().get(pk=session.pk)
+        if locked.status != UploadSession.STATUS_OPEN:
+            default_storage.delete(name)
+            raise UploadError("This upload is already complete.")
+        previous = UploadChunk.objects.select_for_update().filter(session=session, index=index).first()
+        if previous:
+            default_storage.delete(previous.file.name)
+            previous.delete()
+        chunk = UploadChunk.objects.create(
+            session=session, index=index, size=size, sha256=digest.hexdigest(), file=name
+        )
+        UploadSession.objects.filter(pk=session.pk).update(updated_at=timezone.now())
+    return chunk
+
+
+def missing_chunks(session, received=None):
+    if received is None:
+        received = set(session.chunks.values_list('index', flat=True))
+    return [index for index in range(session.total_chunks) if index not in received]
+
+
+def complete_session(session):
+    """
+    Assemble the chunks into content-addressed storage and discard them.
+    The chunks are read and hashed before the session row is locked, so the
+    lock only covers the status update. Returns the refreshed session.
+    """
+    session = UploadSession.objects.get(pk=session.pk)
+    if session.status == UploadSession.STATUS_COMPLETE:
+        return session
+    chunks = list(session.chunks.all())
+    missing = missing_chunks(session, {chunk.index for chunk in chunks})
+    if missing:
+        raise UploadError(f"Missing chunks: {', '.join(map(str, missing[:50]))}")
+
+    digest = hashlib.sha256()
+    with tempfile.TemporaryFile() as assembled:
+        for chunk in chunks:
+            try:
+                part = default_storage.open(chunk.file.name, 'rb')
+            except FileNotFoundError:
+                raise UploadError(f"Chunk {chunk.index} was replaced during completion; complete again.")
+            with part:
+                while True:
+                    block = part.read(COPY_BUFFER)
+                    if not block:
+                        break
+                    digest.update(block)
+                    assembled.write(block)
+        sha256 = digest.hexdigest()
+        if session.sha256 and session.sha256 != sha256:
+            raise UploadError("Checksum mismatch for the assembled file.")
+
+        name = find_stored_content(sha256)
+        saved = name is None
+        if saved:
+            assembled.seek(0)
+            name = default_storage.save(content_name(sha256, session.original_name), File(assembled))
+
+    with transaction.atomic():
+        session = UploadSession.objects.select_for_update().get(pk=session.pk)
+        if session.status == UploadSession.STATUS_COMPLETE:
+            # A concurrent request completed it first; drop our copy.
+            if saved and name != session.file.name:
+                default_storage.delete(name)
+            return session
+        if set(session.chunks.values_list('pk', flat=True)) != {chunk.pk for chunk in chunks}:
+            # A chunk was re-sent while the file was being assembled
+            if saved:
+                default_storage.delete(name)
+            raise UploadError("Chunks changed during completion; complete again.")
+        session.sha256 = sha256
+        session.file.name = name
+        session.status = UploadSession.STATUS_COMPLETE
+        session.completed_at = timezone.now()
+        session.save(update_fields=['sha256', 'file', 'status', 'completed_at', 'updated_at'])
+    discard_chunks(session)
+    return session
+
+
+def discard_chunks(session):
+    for name in session.chunks.values_list('file', flat=True):
+        default_storage.delete(name)
+    session.chunks.all().delete()
+    try:
+        directory = default_storage.path(f'uploads/{session.pk}')
+    except NotImplementedError:
+        return
+    shutil.rmtree(directory, ignore_errors=True)
+
+
+@transaction.atomic
+def attach_to_project(project, sessions, user):
+    return [
+        ProjectFile.objects.create(
+            project=project,
+            file=session.file.name,
+            original_name=session.original_name,
+            file_size=session.total_size,
+            sha256=session.sha256,
+            uploaded_by=user,
+        )
+        for session in sessions
+    ]
+
+
+def purge_sessions(older_than):
+    """
+    Delete sessions last touched before ``older_than``, with their chunks and
+    any assembled content no project file refers to. Returns the count.
+    """
+    count = 0
+    for session in UploadSession.objects.filter(updated_at__lt=older_than).iterator():
+        discard_chunks(session)
+        name = session.file.name
+        if name and not ProjectFile.objects.filter(file=name).exists() \
+                and not UploadSession.objects.filter(file=name).exclude(pk=session.pk).exists():
+            default_storage.delete(name)
+        session.delete()
+        count += 1
+    return count
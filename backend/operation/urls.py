@@ -12,6 +12,8 @@ from .views import (
     ScrumViewSet,
     ContractTypeViewSet,
     ContractViewSet,
+    ReferenceDataView,
+    UploadSessionViewSet,
 )
 
 router = DefaultRouter()
@@ -25,7 +27,9 @@ router.register(r'tasks', TaskViewSet, basename='task')
 router.register(r'scrum', ScrumViewSet, basename='scrum')
 router.register(r'contract-types', ContractTypeViewSet, basename='contract-type')
 router.register(r'contracts', ContractViewSet, basename='contract')
+router.register(r'uploads', UploadSessionViewSet, basename='upload')
 urlpatterns = [
+    path('reference-data/', ReferenceDataView.as_view(), name='reference-data'),
     path('', include(router.urls)),
 ]
 
@@ -1,31 +1,51 @@
 from rest_framework import viewsets, status, filters
 from rest_framework.decorators import action
 from rest_framework.response import Response
+from rest_framework.views import APIView
 from rest_framework.permissions import IsAuthenticated
 from authapp.permissions import HasPermission
+from authapp.models import CustomUser
 from django_filters.rest_framework import DjangoFilterBackend
-from django.db.models import Q
+from django.db import transaction
+from django.db.models import Q, Prefetch, Count
+from django.core.cache import cache
+from urllib.parse import urlencode
 import datetime
-import csv
-from django.http import HttpResponse
-from openpyxl import Workbook
+import uuid
 from reportlab.lib.pagesizes import letter, landscape
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph
-from reportlab.lib.styles import getSampleStyleSheet
-from reportlab.lib import colors
 from django.utils import timezone
 from .models import Scrum
+from .financials import annotate_financials
+from .fieldsets import SparseFieldsetViewMixin
+from .caching import (
+    ASSIGNMENTS_NAMESPACE, PROJECTS_NAMESPACE, bump_client_versions, bump_version, get_version, versioned_key,
+)
+from .reference_data import NAMESPACE as REFERENCE_DATA_NAMESPACE, get_reference_data
+from .search import FullTextSearchFilter, reindex_objects
+from . import board as task_board
+from . import portfolio as project_portfolio
+from .snapshots import snapshot_series
+from . import compliance
+from . import uploads
+from .access import accessible_project_ids, assigned_task_ids, report_project_ids
+from notifications.fanout import notify_overdue, notify_task_assigned
+from reports.exports import Column, ExportMixin, export_response, label
 from .models import (
+    REQUIRED_PROJECT_STATUSES,
     Project,
+    ProjectAccessReason,
     ProjectCategory,
     ProjectStatus,
     ProjectStage,
     Client,
     Currency,
     Task,
+    TaskPriority,
+    TaskStatus,
     Scrum,
     ContractType,
     Contract,
+    UploadSession,
 )
 from .serializers import (
     ProjectSerializer,
@@ -35,9 +55,15 @@ from .serializers import (
     ClientSerializer,
     CurrencySerializer,
     TaskSerializer,
+    TaskBulkUpdateSerializer,
+    TaskCardSerializer,
     ScrumSerializer,
+    ScrumBulkSubmitSerializer,
     ContractTypeSerializer,
     ContractSerializer,
+    ProjectFileSerializer,
+    UploadSessionSerializer,
+    UploadSessionCreateSerializer,
 )
 
 
@@ -79,18 +105,8 @@ class ProjectStatusViewSet(viewsets.ModelViewSet):
     filterset_fields = ["name"]
 
     def get_queryset(self):
-        required_statuses = [
-            "To be Started",
-            "In Progress",
-            "On Hold",
-            "Completed",
-            "Cancelled"
-        ]
-        # Ensure they exist
-        for status_name in required_statuses:
-            ProjectStatus.objects.get_or_create(name=status_name)
-        
-        return ProjectStatus.objects.filter(name__in=required_statuses).order_by('id')
+        # Required statuses are seeded by migration, never created on read
+        return ProjectStatus.objects.filter(name__in=REQUIRED_PROJECT_STATUSES).order_by('id')
 
 
 class ProjectStageViewSet(viewsets.ModelViewSet):
@@ -146,7 +162,26 @@ class CurrencyViewSet(viewsets.ModelViewSet):
     search_fields = ["code", "name"]
 
 
-class ProjectViewSet(viewsets.ModelViewSet):
+DASHBOARD_STATS_TTL = 60
+
+
+def user_queryset(expanded=False):
+    """
+    Users as nested in project/task/scrum payloads: the few columns
+    UserMiniSerializer reads, or everything ProfileSerializer walks when
+    the relation is expanded.
+    """
+    if expanded:
+        return CustomUser.objects.select_related(
+            "role", "department", "designation", "reports_to"
+        ).prefetch_related(
+            "role__permissions", "direct_permissions",
+            "reports_to__role__permissions", "reports_to__direct_permissions",
+        )
+    return CustomUser.objects.only("id", "name", "username", "email", "image")
+
+
+class ProjectViewSet(SparseFieldsetViewMixin, viewsets.ModelViewSet):
     """
     ViewSet for Project CRUD operations with advanced filtering
     """
@@ -158,8 +193,8 @@ class ProjectViewSet(viewsets.ModelViewSet):
     page_names = ['projects', 'lead_projects', 'employee_projects']
     filter_backends = [
         DjangoFilterBackend,
-        filters.SearchFilter,
         filters.OrderingFilter,
+        FullTextSearchFilter,
     ]
     search_fields = [
         "name",
@@ -200,17 +235,17 @@ class ProjectViewSet(viewsets.ModelViewSet):
         user = self.request.user
 
         if self.request.query_params.get("employee_scope"):
-            queryset = queryset.filter(members=user).distinct()
+            queryset = queryset.filter(
+                pk__in=accessible_project_ids(user, reasons=[ProjectAccessReason.MEMBER])
+            )
         elif not user.is_superuser and not user.is_staff and not (user.role and user.role.name == 'HR'):
-            query = Q(members=user)
-            if user.department:
-                query |= Q(involved_departments=user.department)
-            
+            query = Q(pk__in=accessible_project_ids(user))
+
             # Lead visibility: projects of direct reports
             if 'lead_scope' in self.request.query_params:
-                query |= Q(members__reports_to=user)
+                query |= Q(pk__in=report_project_ids(user))
 
-            queryset = queryset.filter(query).distinct()
+            queryset = queryset.filter(query)
 
         project_name = self.request.query_params.get("project_name", None)
         if project_name:
@@ -257,6 +292,33 @@ class ProjectViewSet(viewsets.ModelViewSet):
             elif is_active_param.lower() == "false":
                 queryset = queryset.filter(is_active=False)
 
+        if self.action not in ("dashboard_stats", "portfolio", "snapshots"):
+            queryset = self.optimize_for_fieldset(queryset)
+
+        return queryset
+
+    def optimize_for_fieldset(self, queryset):
+        """
+        Join and prefetch only what the requested ?fields= / ?expand= shape
+        renders.
+        """
+        related = [
+            name for name in ("category", "status", "stage", "client", "currency")
+            if self.fieldset_includes(name)
+        ]
+        if related:
+            queryset = queryset.select_related(*related)
+        if self.fieldset_includes("involved_departments", "involved_departments_ids"):
+            queryset = queryset.prefetch_related("involved_departments")
+        if self.fieldset_includes("project_files"):
+            queryset = queryset.prefetch_related("project_files")
+        if self.fieldset_includes("members"):
+            members = user_queryset(expanded=self.fieldset_expands("members"))
+            queryset = queryset.prefetch_related(Prefetch("members", queryset=members))
+        if self.fieldset_includes("total_hours_spent", "total_actual_cost", "profit_loss", "progress_percentage"):
+            # Hours and cost are read from the hr cost ledger, one row
+            # per project, instead of per-row session loops.
+            queryset = annotate_financials(queryset)
         return queryset
 
     def perform_create(self, serializer):
@@ -275,6 +337,37 @@ class ProjectViewSet(viewsets.ModelViewSet):
         """
         return super().destroy(request, *args, **kwargs)
 
+    @action(detail=True, methods=["post"])
+    def attach_files(self, request, pk=None):
+        """
+        Attach completed chunked uploads (``upload_ids``) to the project.
+        """
+        project = self.get_object()
+        upload_ids = request.data.get("upload_ids") or []
+        if not isinstance(upload_ids, list) or not upload_ids:
+            return Response({"upload_ids": "A non-empty list is required."}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            upload_ids = [str(uuid.UUID(str(value))) for value in upload_ids]
+        except ValueError:
+            return Response({"upload_ids": "Invalid upload id."}, status=status.HTTP_400_BAD_REQUEST)
+
+        sessions = {
+            str(session.pk): session
+            for session in UploadSession.objects.filter(
+                pk__in=upload_ids, created_by=request.user, status=UploadSession.STATUS_COMPLETE
+            )
+        }
+        missing = [value for value in upload_ids if value not in sessions]
+        if missing:
+            return Response(
+                {"upload_ids": f"Not completed uploads of yours: {', '.join(missing)}"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        files = uploads.attach_to_project(project, [sessions[value] for value in upload_ids], request.user)
+        return Response(ProjectFileSerializer(files, many=True, context=self.get_serializer_context()).data,
+                        status=status.HTTP_201_CREATED)
+
     @action(detail=True, methods=["post"])
     def archive(self, request, pk=None):
         """
@@ -409,56 +502,133 @@ class ProjectViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=["get"])
     def dashboard_stats(self, request):
         """
-        Get dashboard statistics for projects
-        """
-        total_projects = self.get_queryset().count()
-        active_projects = self.get_queryset().filter(is_active=True).count()
-        inactive_projects = self.get_queryset().filter(is_active=False).count()
+        Get dashboard statistics for projects.
 
+        Counts come from one conditional aggregate and the status/stage
+        breakdowns from one grouped query, both over the caller's visible
+        projects. Results are cached per visibility key for a minute and
+        invalidated whenever a project or its membership changes.
+        """
         today = datetime.date.today()
-        overdue_projects = (
-            self.get_queryset()
-            .filter(deadline__lt=today, is_active=True, no_deadline=False)
-            .count()
+        key = versioned_key(
+            PROJECTS_NAMESPACE, "dashboard_stats", today.isoformat(),
+            self._visibility_key(), urlencode(sorted(request.query_params.items())),
+        )
+        stats = cache.get(key)
+        if stats is not None:
+            return Response(stats)
+
+        visible = Project.objects.filter(pk__in=self.get_queryset().order_by().values("pk"))
+        active = Q(is_active=True, no_deadline=False)
+        counts = visible.aggregate(
+            total_projects=Count("pk"),
+            active_projects=Count("pk", filter=Q(is_active=True)),
+            inactive_projects=Count("pk", filter=Q(is_active=False)),
+            overdue_projects=Count("pk", filter=active & Q(deadline__lt=today)),
+            upcoming_deadlines=Count(
+                "pk", filter=active & Q(deadline__range=[today, today + datetime.timedelta(days=7)])
+            ),
         )
 
-        upcoming_deadlines = (
-            self.get_queryset()
-            .filter(
-                deadline__range=[today, today + datetime.timedelta(days=7)],
-                is_active=True,
-                no_deadline=False,
-            )
-            .count()
+        by_status, by_stage = {}, {}
+        breakdown = (
+            visible.order_by()
+            .values("status__name", "stage__name")
+            .annotate(count=Count("pk"))
+            .order_by("status__name", "stage__name")
         )
+        for row in breakdown:
+            if row["status__name"] is not None:
+                by_status[row["status__name"]] = by_status.get(row["status__name"], 0) + row["count"]
+            if row["stage__name"] is not None:
+                by_stage[row["stage__name"]] = by_stage.get(row["stage__name"], 0) + row["count"]
+
+        stats = {
+            **counts,
+            "projects_by_status": [{"status__name": name, "count": count} for name, count in sorted(by_status.items())],
+            "projects_by_stage": [{"stage__name": name, "count": count} for name, count in sorted(by_stage.items())],
+        }
+        cache.set(key, stats, timeout=DASHBOARD_STATS_TTL)
+        return Response(stats)
+
+    @action(detail=True, methods=["get"])
+    def snapshots(self, request, pk=None):
+        """
+        Daily snapshots of the project's hours, cost and task counts between
+        ``date_from`` and ``date_to`` (YYYY-MM-DD, default: the last 90 days).
+        """
+        project = self.get_object()
+        today = datetime.date.today()
+        try:
+            date_to = datetime.date.fromisoformat(request.query_params.get("date_to") or today.isoformat())
+            date_from = datetime.date.fromisoformat(
+                request.query_params.get("date_from") or (date_to - datetime.timedelta(days=90)).isoformat()
+            )
+        except ValueError:
+            return Response(
+                {"error": "date_from and date_to must be YYYY-MM-DD"}, status=status.HTTP_400_BAD_REQUEST
+            )
+        if date_from > date_to:
+            return Response({"error": "date_from must not be after date_to"}, status=status.HTTP_400_BAD_REQUEST)
 
-        from django.db.models import Count
+        return Response({
+            "project": project.pk,
+            "date_from": date_from,
+            "date_to": date_to,
+            "snapshots": snapshot_series(project, date_from, date_to),
+        })
 
-        projects_by_status = (
-            self.get_queryset()
-            .filter(status__isnull=False)
-            .values("status__name")
-            .annotate(count=Count("id"))
-        )
+    @action(detail=False, methods=["get"])
+    def portfolio(self, request):
+        """
+        Portfolio P&L over the filtered project list: budget, currency,
+        hours, cost, margin and burn per project from one ledger query, with
+        totals per currency. ``?month=YYYY-MM`` reports as of a past month
+        (cached once the month is closed), ``?group_by=`` one of client,
+        category, status or tenor adds per-group totals, and
+        ``?export=csv|xlsx`` downloads the grouped (or per-project) table.
+        """
+        params = request.query_params
+        try:
+            month = project_portfolio.parse_month(params.get("month"))
+        except ValueError:
+            return Response({"error": "month must be YYYY-MM"}, status=status.HTTP_400_BAD_REQUEST)
+        group_by = params.get("group_by") or None
+        if group_by is not None and group_by not in project_portfolio.GROUPS:
+            return Response(
+                {"error": f"group_by must be one of: {', '.join(project_portfolio.GROUPS)}"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        export = params.get("export")
+        if export is not None and export not in ("csv", "xlsx"):
+            return Response({"error": "export must be csv or xlsx"}, status=status.HTTP_400_BAD_REQUEST)
 
-        projects_by_stage = (
-            self.get_queryset()
-            .filter(stage__isnull=False)
-            .values("stage__name")
-            .annotate(count=Count("id"))
+        filters = sorted(
+            (name, value) for name, value in params.items()
+            if name not in ("month", "group_by", "export", "page", "page_size")
         )
-
-        return Response(
-            {
-                "total_projects": total_projects,
-                "active_projects": active_projects,
-                "inactive_projects": inactive_projects,
-                "overdue_projects": overdue_projects,
-                "upcoming_deadlines": upcoming_deadlines,
-                "projects_by_status": list(projects_by_status),
-                "projects_by_stage": list(projects_by_stage),
-            }
+        report = project_portfolio.portfolio_report(
+            self.filter_queryset(self.get_queryset()),
+            (self._visibility_key(), urlencode(filters)),
+            month=month,
+            group_by=group_by,
         )
+        if export is None:
+            return Response(report)
+
+        columns, rows = project_portfolio.export_table(report)
+        filename = f"portfolio_{report['month']}" + (f"_by_{group_by}" if group_by else "")
+        return export_response(export, filename, f"Portfolio {report['month']}", columns, rows)
+
+    def _visibility_key(self):
+        """Identifies which projects get_queryset() can return for this request."""
+        user = self.request.user
+        if self.request.query_params.get("employee_scope"):
+            return f"member:{user.pk}"
+        if user.is_superuser or user.is_staff or (user.role and user.role.name == 'HR'):
+            return "all"
+        lead = "lead" if "lead_scope" in self.request.query_params else "self"
+        return f"user:{user.pk}:{user.department_id}:{lead}"
 
     @action(detail=False, methods=["get"])
     def my_projects(self, request):
@@ -481,18 +651,17 @@ class ProjectViewSet(viewsets.ModelViewSet):
         return Response(serializer.data)
 
 
-class TaskViewSet(viewsets.ModelViewSet):
+class TaskViewSet(ExportMixin, SparseFieldsetViewMixin, viewsets.ModelViewSet):
     """
     ViewSet for Task CRUD operations
     """
-    queryset = Task.objects.all().select_related(
-        'project').prefetch_related('assignees')
+    queryset = Task.objects.all().select_related('project')
     serializer_class = TaskSerializer
     permission_classes = [HasPermission]
     page_names = ['tasks', 'lead_tasks', 'employee_tasks']
     filter_backends = [DjangoFilterBackend,
-                       filters.SearchFilter, filters.OrderingFilter]
-    search_fields = ['title', 'description', 'project__name']
+                       filters.OrderingFilter, FullTextSearchFilter]
+    search_fields = ['name', 'description', 'project__name']
     filterset_fields = {
         'project': ['exact'],
         'status': ['exact', 'in'],
@@ -506,6 +675,20 @@ class TaskViewSet(viewsets.ModelViewSet):
     ordering_fields = ['title', 'due_date',
                        'priority', 'created_at', 'start_date']
     ordering = ['due_date', 'priority']
+    export_columns = [
+        Column('ID', 'id'),
+        Column('Task', 'name', width=3),
+        Column('Project', 'project__name', width=2),
+        Column('Status', 'status', render=label(TaskStatus.choices)),
+        Column('Priority', 'priority', render=label(TaskPriority.choices)),
+        Column('Start Date', 'start_date'),
+        Column('Due Date', 'due_date'),
+        Column('Allocated Hours', 'allocated_hours'),
+        Column('Assignees', 'assignees__name', many=True, width=3),
+        Column('Active', 'is_active'),
+    ]
+    export_filename = 'tasks'
+    export_pagesize = landscape(letter)
 
     def destroy(self, request, *args, **kwargs):
         """
@@ -526,6 +709,115 @@ class TaskViewSet(viewsets.ModelViewSet):
         instance.save()
         return Response({'status': 'restored'})
 
+    @action(detail=False, methods=['patch'])
+    def bulk(self, request):
+        """
+        Apply status/priority/due-date changes and assignee edits to many
+        tasks at once. Runs a fixed number of queries regardless of how many
+        tasks are touched; per-task save signals are replaced by one cache
+        bump and one batched notification fan-out.
+        """
+        serializer = TaskBulkUpdateSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        ids = data['ids']
+
+        visible = set(self.get_queryset().filter(pk__in=ids).values_list('pk', flat=True))
+        missing = [pk for pk in ids if pk not in visible]
+        if missing:
+            return Response(
+                {'ids': f"Tasks not found: {', '.join(map(str, missing))}"},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+
+        changes = {
+            name: data[name] for name in TaskBulkUpdateSerializer.UPDATABLE_FIELDS if name in data
+        }
+        Through = Task.assignees.through
+        added, removed = [], 0
+
+        with transaction.atomic():
+            tasks = list(Task.objects.select_related('project').filter(pk__in=ids))
+            if changes:
+                # Every task gets the same values, so a single UPDATE does
+                # what bulk_update() would with a CASE per row.
+                now = timezone.now()
+                Task.objects.filter(pk__in=ids).update(updated_at=now, **changes)
+                for task in tasks:
+                    for name, value in changes.items():
+                        setattr(task, name, value)
+                    task.updated_at = now
+
+            if 'assignee_ids' in data or 'add_assignee_ids' in data or 'remove_assignee_ids' in data:
+                existing = set(
+                    Through.objects.filter(task_id__in=ids).values_list('task_id', 'customuser_id')
+                )
+                if 'assignee_ids' in data:
+                    wanted = data['assignee_ids']
+                    to_remove = Through.objects.filter(task_id__in=ids).exclude(customuser_id__in=wanted)
+                else:
+                    wanted = data.get('add_assignee_ids', set())
+                    to_remove = Through.objects.filter(
+                        task_id__in=ids, customuser_id__in=data.get('remove_assignee_ids', set())
+                    )
+                removed, _ = to_remove.delete()
+                added = [
+                    (task_id, user_id) for task_id in ids for user_id in wanted
+                    if (task_id, user_id) not in existing
+                ]
+                Through.objects.bulk_create(
+                    [Through(task_id=task_id, customuser_id=user_id) for task_id, user_id in added]
+                )
+
+            bump_version(ASSIGNMENTS_NAMESPACE)
+            if changes:
+                bump_client_versions(task.project.client_id for task in tasks if task.project_id)
+
+            tasks_by_id = {task.id: task for task in tasks}
+            notify_task_assigned((tasks_by_id[task_id], user_id) for task_id, user_id in added)
+            notify_overdue(tasks)
+
+        return Response({
+            'updated': len(tasks),
+            'assignees_added': len(added),
+            'assignees_removed': removed,
+        })
+
+    @action(detail=False, methods=['get'])
+    def board(self, request):
+        """
+        Kanban columns: per-status counts plus the first ``limit`` tasks of
+        each column, honouring the list filters (active tasks unless
+        ``is_active`` is given). ``?column=<status>&cursor=<next_cursor>``
+        returns the next page of a single column.
+        """
+        limit = task_board.parse_limit(request.query_params.get('limit'))
+        visible = self.filter_queryset(self.get_queryset())
+        if 'is_active' not in request.query_params:
+            visible = visible.filter(is_active=True)
+        tasks = Task.objects.filter(pk__in=visible.values('pk')).select_related('project').prefetch_related(
+            Prefetch('assignees', queryset=user_queryset())
+        )
+
+        column = request.query_params.get('column')
+        if column is not None and column not in TaskStatus.values:
+            return Response({'column': f'Unknown status "{column}".'}, status=status.HTTP_400_BAD_REQUEST)
+        statuses = [column] if column else TaskStatus.values
+
+        counts = task_board.status_counts(tasks.filter(status__in=statuses))
+        if column:
+            pages = {column: task_board.column_page(tasks, column, limit, request.query_params.get('cursor'))}
+        else:
+            pages = task_board.first_pages(tasks, statuses, limit)
+
+        context = self.get_serializer_context()
+        serialize = lambda page: TaskCardSerializer(page, many=True, context=context).data
+        return Response({
+            'columns': [
+                task_board.build_column(value, counts.get(value, 0), pages[value], limit, serialize)
+                for value in statuses
+            ],
+        })
 
     def get_queryset(self):
         """
@@ -535,26 +827,30 @@ class TaskViewSet(viewsets.ModelViewSet):
         user = self.request.user
 
         if self.request.query_params.get('employee_scope'):
-            queryset = queryset.filter(assignees=user).distinct()
+            queryset = queryset.filter(pk__in=assigned_task_ids(user=user))
         elif not user.is_superuser and not user.is_staff:
-            query = Q(project__members=user) | Q(project__involved_departments=user.department) | Q(assignees=user)
-            
+            query = Q(project_id__in=accessible_project_ids(user)) | Q(pk__in=assigned_task_ids(user=user))
+
             # Lead visibility: tasks of direct reports
             if 'lead_scope' in self.request.query_params:
-                query |= Q(assignees__reports_to=user)
-            
-            queryset = queryset.filter(query).distinct()
+                query |= Q(pk__in=assigned_task_ids(lead=user))
+
+            queryset = queryset.filter(query)
 
         project_id = self.request.query_params.get('project_id')
         if project_id:
             queryset = queryset.filter(project_id=project_id)
 
+        if self.fieldset_includes('assignees'):
+            assignees = user_queryset(expanded=self.fieldset_expands('assignees'))
+            queryset = queryset.prefetch_related(Prefetch('assignees', queryset=assignees))
+
         return queryset
-class ScrumViewSet(viewsets.ModelViewSet):
+
+
+class ScrumViewSet(SparseFieldsetViewMixin, viewsets.ModelViewSet):
   
-    queryset = Scrum.objects.select_related(
-        'task', 'task__project', 'employee', 'created_by'
-    ).prefetch_related('task__assignees')
+    queryset = Scrum.objects.select_related('task', 'task__project')
     
     serializer_class = ScrumSerializer
     permission_classes = [HasPermission]
@@ -562,8 +858,8 @@ class ScrumViewSet(viewsets.ModelViewSet):
     
     filter_backends = [
         DjangoFilterBackend,
-        filters.SearchFilter,
         filters.OrderingFilter,
+        FullTextSearchFilter,
     ]
     
     search_fields = [
@@ -594,11 +890,10 @@ class ScrumViewSet(viewsets.ModelViewSet):
         user = self.request.user
         
         if self.request.query_params.get('employee_scope'):
-            queryset = queryset.filter(employee=user).distinct()
+            queryset = queryset.filter(employee=user)
         elif not user.is_superuser and not user.is_staff:
-            query = Q(task__project__members=user) | \
-                    Q(task__project__involved_departments=user.department) | \
-                    Q(task__assignees=user) | \
+            query = Q(task__project_id__in=accessible_project_ids(user)) | \
+                    Q(task_id__in=assigned_task_ids(user=user)) | \
                     Q(employee=user) | \
                     Q(created_by=user)
             
@@ -606,7 +901,7 @@ class ScrumViewSet(viewsets.ModelViewSet):
             if 'lead_scope' in self.request.query_params:
                 query |= Q(employee__reports_to=user)
                 
-            queryset = queryset.filter(query).distinct()
+            queryset = queryset.filter(query)
 
         task_id = self.request.query_params.get('task')
         if task_id:
@@ -620,11 +915,140 @@ class ScrumViewSet(viewsets.ModelViewSet):
         if employee_id:
             queryset = queryset.filter(employee_id=employee_id)
 
+        # Compact authors ride along in the join; full profiles (with
+        # their role/permission trees) are prefetched only on ?expand=.
+        for name in ('employee', 'created_by'):
+            if not self.fieldset_includes(name, f'{name}_name'):
+                continue
+            if self.fieldset_expands(name):
+                queryset = queryset.prefetch_related(
+                    Prefetch(name, queryset=user_queryset(expanded=True))
+                )
+            else:
+                queryset = queryset.select_related(name)
+
         return queryset
 
     def perform_create(self, serializer):
         serializer.save(created_by=self.request.user)
 
+    @action(detail=False, methods=['post'])
+    def bulk_submit(self, request):
+        """
+        Upsert the current user's scrum entries for one day (default today),
+        one entry per active assigned task, in a single transaction. A
+        non-blank memo marks its half of the day as submitted.
+        """
+        serializer = ScrumBulkSubmitSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        user = request.user
+        day = serializer.validated_data.get('date') or timezone.now().date()
+        entries = {entry['task']: entry for entry in serializer.validated_data['entries']}
+
+        assigned = set(
+            Task.objects.filter(pk__in=entries, assignees=user, is_active=True).values_list('pk', flat=True)
+        )
+        unknown = sorted(set(entries) - assigned)
+        if unknown:
+            return Response(
+                {'entries': f"Not active tasks assigned to you: {', '.join(map(str, unknown))}"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        fields = ('morning_memo', 'evening_memo', 'reported_status')
+        now = timezone.now()
+        with transaction.atomic():
+            existing = {}
+            # Latest row wins if earlier single POSTs left duplicates.
+            for scrum in Scrum.objects.filter(employee=user, date=day, task_id__in=entries).order_by('id'):
+                existing[scrum.task_id] = scrum
+
+            to_update, to_create = [], []
+            for task_id, entry in entries.items():
+                scrum = existing.get(task_id)
+                if scrum is None:
+                    scrum = Scrum(task_id=task_id, employee=user, created_by=user, date=day)
+                    to_create.append(scrum)
+                else:
+                    scrum.updated_at = now
+                    to_update.append(scrum)
+                for name in fields:
+                    if name in entry:
+                        setattr(scrum, name, entry[name])
+                if (entry.get('morning_memo') or '').strip():
+                    scrum.morning_submitted = True
+                if (entry.get('evening_memo') or '').strip():
+                    scrum.evening_submitted = True
+
+            Scrum.objects.bulk_update(
+                to_update, [*fields, 'morning_submitted', 'evening_submitted', 'updated_at']
+            )
+            Scrum.objects.bulk_create(to_create)
+
+            saved = self.get_queryset().filter(employee=user, date=day, task_id__in=entries)
+            reindex_objects(Scrum, saved.values_list('pk', flat=True))
+
+        return Response(
+            {
+                'date': day,
+                'created': len(to_create),
+                'updated': len(to_update),
+                'results': self.get_serializer(saved.order_by('task__name', 'id'), many=True).data,
+            },
+            status=status.HTTP_201_CREATED if to_create else status.HTTP_200_OK,
+        )
+
+    @action(detail=False, methods=['get'])
+    def compliance(self, request):
+        """
+        Employees and open task assignments missing morning/evening entries
+        between ``start`` and ``end`` (default today, spanning at most
+        ``compliance.MAX_DAYS`` calendar days). Scope follows the list:
+        ``employee_scope`` is the user, ``lead_scope`` their direct reports,
+        staff see every active employee.
+        """
+        today = timezone.now().date()
+        try:
+            start = datetime.date.fromisoformat(request.query_params.get('start') or today.isoformat())
+            end = datetime.date.fromisoformat(request.query_params.get('end') or start.isoformat())
+        except ValueError:
+            return Response({'detail': 'start and end must be YYYY-MM-DD.'}, status=status.HTTP_400_BAD_REQUEST)
+        if end < start or (end - start).days >= compliance.MAX_DAYS:
+            return Response(
+                {'detail': f'end must be on or after start and within {compliance.MAX_DAYS} days.'},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        user = request.user
+        employees = CustomUser.objects.filter(is_active=True, status='active')
+        if request.query_params.get('employee_scope'):
+            employees = employees.filter(pk=user.pk)
+        elif 'lead_scope' in request.query_params:
+            employees = employees.filter(reports_to=user)
+        elif user.is_superuser or user.is_staff:
+            employees = employees.filter(is_superuser=False)
+        else:
+            employees = employees.filter(pk=user.pk)
+
+        try:
+            department = request.query_params.get('department')
+            if department:
+                employees = employees.filter(department_id=int(department))
+            employee_id = request.query_params.get('employee')
+            if employee_id:
+                employees = employees.filter(pk=int(employee_id))
+        except ValueError:
+            return Response({'detail': 'department and employee must be integers.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        days = compliance.working_days(start, end)
+        return Response({
+            'start': start,
+            'end': end,
+            'working_days': days,
+            'employees': compliance.employee_gaps(employees, days),
+            'tasks': compliance.task_gaps(employees, days),
+        })
+
     @action(detail=False, methods=['get'], url_path='today')
     def today(self, request):
         today = timezone.now().date()
@@ -643,6 +1067,73 @@ class ScrumViewSet(viewsets.ModelViewSet):
         return Response(serializer.data)
 
 
+class UploadSessionViewSet(viewsets.GenericViewSet):
+    """
+    Resumable chunked uploads for project files:
+
+    - POST   uploads/                      start (filename, size, optional sha256/chunk_size)
+    - POST   uploads/<id>/chunks/<index>/  raw chunk body, X-Chunk-SHA256 header
+    - GET    uploads/<id>/                 progress; ``missing_chunks`` to resume
+    - POST   uploads/<id>/complete/        assemble into content-addressed storage
+    - DELETE uploads/<id>/                 abandon
+
+    Completed uploads are attached with ``projects/<id>/attach_files/``.
+    """
+    serializer_class = UploadSessionSerializer
+    permission_classes = [HasPermission]
+    page_names = ['projects', 'lead_projects', 'employee_projects']
+
+    def get_queryset(self):
+        return UploadSession.objects.filter(created_by=self.request.user)
+
+    def _response(self, session, status_code=status.HTTP_200_OK):
+        data = self.get_serializer(session).data
+        if session.status == UploadSession.STATUS_OPEN:
+            data["missing_chunks"] = uploads.missing_chunks(session)
+        return Response(data, status=status_code)
+
+    def create(self, request):
+        serializer = UploadSessionCreateSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        try:
+            session = uploads.start_session(
+                request.user, data["filename"], data["size"],
+                sha256=data.get("sha256", ""), chunk_size=data.get("chunk_size"),
+            )
+        except uploads.UploadError as exc:
+            return Response({"detail": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        return self._response(session, status.HTTP_201_CREATED)
+
+    def retrieve(self, request, pk=None):
+        return self._response(self.get_object())
+
+    def destroy(self, request, pk=None):
+        session = self.get_object()
+        uploads.discard_chunks(session)
+        session.delete()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+    @action(detail=True, methods=["post"], url_path=r"chunks/(?P<index>\d+)")
+    def chunk(self, request, pk=None, index=None):
+        session = self.get_object()
+        try:
+            chunk = uploads.store_chunk(
+                session, int(index), request.stream, request.headers.get("X-Chunk-SHA256")
+            )
+        except uploads.UploadError as exc:
+            return Response({"detail": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response({"index": chunk.index, "size": chunk.size, "sha256": chunk.sha256})
+
+    @action(detail=True, methods=["post"])
+    def complete(self, request, pk=None):
+        try:
+            session = uploads.complete_session(self.get_object())
+        except uploads.UploadError as exc:
+            return Response({"detail": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        return self._response(session)
+
+
 class ContractTypeViewSet(viewsets.ModelViewSet):
     queryset = ContractType.objects.all()
     serializer_class = ContractTypeSerializer
@@ -652,7 +1143,15 @@ class ContractTypeViewSet(viewsets.ModelViewSet):
     search_fields = ['name']
 
 
-class ContractViewSet(viewsets.ModelViewSet):
+def contract_amount(amount, no_value):
+    return 'No Value' if no_value else amount
+
+
+def contract_end_date(end_date, no_end_date):
+    return 'No End Date' if no_end_date else end_date
+
+
+class ContractViewSet(ExportMixin, viewsets.ModelViewSet):
     queryset = Contract.objects.all()
     serializer_class = ContractSerializer
     permission_classes = [HasPermission]
@@ -668,15 +1167,28 @@ class ContractViewSet(viewsets.ModelViewSet):
     }
     ordering_fields = ['created_at', 'start_date', 'end_date', 'amount']
     ordering = ['-created_at']
+    export_columns = [
+        Column('ID', 'id'),
+        Column('Subject', 'subject', width=3),
+        Column('Client', 'client__name', width=2),
+        Column('Amount', ('amount', 'no_value'), render=contract_amount),
+        Column('Start Date', 'start_date'),
+        Column('End Date', ('end_date', 'no_end_date'), render=contract_end_date),
+        Column('Contract Name', 'contract_name', width=2),
+    ]
+    export_filename = 'contracts'
+    export_title = 'Contracts Report'
+    export_pagesize = landscape(letter)
 
     @action(detail=False, methods=['get'])
     def stats(self, request):
         today = datetime.date.today()
         total = self.get_queryset().count()
+        # no_end_date=False lets both counts range-scan the expiry index
         about_to_expire = self.get_queryset().filter(
-            end_date__range=[today, today + datetime.timedelta(days=30)]
+            no_end_date=False, end_date__range=[today, today + datetime.timedelta(days=30)]
         ).count()
-        expired = self.get_queryset().filter(end_date__lt=today).count()
+        expired = self.get_queryset().filter(no_end_date=False, end_date__lt=today).count()
 
         return Response({
             'total_contracts': total,
@@ -684,88 +1196,22 @@ class ContractViewSet(viewsets.ModelViewSet):
             'expired': expired
         })
 
-    @action(detail=False, methods=['get'])
-    def export_csv(self, request):
-        response = HttpResponse(content_type='text/csv')
-        response['Content-Disposition'] = 'attachment; filename="contracts.csv"'
-        
-        writer = csv.writer(response)
-        writer.writerow(['ID', 'Subject', 'Client', 'Amount', 'Start Date', 'End Date', 'Contract Name'])
-        
-        contracts = self.get_queryset()
-        for contract in contracts:
-            writer.writerow([
-                contract.id,
-                contract.subject,
-                contract.client.name,
-                contract.amount if not contract.no_value else 'No Value',
-                contract.start_date,
-                contract.end_date if not contract.no_end_date else 'No End Date',
-                contract.contract_name
-            ])
-        return response
-
-    @action(detail=False, methods=['get'])
-    def export_excel(self, request):
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "Contracts"
-        
-        columns = ['ID', 'Subject', 'Client', 'Amount', 'Start Date', 'End Date', 'Contract Name']
-        ws.append(columns)
-        
-        contracts = self.get_queryset()
-        for contract in contracts:
-            ws.append([
-                contract.id,
-                contract.subject,
-                contract.client.name,
-                float(contract.amount) if contract.amount and not contract.no_value else 'No Value',
-                str(contract.start_date),
-                str(contract.end_date) if not contract.no_end_date else 'No End Date',
-                contract.contract_name
-            ])
-            
-        response = HttpResponse(content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet')
-        response['Content-Disposition'] = 'attachment; filename="contracts.xlsx"'
-        wb.save(response)
-        return response
-
-    @action(detail=False, methods=['get'])
-    def export_pdf(self, request):
-        response = HttpResponse(content_type='application/pdf')
-        response['Content-Disposition'] = 'attachment; filename="contracts.pdf"'
-        
-        doc = SimpleDocTemplate(response, pagesize=landscape(letter))
-        elements = []
-        
-        styles = getSampleStyleSheet()
-        elements.append(Paragraph("Contracts Report", styles['Title']))
-        
-        data = [['ID', 'Subject', 'Client', 'Amount', 'Start Date', 'End Date']]
-        contracts = self.get_queryset()
-        
-        for contract in contracts:
-            data.append([
-                str(contract.id),
-                contract.subject[:30],
-                contract.client.name[:20],
-                str(contract.amount) if not contract.no_value else 'No Value',
-                str(contract.start_date),
-                str(contract.end_date) if not contract.no_end_date else 'No End Date'
-            ])
-            
-        table = Table(data)
-        table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black)
-        ]))
-        
-        elements.append(table)
-        doc.build(elements)
-        return response
+class ReferenceDataView(APIView):
+    """
+    All lookup tables used by forms and filters in one cached response.
+    Clients should send If-None-Match with the last ETag; unchanged data
+    returns 304 after a single version-counter cache read, without
+    rebuilding the lookup tables.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        version = get_version(REFERENCE_DATA_NAMESPACE)
+        etag = f'"reference-data-{version}"'
+        headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+        if etag in [tag.strip() for tag in request.headers.get("If-None-Match", "").split(",")]:
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+        version, payload = get_reference_data()
+        headers["ETag"] = f'"reference-data-{version}"'
+        return Response({"version": version, **payload}, headers=headers)
@@ -0,0 +1,71 @@
+"""
+Client portal authentication.
+
+Clients sign in with the email and password stored on operation.Client and
+receive a signed token, sent back as ``Authorization: Client <token>``. The
+token carries the client id and a fingerprint of the password hash, so
+changing the password revokes every token issued before. Tokens expire after
+CLIENT_PORTAL_TOKEN_TTL seconds.
+"""
+from django.conf import settings
+from django.core import signing
+from django.utils.crypto import constant_time_compare, salted_hmac
+from rest_framework.authentication import BaseAuthentication, get_authorization_header
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.permissions import BasePermission
+
+from operation.models import Client
+
+TOKEN_SALT = 'portal.client'
+KEYWORD = 'Client'
+
+
+class PortalClient:
+    """``request.user`` for portal requests."""
+    is_authenticated = True
+    is_anonymous = False
+
+    def __init__(self, client):
+        self.client = client
+        self.pk = client.pk
+
+    def __str__(self):
+        return str(self.client)
+
+
+def _fingerprint(client):
+    return salted_hmac(TOKEN_SALT, client.password).hexdigest()[:16]
+
+
+def issue_token(client):
+    return signing.dumps({'c': client.pk, 'p': _fingerprint(client)}, salt=TOKEN_SALT)
+
+
+class ClientTokenAuthentication(BaseAuthentication):
+
+    def authenticate(self, request):
+        auth = get_authorization_header(request).split()
+        if not auth or auth[0].lower() != KEYWORD.lower().encode():
+            return None
+        if len(auth) != 2:
+            raise AuthenticationFailed("Invalid client token header.")
+
+        try:
+            data = signing.loads(auth[1].decode(), salt=TOKEN_SALT, max_age=settings.CLIENT_PORTAL_TOKEN_TTL)
+        except signing.SignatureExpired:
+            raise AuthenticationFailed("Client token has expired.")
+        except (signing.BadSignature, UnicodeDecodeError):
+            raise AuthenticationFailed("Invalid client token.")
+
+        client = Client.objects.only('id', 'name', 'email', 'password').filter(pk=data.get('c')).first()
+        if client is None or not constant_time_compare(_fingerprint(client), data.get('p', '')):
+            raise AuthenticationFailed("Invalid client token.")
+        return PortalClient(client), auth[1]
+
+    def authenticate_header(self, request):
+        return KEYWORD
+
+
+class IsPortalClient(BasePermission):
+    def has_permission(self, request, view):
+        return isinstance(request.user, PortalClient)
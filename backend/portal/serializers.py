@@ -0,0 +1,50 @@
+"""
+Compact read-only serializers for the client portal. They only read
+columns and select_related names, never per-row queries.
+"""
+from rest_framework import serializers
+
+from operation.models import Contract, Project, Task
+
+
+class PortalTaskSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Task
+        fields = ['id', 'name', 'status', 'priority', 'start_date', 'due_date']
+
+
+class PortalProjectSerializer(serializers.ModelSerializer):
+    status = serializers.CharField(source='status.name', default=None)
+    stage = serializers.CharField(source='stage.name', default=None)
+    hours_spent = serializers.SerializerMethodField()
+    progress_percentage = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Project
+        fields = [
+            'id', 'name', 'summary', 'status', 'stage', 'tenor', 'start_date', 'deadline', 'no_deadline',
+            'is_active', 'client_can_manage_tasks', 'hours_allocated', 'hours_spent', 'progress_percentage',
+        ]
+
+    def get_hours_spent(self, obj):
+        return round((obj.total_seconds_spent or 0) / 3600, 2)
+
+    def get_progress_percentage(self, obj):
+        allocated = float(obj.hours_allocated or 0)
+        if allocated == 0:
+            return 0
+        return round(self.get_hours_spent(obj) / allocated * 100, 2)
+
+
+class PortalContractSerializer(serializers.ModelSerializer):
+    contract_type = serializers.CharField(source='contract_type.name', default=None)
+    amount = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Contract
+        fields = [
+            'id', 'subject', 'contract_name', 'contract_type', 'amount', 'start_date', 'end_date', 'no_end_date',
+        ]
+
+    def get_amount(self, obj):
+        return None if obj.no_value or obj.amount is None else str(obj.amount)
@@ -0,0 +1,70 @@
+"""
+Per-client portal snapshots.
+
+Everything a client can read - their projects with progress and tasks, and
+their contracts - is built in three queries into one payload and cached
+under the client's version counter (operation.caching.client_namespace),
+which project, task and contract writes bump. Portal requests are answered
+from the cached payload, so external traffic reaches the database only
+after a change or once CLIENT_PORTAL_SNAPSHOT_TTL has passed.
+"""
+from django.conf import settings
+from django.core.cache import cache
+
+from operation.caching import client_namespace, get_version, versioned_key
+from operation.financials import annotate_financials
+from operation.models import Contract, Project, Task
+from operation.reference_data import NAMESPACE as REFERENCE_DATA_NAMESPACE
+
+from .serializers import PortalContractSerializer, PortalProjectSerializer, PortalTaskSerializer
+
+
+def build_snapshot(client_id):
+    projects = annotate_financials(
+        Project.objects.filter(client_id=client_id).select_related('status', 'stage').order_by('-created_at')
+    ).only(
+        'id', 'name', 'summary', 'status__name', 'stage__name', 'tenor', 'start_date', 'deadline', 'no_deadline',
+        'is_active', 'client_can_manage_tasks', 'hours_allocated',
+    )
+    tasks = (
+        Task.objects.filter(project__client_id=client_id)
+        .exclude(is_active=False)
+        .only('id', 'project_id', 'name', 'status', 'priority', 'start_date', 'due_date')
+        .order_by('due_date', 'pk')
+    )
+    contracts = (
+        Contract.objects.filter(client_id=client_id)
+        .select_related('contract_type')
+        .only(
+            'id', 'subject', 'contract_name', 'contract_type__name', 'amount', 'no_value',
+            'start_date', 'end_date', 'no_end_date',
+        )
+        .order_by('-start_date', 'pk')
+    )
+
+    tasks_by_project = {}
+    for task in tasks:
+        tasks_by_project.setdefault(task.project_id, []).append(task)
+    project_data = []
+    for project in projects:
+        project_tasks = tasks_by_project.get(project.pk, [])
+        data = PortalProjectSerializer(project).data
+        data['task_counts'] = {}
+        for task in project_tasks:
+            data['task_counts'][task.status] = data['task_counts'].get(task.status, 0) + 1
+        data['tasks'] = PortalTaskSerializer(project_tasks, many=True).data
+        project_data.append(data)
+
+    return {
+        'projects': project_data,
+        'contracts': PortalContractSerializer(contracts, many=True).data,
+    }
+
+
+def client_snapshot(client_id):
+    key = versioned_key(client_namespace(client_id), 'portal', get_version(REFERENCE_DATA_NAMESPACE))
+    snapshot = cache.get(key)
+    if snapshot is None:
+        snapshot = build_snapshot(client_id)
+        cache.set(key, snapshot, timeout=settings.CLIENT_PORTAL_SNAPSHOT_TTL)
+    return snapshot
@@ -0,0 +1,14 @@
+from rest_framework.throttling import AnonRateThrottle, SimpleRateThrottle
+
+
+class ClientRateThrottle(SimpleRateThrottle):
+    """Limits portal requests per client, whatever address they come from."""
+    scope = 'client_portal'
+
+    def get_cache_key(self, request, view):
+        return self.cache_format % {'scope': self.scope, 'ident': request.user.pk}
+
+
+class ClientLoginThrottle(AnonRateThrottle):
+    """Limits sign-in attempts per address."""
+    scope = 'client_portal_login'
@@ -0,0 +1,13 @@
+from django.urls import include, path
+from rest_framework.routers import DefaultRouter
+
+from .views import PortalContractViewSet, PortalLoginView, PortalProjectViewSet
+
+router = DefaultRouter()
+router.register(r'projects', PortalProjectViewSet, basename='portal-project')
+router.register(r'contracts', PortalContractViewSet, basename='portal-contract')
+
+urlpatterns = [
+    path('login/', PortalLoginView.as_view(), name='portal-login'),
+    path('', include(router.urls)),
+]
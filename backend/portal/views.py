@@ -0,0 +1,68 @@
+from django.contrib.auth.hashers import check_password, make_password
+from rest_framework import status, viewsets
+from rest_framework.permissions import AllowAny
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from operation.models import Client
+
+from .authentication import ClientTokenAuthentication, IsPortalClient, issue_token
+from .snapshots import client_snapshot
+from .throttling import ClientLoginThrottle, ClientRateThrottle
+
+
+class PortalLoginView(APIView):
+    """Exchange a client's email and password for a portal token."""
+    authentication_classes = []
+    permission_classes = [AllowAny]
+    throttle_classes = [ClientLoginThrottle]
+
+    def post(self, request):
+        email = (request.data.get('email') or '').strip()
+        password = request.data.get('password') or ''
+        client = Client.objects.filter(email__iexact=email).first() if email else None
+        if client is None:
+            # Same hashing cost as a wrong password, so emails can't be probed by timing
+            make_password(password)
+            valid = False
+        else:
+            valid = bool(password) and check_password(password, client.password)
+        if not valid:
+            return Response({'error': 'Invalid email or password'}, status=status.HTTP_401_UNAUTHORIZED)
+
+        return Response({
+            'token': issue_token(client),
+            'client': {'id': client.pk, 'name': client.name, 'email': client.email},
+        })
+
+
+class PortalViewSet(viewsets.ViewSet):
+    authentication_classes = [ClientTokenAuthentication]
+    permission_classes = [IsPortalClient]
+    throttle_classes = [ClientRateThrottle]
+
+    def snapshot(self):
+        return client_snapshot(self.request.user.pk)
+
+
+class PortalProjectViewSet(PortalViewSet):
+    """The client's projects with progress; a single project adds its tasks."""
+
+    def list(self, request):
+        return Response([
+            {name: value for name, value in project.items() if name != 'tasks'}
+            for project in self.snapshot()['projects']
+        ])
+
+    def retrieve(self, request, pk=None):
+        for project in self.snapshot()['projects']:
+            if str(project['id']) == str(pk):
+                return Response(project)
+        return Response({'error': 'Project not found'}, status=status.HTTP_404_NOT_FOUND)
+
+
+class PortalContractViewSet(PortalViewSet):
+    """The client's contracts."""
+
+    def list(self, request):
+        return Response(self.snapshot()['contracts'])
@@ -0,0 +1,12 @@
+from django.contrib import admin
+
+from .models import ExportJob
+
+
+@admin.register(ExportJob)
+class ExportJobAdmin(admin.ModelAdmin):
+    list_display = ('id', 'export', 'format', 'created_by', 'status', 'rows_written', 'total_rows', 'created_at')
+    list_filter = ('status', 'export', 'format')
+    search_fields = ('created_by__email', 'created_by__name')
+    list_select_related = ('created_by',)
+    readonly_fields = ('params_hash', 'active_key')
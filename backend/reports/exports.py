@@ -0,0 +1,274 @@
+"""
+Streaming list exports.
+
+A viewset mixes in ExportMixin and declares ``export_columns``. It then gets
+``export_csv``, ``export_excel``, ``export_jsonl`` and ``export_pdf``
+actions, which run over the same filtered queryset as its list endpoint.
+Rows are read with ``values_list`` restricted to the columns' source fields,
+``CHUNK_SIZE`` at a time, so no model instances are built and no related row
+is loaded twice.
+CSV and JSON Lines are streamed to the client while they are produced. XLSX
+is written by openpyxl's write-only workbook to a temporary file, since a
+ZIP container can't be streamed. PDF goes to a temporary file through the
+page-chunked engine in reports.pdf.
+"""
+import csv
+import datetime
+import io
+import itertools
+import json
+import tempfile
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import FileResponse, HttpResponse, StreamingHttpResponse
+from django.utils import timezone
+from django.utils.text import slugify
+from openpyxl import Workbook
+from reportlab.lib.pagesizes import letter
+from rest_framework.decorators import action
+
+from .pdf import write_pdf
+
+CHUNK_SIZE = 2000
+# Rendered lines are sent to the client in groups this large
+LINES_PER_WRITE = 200
+
+XLSX_CONTENT_TYPE = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+
+# Column source standing for the 1-based position of the row in the export
+ROW_NUMBER = 'row_number'
+
+
+class Column:
+    """
+    One export column.
+
+    ``source`` is a queryset field path, a tuple of paths whose values are
+    passed positionally to ``render``, or ROW_NUMBER. With ``many=True`` the
+    single path crosses a to-many relation; its values are fetched with one
+    query per chunk and passed to ``render`` as a list (joined with commas
+    by default). ``width`` is the column's relative width in PDFs.
+    """
+
+    def __init__(self, header, source, render=None, many=False, key=None, width=1):
+        self.header = header
+        self.source = source
+        if source == ROW_NUMBER:
+            self.fields = ()
+        elif isinstance(source, str):
+            self.fields = (source,)
+        else:
+            self.fields = tuple(source)
+        self.render = render
+        self.many = many
+        self.key = key or slugify(header).replace('-', '_')
+        self.width = width
+
+
+def label(choices):
+    """``render`` showing the display label of a choices value."""
+    labels = dict(choices)
+    return lambda value: labels.get(value, value)
+
+
+def _join(values):
+    return ', '.join(str(value) for value in values)
+
+
+def _related_values(model, path, pks):
+    values = {}
+    rows = model._default_manager.filter(pk__in=pks, **{f'{path}__isnull': False}) \
+        .order_by('pk', path).values_list('pk', path)
+    for pk, value in rows:
+        values.setdefault(pk, []).append(value)
+    return values
+
+
+def iter_rows(queryset, columns, chunk_size=CHUNK_SIZE):
+    """Yields a list of rendered values per row of ``queryset``, in order."""
+    fields = ['pk']
+    for column in columns:
+        if not column.many:
+            fields.extend(name for name in column.fields if name not in fields)
+    position = {name: index for index, name in enumerate(fields)}
+    many = [column for column in columns if column.many]
+
+    rows = queryset.prefetch_related(None).values_list(*fields).iterator(chunk_size=chunk_size)
+    number = 0
+    while True:
+        chunk = list(itertools.islice(rows, chunk_size))
+        if not chunk:
+            return
+        pks = [row[0] for row in chunk]
+        related = {column: _related_values(queryset.model, column.source, pks) for column in many}
+        for row in chunk:
+            number += 1
+            values = []
+            for column in columns:
+                if column.source == ROW_NUMBER:
+                    value = number
+                elif column.many:
+                    value = (column.render or _join)(related[column].get(row[0], []))
+                else:
+                    args = [row[position[name]] for name in column.fields]
+                    value = column.render(*args) if column.render else args[0]
+                values.append(value)
+            yield values
+
+
+def _plain(value):
+    if isinstance(value, datetime.datetime) and timezone.is_aware(value):
+        return timezone.make_naive(value)
+    return value
+
+
+def _batched(lines):
+    while True:
+        batch = ''.join(itertools.islice(lines, LINES_PER_WRITE))
+        if not batch:
+            return
+        yield batch
+
+
+class _Echo:
+    """File-like object handing csv.writer's output straight back."""
+
+    def write(self, value):
+        return value
+
+
+def csv_lines(columns, rows):
+    writer = csv.writer(_Echo())
+    yield writer.writerow([column.header for column in columns])
+    for row in rows:
+        yield writer.writerow([_plain(value) for value in row])
+
+
+def jsonl_lines(columns, rows):
+    keys = [column.key for column in columns]
+    for row in rows:
+        yield json.dumps(dict(zip(keys, map(_plain, row))), cls=DjangoJSONEncoder) + '\n'
+
+
+def write_xlsx(file, title, columns, rows):
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet(title=title[:31])
+    sheet.append([column.header for column in columns])
+    for row in rows:
+        sheet.append([_plain(value) for value in row])
+    workbook.save(file)
+
+
+def write_lines(file, lines):
+    for batch in _batched(lines):
+        file.write(batch.encode('utf-8'))
+
+
+# format -> (file extension, content type)
+FORMATS = {
+    'csv': ('csv', 'text/csv; charset=utf-8'),
+    'xlsx': ('xlsx', XLSX_CONTENT_TYPE),
+    'jsonl': ('jsonl', 'application/x-ndjson'),
+    'pdf': ('pdf', 'application/pdf'),
+}
+
+EXPORT_ACTIONS = {
+    'csv': 'export_csv',
+    'xlsx': 'export_excel',
+    'jsonl': 'export_jsonl',
+    'pdf': 'export_pdf',
+}
+
+
+def write_export(file, format, title, columns, rows, pagesize=letter):
+    """Write ``rows`` to a binary ``file`` in one of FORMATS."""
+    if format == 'csv':
+        write_lines(file, csv_lines(columns, rows))
+    elif format == 'jsonl':
+        write_lines(file, jsonl_lines(columns, rows))
+    elif format == 'xlsx':
+        write_xlsx(file, title, columns, rows)
+    elif format == 'pdf':
+        write_pdf(file, title, columns, rows, pagesize=pagesize)
+    else:
+        raise ValueError(f"Unknown export format {format!r}")
+
+
+def export_response(format, filename, title, columns, rows):
+    """Attachment response for a small, already computed table."""
+    file = io.BytesIO()
+    write_export(file, format, title, columns, rows)
+    extension, content_type = FORMATS[format]
+    response = HttpResponse(file.getvalue(), content_type=content_type)
+    response['Content-Disposition'] = f'attachment; filename="{filename}.{extension}"'
+    return response
+
+
+class ExportMixin:
+    """
+    Export actions for a viewset. Set ``export_columns`` to a list of
+    Column and ``export_filename`` to the download name without extension.
+    ``export_ordering`` overrides the queryset ordering, and
+    ``export_permission_classes`` replaces the viewset's permissions for
+    the export actions only. ``export_pagesize`` is the PDF page size.
+    """
+    export_columns = ()
+    export_filename = 'export'
+    export_title = None
+    export_pagesize = letter
+    export_ordering = None
+    export_permission_classes = None
+
+    def get_permissions(self):
+        if self.export_permission_classes is not None and self.action in EXPORT_ACTIONS.values():
+            return [permission() for permission in self.export_permission_classes]
+        return super().get_permissions()
+
+    def get_export_queryset(self):
+        queryset = self.filter_queryset(self.get_queryset())
+        if self.export_ordering:
+            queryset = queryset.order_by(*self.export_ordering)
+        return queryset
+
+    def get_export_title(self):
+        return self.export_title or self.export_filename.replace('_', ' ').title()
+
+    def export_rows(self):
+        return iter_rows(self.get_export_queryset(), self.export_columns)
+
+    def write_export(self, file, format, rows):
+        """Write ``rows`` to a binary ``file`` in one of FORMATS."""
+        write_export(
+            file, format, self.get_export_title(), self.export_columns, rows, pagesize=self.export_pagesize,
+        )
+
+    def _streaming_export(self, lines, format):
+        extension, content_type = FORMATS[format]
+        response = StreamingHttpResponse(_batched(lines), content_type=content_type)
+        response['Content-Disposition'] = f'attachment; filename="{self.export_filename}.{extension}"'
+        return response
+
+    @action(detail=False, methods=['get'])
+    def export_csv(self, request):
+        return self._streaming_export(csv_lines(self.export_columns, self.export_rows()), 'csv')
+
+    @action(detail=False, methods=['get'])
+    def export_jsonl(self, request):
+        return self._streaming_export(jsonl_lines(self.export_columns, self.export_rows()), 'jsonl')
+
+    def _file_export(self, format):
+        file = tempfile.TemporaryFile()
+        self.write_export(file, format, self.export_rows())
+        file.seek(0)
+        extension, content_type = FORMATS[format]
+        return FileResponse(
+            file, as_attachment=True, filename=f'{self.export_filename}.{extension}', content_type=content_type
+        )
+
+    @action(detail=False, methods=['get'])
+    def export_excel(self, request):
+        return self._file_export('xlsx')
+
+    @action(detail=False, methods=['get'])
+    def export_pdf(self, request):
+        return self._file_export('pdf')
@@ -0,0 +1,205 @@
+"""
+Background export jobs.
+
+Clients enqueue an export by name, format and the list filters they would
+have sent to the export action. The ``run_export_jobs`` worker rebuilds the
+list viewset for the requesting user and writes the export to media storage
+under ``exports/<job id>/``, recording progress every chunk. Finished files
+expire after EXPORT_JOB_TTL seconds and are purged by the worker.
+
+A job is keyed by a hash of (user, export, format, filters). While a job is
+pending or running, an identical request returns it instead of starting
+another one.
+"""
+import hashlib
+import json
+import logging
+import shutil
+import tempfile
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files import File
+from django.core.files.storage import default_storage
+from django.db import IntegrityError, transaction
+from django.http import HttpRequest, QueryDict
+from django.utils import timezone
+from django.utils.module_loading import import_string
+from rest_framework.request import ForcedAuthentication, Request
+
+from .exports import CHUNK_SIZE, EXPORT_ACTIONS, FORMATS, iter_rows
+from .models import ExportJob
+
+logger = logging.getLogger(__name__)
+
+# export name -> list viewset (must use ExportMixin)
+EXPORTS = {
+    'attendance': 'hr.views.AttendanceViewSet',
+    'holidays': 'hr.views.HolidayViewSet',
+    'contracts': 'operation.views.ContractViewSet',
+    'tasks': 'operation.views.TaskViewSet',
+    'leads': 'sales.views.LeadViewSet',
+    'timesheet': 'hr.views.WorkSessionViewSet',
+}
+
+# List parameters that don't change what is exported
+IGNORED_PARAMS = {'page', 'page_size', 'format'}
+
+
+def normalize_params(params):
+    """{name: [values]} from a QueryDict or a dict of strings/lists, minus IGNORED_PARAMS."""
+    if isinstance(params, QueryDict):
+        items = params.lists()
+    else:
+        items = ((name, value if isinstance(value, list) else [value]) for name, value in params.items())
+    return {
+        name: [str(value) for value in values]
+        for name, values in sorted(items)
+        if name not in IGNORED_PARAMS
+    }
+
+
+def request_hash(user, export, format, params):
+    payload = json.dumps([user.pk, export, format, params], sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def build_view(export, user, params, format):
+    """The export's list viewset, set up as if ``user`` had requested it with ``params``."""
+    viewset_class = import_string(EXPORTS[export])
+    http_request = HttpRequest()
+    http_request.method = 'GET'
+    http_request.GET = QueryDict(mutable=True)
+    for name, values in params.items():
+        http_request.GET.setlist(name, values)
+    request = Request(http_request, authenticators=[ForcedAuthentication(user, None)])
+
+    view = viewset_class()
+    view.action_map = {'get': EXPORT_ACTIONS[format]}
+    view.action = EXPORT_ACTIONS[format]
+    view.request = request
+    view.args = ()
+    view.kwargs = {}
+    view.format_kwarg = None
+    view.headers = {}
+    return view
+
+
+def enqueue(user, export, format, params):
+    """Returns ``(job, created)``; an identical pending/running job is reused."""
+    params = normalize_params(params)
+    key = request_hash(user, export, format, params)
+    job = ExportJob.objects.filter(active_key=key).first()
+    if job is not None:
+        return job, False
+    try:
+        with transaction.atomic():
+            job = ExportJob.objects.create(
+                created_by=user,
+                export=export,
+                format=format,
+                params=params,
+                params_hash=key,
+                active_key=key,
+            )
+    except IntegrityError:
+        # Lost the race to an identical request
+        return ExportJob.objects.get(active_key=key), False
+    return job, True
+
+
+def claim_next_job():
+    """Marks the oldest pending job running and returns it, or None."""
+    with transaction.atomic():
+        job = (
+            ExportJob.objects.select_for_update(skip_locked=True)
+            .filter(status=ExportJob.STATUS_PENDING)
+            .order_by('created_at')
+            .first()
+        )
+        if job is None:
+            return None
+        job.status = ExportJob.STATUS_RUNNING
+        job.started_at = timezone.now()
+        job.save(update_fields=['status', 'started_at', 'updated_at'])
+    return job
+
+
+def _with_progress(job, rows):
+    count = 0
+    for row in rows:
+        yield row
+        count += 1
+        if count % CHUNK_SIZE == 0:
+            ExportJob.objects.filter(pk=job.pk).update(rows_written=count, updated_at=timezone.now())
+    job.rows_written = count
+
+
+def _finish(job, **fields):
+    now = timezone.now()
+    fields.update(
+        active_key=None,
+        completed_at=now,
+        updated_at=now,
+        expires_at=now + timedelta(seconds=settings.EXPORT_JOB_TTL),
+    )
+    for name, value in fields.items():
+        setattr(job, name, value)
+    # The job may have been deleted (cancelled) while it ran
+    return ExportJob.objects.filter(pk=job.pk).update(**fields) > 0
+
+
+def run_job(job):
+    try:
+        view = build_view(job.export, job.created_by, job.params, job.format)
+        view.check_permissions(view.request)
+        queryset = view.get_export_queryset()
+        total = queryset.count()
+        job.total_rows = total
+        ExportJob.objects.filter(pk=job.pk).update(total_rows=total, updated_at=timezone.now())
+
+        extension = FORMATS[job.format][0]
+        with tempfile.TemporaryFile() as file:
+            view.write_export(file, job.format, _with_progress(job, iter_rows(queryset, view.export_columns)))
+            file.seek(0)
+            name = default_storage.save(f'exports/{job.pk}/{view.export_filename}.{extension}', File(file))
+    except Exception as exc:
+        logger.exception("Export job %s failed", job.pk)
+        _finish(job, status=ExportJob.STATUS_FAILED, error=str(exc) or exc.__class__.__name__)
+        return job
+
+    if not _finish(job, status=ExportJob.STATUS_COMPLETE, file=name, rows_written=job.rows_written):
+        delete_job_files(job)
+    return job
+
+
+def delete_job_files(job):
+    if job.file:
+        default_storage.delete(job.file.name)
+    try:
+        directory = default_storage.path(f'exports/{job.pk}')
+    except NotImplementedError:
+        return
+    shutil.rmtree(directory, ignore_errors=True)
+
+
+def purge_jobs(now=None):
+    """
+    Delete expired jobs with their files, and fail running jobs whose
+    progress stalled (their worker died). Returns (purged, failed).
+    """
+    now = now or timezone.now()
+    stalled = ExportJob.objects.filter(
+        status=ExportJob.STATUS_RUNNING,
+        updated_at__lt=now - timedelta(seconds=settings.EXPORT_JOB_TIMEOUT),
+    )
+    failed = 0
+    for job in stalled:
+        failed += _finish(job, status=ExportJob.STATUS_FAILED, error="The export worker stopped responding.")
+
+    purged = 0
+    for job in ExportJob.objects.filter(expires_at__lt=now).iterator():
+        delete_job_files(job)
+        job.delete()
+        purged += 1
+    return purged, failed
@@ -0,0 +1,87 @@
+import datetime
+import io
+import time
+
+from django.core.management.base import BaseCommand
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import landscape, letter
+from reportlab.lib.styles import getSampleStyleSheet
+from reportlab.platypus import Paragraph, SimpleDocTemplate, Table, TableStyle
+
+from reports.exports import Column
+from reports.pdf import write_pdf
+
+COLUMNS = [
+    Column('Date', 'date'),
+    Column('Employee', 'employee', width=2),
+    Column('Department', 'department', width=2),
+    Column('Clock In', 'clock_in'),
+    Column('Clock Out', 'clock_out'),
+    Column('Hours', 'hours'),
+    Column('Status', 'status'),
+    Column('Notes', 'notes', width=3),
+]
+
+
+def sample_rows(count):
+    start = datetime.date(2026, 1, 1)
+    for index in range(count):
+        yield [
+            start + datetime.timedelta(days=index % 365),
+            f"Employee {index % 250}",
+            f"Department {index % 12}",
+            datetime.time(9, index % 60),
+            datetime.time(18, index % 60),
+            round(8 + (index % 90) / 60, 2),
+            'Present' if index % 7 else 'Late',
+            f"Note {index} " * (index % 5),
+        ]
+
+
+def legacy_pdf(file, title, columns, rows):
+    """The previous export_pdf implementation: one Table with every row."""
+    doc = SimpleDocTemplate(file, pagesize=landscape(letter))
+    styles = getSampleStyleSheet()
+    data = [[column.header for column in columns]]
+    data.extend([str(value) for value in row] for row in rows)
+    table = Table(data)
+    table.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+        ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+        ('GRID', (0, 0), (-1, -1), 1, colors.black),
+    ]))
+    doc.build([Paragraph(title, styles['Title']), table])
+
+
+class Command(BaseCommand):
+    help = "Time the chunked PDF report engine against the single-Table export it replaced"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, action='append', dest='sizes',
+                            help="Row counts to render (default 1000 and 10000)")
+        parser.add_argument('--skip-legacy', action='store_true',
+                            help="Only time the chunked engine")
+
+    def _time(self, render, rows):
+        file = io.BytesIO()
+        started = time.perf_counter()
+        render(file, "Attendance Report", COLUMNS, sample_rows(rows))
+        return time.perf_counter() - started, file.tell()
+
+    def handle(self, *args, **options):
+        for rows in options['sizes'] or [1000, 10000]:
+            seconds, size = self._time(
+                lambda *args: write_pdf(*args, pagesize=landscape(letter)), rows
+            )
+            line = f"{rows:>7} rows   chunked {seconds:8.2f} s ({size / 1024:,.0f} KiB)"
+            if not options['skip_legacy']:
+                legacy_seconds, legacy_size = self._time(legacy_pdf, rows)
+                line += (
+                    f"   single Table {legacy_seconds:8.2f} s ({legacy_size / 1024:,.0f} KiB)"
+                    f"   x{legacy_seconds / seconds:.1f}"
+                )
+            self.stdout.write(line)
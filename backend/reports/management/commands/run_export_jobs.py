@@ -0,0 +1,48 @@
+import signal
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from reports.jobs import claim_next_job, purge_jobs, run_job
+
+PURGE_INTERVAL = 300
+
+
+class Command(BaseCommand):
+    help = "Process queued export jobs and purge expired ones"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true',
+                            help="Process the jobs queued now, purge, and exit")
+        parser.add_argument('--sleep', type=float, default=2,
+                            help="Seconds to wait when the queue is empty (default 2)")
+
+    def handle(self, *args, **options):
+        self.stopping = False
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+
+        last_purge = None
+        while not self.stopping:
+            if last_purge is None or time.monotonic() - last_purge >= PURGE_INTERVAL:
+                purged, failed = purge_jobs()
+                last_purge = time.monotonic()
+                if purged or failed:
+                    self.stdout.write(f"Purged {purged} expired jobs, failed {failed} stalled jobs.")
+
+            close_old_connections()
+            job = claim_next_job()
+            if job is None:
+                if options['once']:
+                    break
+                time.sleep(options['sleep'])
+                continue
+
+            run_job(job)
+            style = self.style.SUCCESS if job.status == job.STATUS_COMPLETE else self.style.ERROR
+            self.stdout.write(style(f"{job.pk} {job.export}.{job.format}: {job.status}, {job.rows_written} rows"))
+
+    def stop(self, signum, frame):
+        # Finish the current job, then exit
+        self.stopping = True
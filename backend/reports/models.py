@@ -0,0 +1,52 @@
+import uuid
+
+from django.db import models
+
+from authapp.models import CustomUser
+
+
+class ExportJob(models.Model):
+    """
+    An export of a filtered list, produced by the ``run_export_jobs``
+    worker instead of inside a request. ``active_key`` holds the request
+    hash while the job is pending or running, so identical concurrent
+    requests share one job; it is cleared once the job finishes.
+    """
+    STATUS_PENDING = 'pending'
+    STATUS_RUNNING = 'running'
+    STATUS_COMPLETE = 'complete'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_PENDING, 'Pending'),
+        (STATUS_RUNNING, 'Running'),
+        (STATUS_COMPLETE, 'Complete'),
+        (STATUS_FAILED, 'Failed'),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    created_by = models.ForeignKey(
+        CustomUser, on_delete=models.CASCADE, related_name='export_jobs')
+    export = models.CharField(max_length=50)
+    format = models.CharField(max_length=10)
+    params = models.JSONField(default=dict, blank=True)
+    params_hash = models.CharField(max_length=64, db_index=True)
+    active_key = models.CharField(max_length=64, unique=True, null=True, blank=True)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    total_rows = models.PositiveIntegerField(null=True, blank=True)
+    rows_written = models.PositiveIntegerField(default=0)
+    file = models.FileField(max_length=255, blank=True)
+    error = models.TextField(blank=True, default='')
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    completed_at = models.DateTimeField(null=True, blank=True)
+    expires_at = models.DateTimeField(null=True, blank=True, db_index=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', 'created_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.export}.{self.format} ({self.status})"
@@ -0,0 +1,189 @@
+"""
+PDF reports.
+
+Rows are rendered from an iterator into page-sized LongTable chunks instead
+of one Table holding every row. Reportlab splits an oversized table one page
+at a time, re-measuring everything left over, so a single 10k-row table costs
+quadratic time. Here every row has a fixed height and every column a fixed
+width, so nothing is measured. Each chunk holds exactly as many rows as fit
+its frame and starts with its own header row.
+
+The stylesheet, the TableStyle and the company logo are built once per
+process. Branding comes from REPORT_COMPANY_NAME, REPORT_LOGO_PATH and
+REPORT_BRAND_COLOR.
+"""
+import datetime
+import functools
+import os
+
+from django.conf import settings
+from django.utils import timezone
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import letter
+from reportlab.lib.styles import getSampleStyleSheet
+from reportlab.lib.utils import ImageReader
+from reportlab.pdfbase.pdfmetrics import stringWidth
+from reportlab.platypus import LongTable, Paragraph, SimpleDocTemplate, TableStyle
+
+FONT = 'Helvetica'
+BOLD_FONT = 'Helvetica-Bold'
+FONT_SIZE = 8
+ROW_HEIGHT = 14
+CELL_PADDING = 4
+MARGIN = 36
+# Room above the frame for the branding band
+BAND_HEIGHT = 24
+# SimpleDocTemplate's frame padding, per side
+FRAME_PADDING = 6
+ELLIPSIS = '...'
+
+
+@functools.lru_cache(maxsize=None)
+def stylesheet():
+    return getSampleStyleSheet()
+
+
+@functools.lru_cache(maxsize=None)
+def table_style(brand_color):
+    """TableStyle shared by every chunk of every report with this colour."""
+    return TableStyle([
+        ('FONTNAME', (0, 0), (-1, -1), FONT),
+        ('FONTSIZE', (0, 0), (-1, -1), FONT_SIZE),
+        ('LEADING', (0, 0), (-1, -1), FONT_SIZE + 1),
+        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+        ('LEFTPADDING', (0, 0), (-1, -1), CELL_PADDING),
+        ('RIGHTPADDING', (0, 0), (-1, -1), CELL_PADDING),
+        ('TOPPADDING', (0, 0), (-1, -1), 2),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 2),
+        ('FONTNAME', (0, 0), (-1, 0), BOLD_FONT),
+        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor(brand_color)),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f5f5f0')]),
+        ('GRID', (0, 0), (-1, -1), 0.25, colors.HexColor('#9e9e9e')),
+    ])
+
+
+@functools.lru_cache(maxsize=None)
+def _logo(path):
+    if not path or not os.path.exists(path):
+        return None
+    return ImageReader(path)
+
+
+def _text(value):
+    if value is None:
+        return ''
+    if isinstance(value, datetime.datetime):
+        if timezone.is_aware(value):
+            value = timezone.localtime(value)
+        return value.strftime('%Y-%m-%d %H:%M')
+    if isinstance(value, bool):
+        return 'Yes' if value else 'No'
+    return str(value).replace('\n', ' ')
+
+
+def _fit(text, width, font=FONT):
+    """Truncate ``text`` with an ellipsis so it fits ``width`` points."""
+    if stringWidth(text, font, FONT_SIZE) <= width:
+        return text
+    low, high = 0, len(text)
+    while low < high:
+        middle = (low + high + 1) // 2
+        if stringWidth(text[:middle] + ELLIPSIS, font, FONT_SIZE) <= width:
+            low = middle
+        else:
+            high = middle - 1
+    return text[:low] + ELLIPSIS
+
+
+def column_widths(columns, total):
+    weights = [getattr(column, 'width', None) or 1 for column in columns]
+    unit = total / sum(weights)
+    return [weight * unit for weight in weights]
+
+
+def _chunks(rows, first_size, size):
+    chunk = []
+    limit = first_size
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) == limit:
+            yield chunk
+            chunk = []
+            limit = size
+    if chunk:
+        yield chunk
+
+
+def _draw_page(canvas, doc):
+    width, height = doc.pagesize
+    top = height - MARGIN
+    canvas.saveState()
+    logo = _logo(settings.REPORT_LOGO_PATH)
+    text_x = doc.leftMargin
+    if logo is not None:
+        image_width, image_height = logo.getSize()
+        logo_width = BAND_HEIGHT * 0.8 * image_width / image_height
+        canvas.drawImage(logo, doc.leftMargin, top - BAND_HEIGHT * 0.8, logo_width, BAND_HEIGHT * 0.8, mask='auto')
+        text_x += logo_width + 8
+    canvas.setFont(BOLD_FONT, 11)
+    canvas.drawString(text_x, top - 14, settings.REPORT_COMPANY_NAME)
+    canvas.setStrokeColor(colors.HexColor(settings.REPORT_BRAND_COLOR))
+    canvas.setLineWidth(1.5)
+    canvas.line(doc.leftMargin, top - BAND_HEIGHT, width - doc.rightMargin, top - BAND_HEIGHT)
+
+    canvas.setFont(FONT, 7)
+    canvas.setFillColor(colors.HexColor('#616161'))
+    canvas.drawString(doc.leftMargin, MARGIN / 2, f"{doc.title} - generated {doc.generated_at}")
+    canvas.drawRightString(width - doc.rightMargin, MARGIN / 2, f"Page {doc.page}")
+    canvas.restoreState()
+
+
+def write_pdf(file, title, columns, rows, pagesize=letter):
+    """Render ``rows`` (lists of values in ``columns`` order) to ``file``."""
+    doc = SimpleDocTemplate(
+        file,
+        pagesize=pagesize,
+        leftMargin=MARGIN,
+        rightMargin=MARGIN,
+        topMargin=MARGIN + BAND_HEIGHT + 6,
+        bottomMargin=MARGIN,
+        title=title,
+        author=settings.REPORT_COMPANY_NAME,
+    )
+    doc.generated_at = timezone.localtime().strftime('%Y-%m-%d %H:%M')
+
+    table_width = doc.width - 2 * FRAME_PADDING
+    frame_height = doc.height - 2 * FRAME_PADDING
+    widths = column_widths(columns, table_width)
+    text_widths = [width - 2 * CELL_PADDING for width in widths]
+    header = [_fit(column.header, width, BOLD_FONT) for column, width in zip(columns, text_widths)]
+    style = table_style(settings.REPORT_BRAND_COLOR)
+
+    heading = Paragraph(title, stylesheet()['Title'])
+    _, heading_height = heading.wrap(table_width, frame_height)
+    heading_height += heading.getSpaceAfter()
+    # One row per page is left as slack for rounding
+    per_page = max(1, int(frame_height // ROW_HEIGHT) - 2)
+    first_page = max(1, int((frame_height - heading_height) // ROW_HEIGHT) - 2)
+
+    elements = [heading]
+    for chunk in _chunks(rows, first_page, per_page):
+        data = [header]
+        data.extend(
+            [_fit(_text(value), width) for value, width in zip(row, text_widths)]
+            for row in chunk
+        )
+        elements.append(LongTable(
+            data,
+            colWidths=widths,
+            rowHeights=[ROW_HEIGHT] * len(data),
+            repeatRows=1,
+            style=style,
+            hAlign='LEFT',
+        ))
+    if len(elements) == 1:
+        elements.append(LongTable([header], colWidths=widths, rowHeights=[ROW_HEIGHT], style=style, hAlign='LEFT'))
+        elements.append(Paragraph("No records.", stylesheet()['Normal']))
+
+    doc.build(elements, onFirstPage=_draw_page, onLaterPages=_draw_page)
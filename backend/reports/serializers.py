@@ -0,0 +1,40 @@
+from rest_framework import serializers
+
+from authapp.media import MediaFileField
+from .exports import FORMATS
+from .jobs import EXPORTS
+from .models import ExportJob
+
+
+class ExportJobSerializer(serializers.ModelSerializer):
+    file = MediaFileField(read_only=True)
+    progress = serializers.SerializerMethodField()
+
+    class Meta:
+        model = ExportJob
+        fields = [
+            "id", "export", "format", "params", "status", "total_rows", "rows_written",
+            "progress", "file", "error", "created_at", "started_at", "completed_at", "expires_at",
+        ]
+        read_only_fields = fields
+
+    def get_progress(self, obj):
+        if obj.status == ExportJob.STATUS_COMPLETE:
+            return 100
+        if not obj.total_rows:
+            return 0
+        return min(99, obj.rows_written * 100 // obj.total_rows)
+
+
+class ExportJobCreateSerializer(serializers.Serializer):
+    export = serializers.ChoiceField(choices=sorted(EXPORTS))
+    format = serializers.ChoiceField(choices=sorted(FORMATS))
+    params = serializers.DictField(required=False, default=dict)
+
+    def validate_params(self, value):
+        for name, values in value.items():
+            if not isinstance(values, list):
+                values = [values]
+            if any(isinstance(item, (dict, list)) for item in values):
+                raise serializers.ValidationError(f"{name}: values must be strings or lists of strings.")
+        return value
@@ -0,0 +1,57 @@
+from rest_framework import status, viewsets
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+
+from . import jobs
+from .models import ExportJob
+from .serializers import ExportJobCreateSerializer, ExportJobSerializer
+
+
+class ExportJobViewSet(viewsets.GenericViewSet):
+    """
+    Background exports of list endpoints:
+
+    - POST   exports/       {export, format, params} -> 202 with the job
+                            (200 with the existing job for an identical
+                            pending/running request)
+    - GET    exports/       the user's jobs
+    - GET    exports/<id>/  status and progress; ``file`` once complete
+    - DELETE exports/<id>/  cancel or discard
+
+    ``params`` are the list filters, as sent to the list endpoint. Access is
+    checked against the exported list's own permissions, both on enqueue
+    and when the job runs.
+    """
+    serializer_class = ExportJobSerializer
+    permission_classes = [IsAuthenticated]
+
+    def get_queryset(self):
+        return ExportJob.objects.filter(created_by=self.request.user)
+
+    def list(self, request):
+        page = self.paginate_queryset(self.get_queryset())
+        return self.get_paginated_response(self.get_serializer(page, many=True).data)
+
+    def create(self, request):
+        serializer = ExportJobCreateSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+
+        params = jobs.normalize_params(data["params"])
+        view = jobs.build_view(data["export"], request.user, params, data["format"])
+        view.check_permissions(view.request)
+
+        job, created = jobs.enqueue(request.user, data["export"], data["format"], params)
+        return Response(
+            self.get_serializer(job).data,
+            status=status.HTTP_202_ACCEPTED if created else status.HTTP_200_OK,
+        )
+
+    def retrieve(self, request, pk=None):
+        return Response(self.get_serializer(self.get_object()).data)
+
+    def destroy(self, request, pk=None):
+        job = self.get_object()
+        jobs.delete_job_files(job)
+        job.delete()
+        return Response(status=status.HTTP_204_NO_CONTENT)
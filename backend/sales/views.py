@@ -3,6 +3,8 @@ from authapp.permissions import HasPermission
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
+from reportlab.lib.pagesizes import landscape, letter
+from reports.exports import Column, ExportMixin, label
 from .models import (
     Company,
     Client,
@@ -43,7 +45,7 @@ class ClientViewSet(viewsets.ModelViewSet):
     search_fields = ["name", "email", "company__name"]
 
 
-class LeadViewSet(viewsets.ModelViewSet):
+class LeadViewSet(ExportMixin, viewsets.ModelViewSet):
     queryset = Lead.objects.select_related(
         "company", "client", "lead_agent", "lead_source", "lead_category", "lead_team"
     ).all()
@@ -65,6 +67,22 @@ class LeadViewSet(viewsets.ModelViewSet):
     ]
     ordering_fields = ["created_at", "lead_value", "follow_up_date"]
     ordering = ["-created_at"]
+    export_columns = [
+        Column("ID", "id"),
+        Column("Client", "client__name"),
+        Column("Email", "client__email"),
+        Column("Company", "company__name"),
+        Column("Agent", "lead_agent__name"),
+        Column("Source", "lead_source__name"),
+        Column("Category", "lead_category__name"),
+        Column("Team", "lead_team__name"),
+        Column("Value", "lead_value"),
+        Column("Status", "status", render=label(Lead.STATUS_CHOICES)),
+        Column("Follow Up Date", "follow_up_date"),
+        Column("Created At", "created_at"),
+    ]
+    export_filename = "leads"
+    export_pagesize = landscape(letter)
 
     @action(detail=False, methods=["get"])
     def dashboard_stats(self, request):
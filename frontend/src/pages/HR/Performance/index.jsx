@@ -49,7 +49,7 @@ const Performance = () => {
  };
 
  const fetchProjects = () => {
- apiClient.get("/operation/projects/")
+ apiClient.get("/operation/projects/", { params: { expand: "member_contributions" } })
  .then(res => {
  let data = res.data;
  if (data && data.results) {